@@ -0,0 +1,4902 @@
+"""
+Ahorcado – Modo Consola 
+
+"""
+
+from __future__ import annotations
+import math
+import os
+import re
+import random
+import sys
+import time
+from contextvars import ContextVar
+from itertools import zip_longest
+from typing import Dict, List, Set, Tuple, Callable, Any, Mapping, Sequence, FrozenSet
+from functools import reduce, lru_cache, wraps
+
+# Estado y reglas: núcleo liviano sin dependencias de consola (ver ahorcado_core.py)
+from ahorcado_core import (
+    BIT_LETRA, LETRAS, EstadoCompacto, clave_palabra, create_game_state, gano, intento_letra, intento_palabra,
+    intentos_restantes, intentos_usados, jugada, patron, perdio, plegar, progreso,
+)
+
+# Asegurar que 'print' es el builtin (evita TypeError por sombreado)
+import builtins as _builtins
+print = _builtins.print  # garantiza soporte de 'end'
+
+
+CSI = "\033["
+RESET = f"{CSI}0m"
+BOLD = f"{CSI}1m"
+DIM = f"{CSI}2m"
+FG = {
+    "default": f"{CSI}39m",
+    "red": f"{CSI}31m",
+    "green": f"{CSI}32m",
+    "yellow": f"{CSI}33m",
+    "blue": f"{CSI}34m",
+    "magenta": f"{CSI}35m",
+    "cyan": f"{CSI}36m",
+    "white": f"{CSI}97m",
+    "gray": f"{CSI}90m",
+}
+
+# Terminal: capacidades detectadas una vez (TTY, colores, unicode, tamaño) y control por ANSI
+
+# Tres estados: False / True fuerzan el modo (NO_COLOR=1 / NO_UNICODE=1 fuerzan el simple);
+# None = lo que detecte `terminal()`
+USE_COLOR: bool | None = False if os.environ.get("NO_COLOR", "0") == "1" else None
+NO_UNICODE: bool | None = True if os.environ.get("NO_UNICODE", "0") == "1" else None
+# (color, unicode) de la sesión de red en curso. Cada conexión corre en su propia tarea asyncio
+# (con su copia del contexto): sus frames no dependen de la TTY del servidor
+_CAPACIDADES_SESION: ContextVar[Tuple[bool, bool] | None] = ContextVar("capacidades_sesion", default=None)
+# (color, unicode) fijados mientras se arma un frame (ver `_frame`): `c()` los lee de aquí en vez
+# de consultar la sesión y la terminal en cada llamada. Un frame se arma sin ceder el control
+# (sin await), así que dos sesiones del servidor no se pisan
+_CAPACIDADES_FRAME: Tuple[bool, bool] | None = None
+
+
+def _enable_vt_win() -> bool:
+    """Intenta habilitar ANSI en Windows 10+ (VT). Degrada si no se puede."""
+    if os.name != "nt":
+        return True
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        HANDLE_STDOUT = -11
+        mode = ctypes.c_uint()
+        h = kernel32.GetStdHandle(HANDLE_STDOUT)
+        if h in (0, -1):
+            return False
+        if not kernel32.GetConsoleMode(h, ctypes.byref(mode)):
+            return False
+        ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
+        new_mode = mode.value | ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        if not kernel32.SetConsoleMode(h, new_mode):
+            return False
+        return True
+    except Exception:
+        return False
+
+
+class Terminal:
+    """Lo que sabe hacer la salida: se detecta una vez y se consulta sin costo en cada frame.
+
+    `tty` (hay una terminal), `vt` (entiende ANSI: cursor, borrado, colores), `colores`
+    (0, 16, 256 o 2**24), `unicode` (la codificación admite los bordes de caja) y
+    `columnas`/`filas` (0 si no hay terminal; se vuelven a leer tras un SIGWINCH).
+    Sin terminal la salida es un registro de solo-agregar: texto plano, sin secuencias.
+    """
+    __slots__ = ("salida", "tty", "vt", "colores", "unicode", "_tamano")
+
+    def __init__(self, salida: Any = None, entorno: Mapping[str, str] | None = None) -> None:
+        salida = sys.stdout if salida is None else salida
+        entorno = os.environ if entorno is None else entorno
+        self.salida = salida
+        try:
+            self.tty = bool(salida.isatty())
+        except (AttributeError, ValueError):
+            self.tty = False
+        termino = entorno.get("TERM", "")
+        # La prueba de la consola de Windows (ctypes) solo se hace si hay una terminal
+        self.vt = self.tty and termino != "dumb" and _enable_vt_win()
+        if not self.vt and entorno.get("FORCE_COLOR", "0") in ("", "0"):
+            self.colores = 0
+        elif entorno.get("COLORTERM", "") in ("truecolor", "24bit"):
+            self.colores = 2 ** 24
+        elif "256color" in termino:
+            self.colores = 256
+        else:
+            self.colores = 16
+        codificacion = (getattr(salida, "encoding", None) or "").lower().replace("-", "")
+        self.unicode = codificacion.startswith("utf")
+        self._tamano: Tuple[int, int] | None = None
+
+    def tamano(self) -> Tuple[int, int]:
+        """(columnas, filas), o (0, 0) si la salida no es una terminal."""
+        if self._tamano is None:
+            try:
+                medida = os.get_terminal_size(self.salida.fileno()) if self.tty else None
+            except (AttributeError, ValueError, OSError):
+                medida = None
+            self._tamano = (medida.columns, medida.lines) if medida else (0, 0)
+        return self._tamano
+
+    @property
+    def columnas(self) -> int:
+        return self.tamano()[0]
+
+    @property
+    def filas(self) -> int:
+        return self.tamano()[1]
+
+    def redimensionada(self, *_: Any) -> None:
+        self._tamano = None
+
+
+_TERMINAL: Terminal | None = None
+
+
+def terminal() -> Terminal:
+    """Capacidades de stdout, detectadas al primer uso (no al importar) y cacheadas."""
+    global _TERMINAL
+    if _TERMINAL is None:
+        _TERMINAL = Terminal()
+        if _TERMINAL.tty:
+            import signal
+
+            try:
+                signal.signal(signal.SIGWINCH, _TERMINAL.redimensionada)
+            except (AttributeError, ValueError):
+                pass  # sin SIGWINCH (Windows) o fuera del hilo principal: el tamaño queda fijo
+    return _TERMINAL
+
+
+def capacidades() -> Tuple[bool, bool]:
+    """(color, unicode) efectivos: los del frame en curso, los de la sesión de red o los de
+    USE_COLOR / NO_UNICODE, y donde estos son None, los que detectó `terminal()`."""
+    if _CAPACIDADES_FRAME is not None:
+        return _CAPACIDADES_FRAME
+    sesion = _CAPACIDADES_SESION.get()
+    if sesion is not None:
+        return sesion
+    return (USE_COLOR if USE_COLOR is not None else terminal().colores > 0,
+            not NO_UNICODE if NO_UNICODE is not None else terminal().unicode)
+
+
+def usar_color() -> bool:
+    return capacidades()[0]
+
+
+def usar_unicode() -> bool:
+    return capacidades()[1]
+
+
+def _frame(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Resuelve las capacidades una vez para todo lo que arma `fn` (anidado: la de afuera manda)."""
+    @wraps(fn)
+    def envoltura(*args: Any, **kwargs: Any) -> Any:
+        global _CAPACIDADES_FRAME
+        if _CAPACIDADES_FRAME is not None:
+            return fn(*args, **kwargs)
+        _CAPACIDADES_FRAME = capacidades()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _CAPACIDADES_FRAME = None
+    return envoltura
+
+
+def c(text: str, *styles: str) -> str:
+    if not (_CAPACIDADES_FRAME or capacidades())[0]:
+        return text
+    return "".join(styles) + text + RESET
+
+
+
+# Entrada segura / modo automático (no impone autoplay por defecto)
+
+AUTO_MODE = os.environ.get("AUTO_MODE") == "1"
+# NO_SLEEP=1 elimina las pausas entre pantallas (corridas guiadas por script)
+PAUSAS = os.environ.get("NO_SLEEP", "0") != "1"
+
+
+def safe_input(prompt: str, default: str = "") -> str:
+    """`input()` con modo automático: con AUTO_MODE activo devuelve `default` sin leer.
+
+    Si la entrada se termina (EOF de un pipe o Ctrl-D) o no se puede leer, lanza EOFError:
+    devolver `default` haría que el menú y el jugador automático sigan para siempre.
+    """
+    if AUTO_MODE:
+        return default
+    try:
+        return input(prompt)
+    except OSError as e:
+        raise EOFError(str(e)) from e
+
+
+def _pausa(segundos: float) -> None:
+    if PAUSAS:
+        time.sleep(segundos)
+
+
+
+# Recursos del juego (banner y frames)
+
+BANNER: tuple[str, ...] = (
+    "  _   _                                          ",
+    " | | | | __ _ _ __   __ _ _ __ ___   __ _ _ __   ",
+    " | |_| |/ _` | '_ \\ / _` | '_ ` _ \\ / _` | '_ \\  ",
+    " |  _  | (_| | | | | (_| | | | | | | (_| | | | | ",
+    " |_| |_|\\__,_|_| |_|\\__, |_| |_| |_|\\__,_|_| |_| ",
+    "                    |___/                        ",
+)
+
+HANGMAN_PICS: Tuple[str, ...] = (
+    r"""
+       +---+
+       |   |
+           |
+           |
+           |
+           |
+    =========
+    """,
+    r"""
+       +---+
+       |   |
+       O   |
+           |
+           |
+           |
+    =========
+    """,
+    r"""
+       +---+
+       |   |
+       O   |
+       |   |
+           |
+           |
+    =========
+    """,
+    r"""
+       +---+
+       |   |
+       O   |
+      /|   |
+           |
+           |
+    =========
+    """,
+    r"""
+       +---+
+       |   |
+       O   |
+      /|\  |
+           |
+           |
+    =========
+    """,
+    r"""
+       +---+
+       |   |
+       O   |
+      /|\  |
+      /    |
+           |
+    =========
+    """,
+    r"""
+       +---+
+       |   |
+       O   |
+      /|\  |
+      / \  |
+           |
+    =========
+    """,
+)
+
+# Banco de palabras por categoría (diccionario con tuplas)
+WORD_BANK: Dict[str, Tuple[str, ...]] = {
+    "Tecnologia": (
+        "python", "programacion", "computadora", "teclado",
+        "mouse", "monitor", "algoritmo", "variable"
+    ),
+    "Ciencia": (
+        "atomo", "molecula", "energia", "celula", "gravedad", "genetica"
+    ),
+    "Deportes": (
+        "futbol", "basquet", "tenis", "natacion", "ciclismo"
+    ),
+}
+
+# Frases y palabras con tildes o ñ (FRASES=1 las suma como categorías): los espacios y
+# signos se muestran desde el inicio y "á" se adivina con "a" (ver ahorcado_core.plegar)
+PHRASE_BANK: Dict[str, Tuple[str, ...]] = {
+    "Refranes": (
+        "más vale tarde que nunca", "en boca cerrada no entran moscas",
+        "año nuevo, vida nueva", "a caballo regalado no se le mira el diente",
+        "camarón que se duerme se lo lleva la corriente",
+    ),
+    "Con tilde": (
+        "canción", "pingüino", "corazón", "murciélago", "árbol", "niño", "montaña", "teléfono",
+    ),
+}
+MODO_FRASES = os.environ.get("FRASES", "0") == "1"
+
+# Dificultades
+DIFFICULTY: Dict[str, Dict[str, int]] = {
+    "facil":   {"max_intentos": 8},
+    "media":   {"max_intentos": 6},
+    "dificil": {"max_intentos": 5},
+}
+
+
+
+# Diccionario externo (archivo mapeado en memoria con índice por categoría/longitud)
+
+# Ruta a un archivo de palabras (una por línea, opcional "categoria<TAB>palabra")
+# o a un directorio con un archivo .txt por categoría
+WORDS_FILE = os.environ.get("WORDS_FILE", "")
+
+
+class DiccionarioMmap:
+    """Lista de palabras servida desde archivos con `mmap`, sin crear un `str` por palabra.
+
+    Al abrir se construye (o se lee del archivo lateral `.idx`) un índice compacto
+    `(categoria, longitud) -> array de offsets`; las palabras se decodifican solo al pedirlas.
+    """
+    MAGIA = b"AHIX1\n"
+
+    def __init__(self, ruta: str, usar_cache: bool = True) -> None:
+        import mmap
+
+        self.ruta = ruta
+        if os.path.isdir(ruta):
+            archivos = sorted(os.path.join(ruta, f) for f in os.listdir(ruta) if f.endswith(".txt"))
+            self._sidecar = os.path.join(ruta, ".indice.idx")
+        else:
+            archivos = [ruta]
+            self._sidecar = ruta + ".idx"
+        self._archivos = [a for a in archivos if os.path.getsize(a) > 0]
+        self._mapas = []
+        for archivo in self._archivos:
+            with open(archivo, "rb") as fh:
+                self._mapas.append(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+        # (categoria, longitud) -> (id_archivo, offsets)
+        self.grupos: Dict[Tuple[str, int], Tuple[int, Any]] = {}
+        self.desde_cache = usar_cache and self._leer_sidecar()
+        if not self.desde_cache:
+            self._escanear()
+            if usar_cache:
+                self._escribir_sidecar()
+        self._preparar()
+
+    # -- construcción del índice --
+    def _firma(self) -> List[List[Any]]:
+        return [[os.path.basename(a), os.stat(a).st_size, os.stat(a).st_mtime_ns] for a in self._archivos]
+
+    def _escanear(self) -> None:
+        from array import array
+
+        directorio = os.path.isdir(self.ruta)
+        for fid, mm in enumerate(self._mapas):
+            tipo = "I" if len(mm) < 2 ** 32 else "Q"
+            cat_archivo = os.path.splitext(os.path.basename(self._archivos[fid]))[0]
+            inicio, fin = 0, len(mm)
+            while inicio < fin:
+                salto = mm.find(b"\n", inicio)
+                if salto < 0:
+                    salto = fin
+                linea = mm[inicio:salto]
+                cat, off = cat_archivo, inicio
+                if not directorio and b"\t" in linea:
+                    tab = linea.index(b"\t")
+                    cat, linea, off = linea[:tab].decode("utf-8").strip(), linea[tab + 1:], inicio + tab + 1
+                palabra = linea.rstrip(b"\r")
+                # Solo palabras jugables (a-z, se pasan a minúsculas al leer); bytes.isalpha() es ASCII
+                if palabra.isalpha():
+                    clave = (cat, len(palabra))
+                    grupo = self.grupos.get(clave)
+                    if grupo is None:
+                        grupo = self.grupos[clave] = (fid, array(tipo))
+                    grupo[1].append(off)
+                inicio = salto + 1
+
+    def _leer_sidecar(self) -> bool:
+        import json
+        from array import array
+
+        try:
+            with open(self._sidecar, "rb") as fh:
+                if fh.readline() != self.MAGIA:
+                    return False
+                cabecera = json.loads(fh.readline())
+                if cabecera["firma"] != self._firma():
+                    return False
+                grupos = {}
+                for cat, largo, fid, tipo, n in cabecera["grupos"]:
+                    offsets = array(tipo)
+                    offsets.frombytes(fh.read(n * offsets.itemsize))
+                    grupos[(cat, largo)] = (fid, offsets)
+        except (OSError, ValueError, KeyError):
+            return False
+        self.grupos = grupos
+        return True
+
+    def _escribir_sidecar(self) -> None:
+        import json
+
+        cabecera = {
+            "firma": self._firma(),
+            "grupos": [[cat, largo, fid, off.typecode, len(off)]
+                       for (cat, largo), (fid, off) in self.grupos.items()],
+        }
+        tmp = self._sidecar + ".tmp"
+        try:
+            with open(tmp, "wb") as fh:
+                fh.write(self.MAGIA)
+                fh.write(json.dumps(cabecera).encode("utf-8") + b"\n")
+                for _, off in self.grupos.values():
+                    fh.write(off.tobytes())
+            os.replace(tmp, self._sidecar)
+        except OSError:
+            pass  # sin permisos de escritura: se reescaneará la próxima vez
+
+    def _preparar(self) -> None:
+        # Por categoría: lista de (total_acumulado, clave) para elegir un índice uniforme
+        self._acumulados: Dict[str, List[Tuple[int, Tuple[str, int]]]] = {}
+        for clave in sorted(self.grupos):
+            acum = self._acumulados.setdefault(clave[0], [])
+            previo = acum[-1][0] if acum else 0
+            acum.append((previo + len(self.grupos[clave][1]), clave))
+        self.categorias: Tuple[str, ...] = tuple(self._acumulados)
+
+    # -- acceso --
+    def _leer(self, clave: Tuple[str, int], i: int) -> str:
+        fid, offsets = self.grupos[clave]
+        off = offsets[i]
+        return self._mapas[fid][off:off + clave[1]].decode("ascii").lower()
+
+    def total(self, categoria: str) -> int:
+        acum = self._acumulados.get(categoria)
+        return acum[-1][0] if acum else 0
+
+    def palabra(self, categoria: str, i: int) -> str:
+        """i-ésima palabra de la categoría (orden: longitud, luego archivo)."""
+        if not 0 <= i < self.total(categoria):
+            raise IndexError(i)
+        previo = 0
+        # Hay tantas entradas como longitudes distintas (~20): el recorrido es de costo acotado
+        for acumulado, clave in self._acumulados[categoria]:
+            if i < acumulado:
+                return self._leer(clave, i - previo)
+            previo = acumulado
+        raise IndexError(i)
+
+    def elegir(self, categoria: str | None = None, rng: Any = random) -> Tuple[str, str]:
+        """(categoria, palabra) uniforme dentro de la categoría, sin materializar la lista."""
+        cat = categoria if categoria in self._acumulados else rng.choice(self.categorias)
+        return cat, self.palabra(cat, rng.randrange(self.total(cat)))
+
+    def vista(self, categoria: str) -> "VistaCategoria":
+        return VistaCategoria(self, categoria)
+
+    def cerrar(self) -> None:
+        for mm in self._mapas:
+            mm.close()
+        self._mapas = []
+
+
+class VistaCategoria(Sequence):
+    """Secuencia perezosa con las palabras de una categoría del diccionario."""
+
+    def __init__(self, dic: DiccionarioMmap, categoria: str) -> None:
+        self._dic = dic
+        self._cat = categoria
+
+    def __len__(self) -> int:
+        return self._dic.total(self._cat)
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self._dic.palabra(self._cat, j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return self._dic.palabra(self._cat, i)
+
+
+class IndiceVocabulario:
+    """Pertenencia O(1) de palabras del diccionario sin crear un `str` por palabra.
+
+    Tabla hash de direccionamiento abierto por (archivo, longitud): cada casilla guarda el
+    offset+1 de la palabra en el mmap (0 = vacía) y se ubica por `crc32` de sus bytes en
+    minúsculas. Al consultar se compara contra el mmap, así que no hay falsos positivos.
+    """
+
+    def __init__(self, dic: DiccionarioMmap) -> None:
+        from array import array
+        from zlib import crc32
+
+        self._dic = dic
+        self.tablas: Dict[Tuple[int, int], Any] = {}
+        por_tabla: Dict[Tuple[int, int], List[Any]] = {}
+        for (_, largo), (fid, offsets) in dic.grupos.items():
+            por_tabla.setdefault((fid, largo), []).append(offsets)
+        for (fid, largo), grupos in por_tabla.items():
+            mm = dic._mapas[fid]
+            n = sum(len(off) for off in grupos)
+            tam = 1 << max(3, (2 * n).bit_length())  # carga <= 0.5: sondeos cortos
+            mascara = tam - 1
+            tipo = "I" if len(mm) < 2 ** 32 - 1 else "Q"
+            tabla = array(tipo, bytes(tam * array(tipo).itemsize))
+            for offsets in grupos:
+                for off in offsets:
+                    i = crc32(mm[off:off + largo].lower()) & mascara
+                    while tabla[i]:
+                        i = (i + 1) & mascara
+                    tabla[i] = off + 1
+            self.tablas[(fid, largo)] = tabla
+
+    def __contains__(self, palabra: Any) -> bool:
+        from zlib import crc32
+
+        try:
+            clave = palabra.encode("ascii")
+        except (AttributeError, UnicodeEncodeError):
+            return False
+        largo = len(clave)
+        h = crc32(clave)
+        for fid, mm in enumerate(self._dic._mapas):
+            tabla = self.tablas.get((fid, largo))
+            if tabla is None:
+                continue
+            mascara = len(tabla) - 1
+            i = h & mascara
+            while tabla[i]:
+                off = tabla[i] - 1
+                if mm[off:off + largo].lower() == clave:
+                    return True
+                i = (i + 1) & mascara
+        return False
+
+    def memoria(self) -> int:
+        """Bytes ocupados por las tablas (las palabras siguen en el archivo mapeado)."""
+        return sum(t.itemsize * len(t) for t in self.tablas.values())
+
+
+_DICCIONARIO: DiccionarioMmap | None = None
+
+
+_VOCABULARIO: IndiceVocabulario | None = None
+# Sin definir (None) se valida solo con un diccionario externo: contra el banco chico, rechazar
+# lo desconocido delataría las respuestas posibles. VALIDAR_PALABRAS=1 fuerza la validación y
+# VALIDAR_PALABRAS=0 acepta cualquier palabra completa (y la cobra como intento).
+VALIDAR_PALABRAS: bool | None = {"1": True, "0": False}.get(os.environ.get("VALIDAR_PALABRAS", ""))
+
+
+def usar_diccionario(ruta: str | None) -> DiccionarioMmap | None:
+    """Activa (o desactiva con None/"") el diccionario externo para `elegir_palabra`."""
+    global _DICCIONARIO, _VOCABULARIO
+    if _DICCIONARIO is not None:
+        _DICCIONARIO.cerrar()
+    _DICCIONARIO = DiccionarioMmap(ruta) if ruta else None
+    _VOCABULARIO = None
+    _BANDAS.clear()
+    if _POOL is not None:
+        _POOL.reiniciar()
+    return _DICCIONARIO
+
+
+def diccionario() -> DiccionarioMmap | None:
+    """Diccionario externo activo (se abre al primer uso si WORDS_FILE está definido)."""
+    global WORDS_FILE
+    if _DICCIONARIO is None and WORDS_FILE:
+        ruta, WORDS_FILE = WORDS_FILE, ""
+        usar_diccionario(ruta)
+    return _DICCIONARIO
+
+
+_VOCABULARIO_BANCO: Dict[bool, frozenset] = {}  # MODO_FRASES -> palabras plegadas del banco
+_BANCO_CON_FRASES: Dict[str, Tuple[str, ...]] = {}
+
+
+def banco_palabras() -> Mapping[str, Sequence[str]]:
+    """WORD_BANK, más las categorías de PHRASE_BANK en modo frases (FRASES=1)."""
+    if not MODO_FRASES:
+        return WORD_BANK
+    if not _BANCO_CON_FRASES:
+        _BANCO_CON_FRASES.update(WORD_BANK)
+        _BANCO_CON_FRASES.update(PHRASE_BANK)
+    return _BANCO_CON_FRASES
+
+
+def palabra_conocida(palabra: str) -> bool:
+    """True si `palabra` (plegada: minúsculas, sin tildes) está en el vocabulario
+    (diccionario externo o el banco en memoria)."""
+    global _VOCABULARIO
+    dic = diccionario()
+    if dic is None:
+        vocabulario = _VOCABULARIO_BANCO.get(MODO_FRASES)
+        if vocabulario is None:
+            vocabulario = _VOCABULARIO_BANCO[MODO_FRASES] = frozenset(
+                plegar(w) for ps in banco_palabras().values() for w in ps)
+        return palabra in vocabulario
+    if _VOCABULARIO is None:
+        _VOCABULARIO = IndiceVocabulario(dic)
+    return palabra in _VOCABULARIO
+
+
+def validador_palabras() -> Callable[[str], bool] | None:
+    """El validador que usan las jugadas (None si no se valida: ver VALIDAR_PALABRAS)."""
+    validar = VALIDAR_PALABRAS if VALIDAR_PALABRAS is not None else diccionario() is not None
+    return palabra_conocida if validar else None
+
+
+def categorias() -> List[str]:
+    """Categorías jugables: las del diccionario externo si está activo, si no las del banco."""
+    dic = diccionario()
+    return list(dic.categorias) if dic is not None else list(banco_palabras())
+
+
+
+# Pool compartido de palabras (anillo barajado por categoría, sin repetir)
+
+
+class PoolPalabras:
+    """Reparte palabras por categoría sin repetir hasta agotar la categoría.
+
+    Cada categoría es un anillo de índices barajado con un cursor: sacar es O(1) y el anillo
+    se vuelve a barajar (perezosamente) al completar la vuelta, sin repetir en el borde. La
+    baraja de cada vuelta depende solo de (semilla, categoría, vuelta), así la palabra de
+    cualquier posición se puede reconstruir (`palabra_en`). Con `pesos` (p. ej. por largo) la
+    baraja es ponderada: las palabras pesadas tienden a salir antes dentro de cada vuelta. La
+    dificultad no se pondera aquí: con bandas de dureza (ver `bandas_dureza`) cada
+    (categoría, dificultad) tiene su propio anillo. Es
+    seguro usarlo desde varios hilos (un lock protege los cursores).
+    """
+
+    def __init__(self, banco: Mapping[str, Sequence[str]] | DiccionarioMmap | None = None,
+                 semilla: int | None = None, pesos: Callable[[str], float] | None = None,
+                 bandas: Mapping[str, Mapping[str, Sequence[str]]] | None = None) -> None:
+        import threading
+
+        self.banco = banco
+        self.semilla = random.getrandbits(32) if semilla is None else semilla
+        self.pesos = pesos
+        self.bandas = bandas
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.semilla)
+        # (categoria, banda) -> palabras ya repartidas / (vuelta, índices barajados)
+        self._posiciones: Dict[Tuple[str, str | None], int] = {}
+        self._anillos: Dict[Tuple[str, str | None], Tuple[int, Any]] = {}
+
+    def _origen(self) -> Mapping[str, Sequence[str]] | DiccionarioMmap:
+        if self.banco is None:
+            dic = diccionario()
+            return dic if dic is not None else banco_palabras()
+        return self.banco
+
+    def categorias(self) -> Tuple[str, ...]:
+        origen = self._origen()
+        return tuple(origen.categorias) if isinstance(origen, DiccionarioMmap) else tuple(origen)
+
+    def banda(self, cat: str, dificultad: str | None) -> str | None:
+        """La banda de dureza que usa `dificultad` en `cat` (None: toda la categoría)."""
+        if dificultad is None:
+            return None
+        # El pool compartido usa los puntajes del banco activo; uno propio, los que recibió
+        bandas = self.bandas if self.bandas is not None or self.banco is not None else bandas_dureza()
+        return dificultad if bandas and bandas.get(cat, {}).get(dificultad) else None
+
+    def _palabras(self, cat: str, banda: str | None = None) -> Sequence[str]:
+        if banda is not None:
+            return (self.bandas if self.bandas is not None else bandas_dureza())[cat][banda]
+        origen = self._origen()
+        return origen.vista(cat) if isinstance(origen, DiccionarioMmap) else origen[cat]
+
+    def _orden(self, clave: Tuple[str, str | None], vuelta: int) -> List[int]:
+        cat, banda = clave
+        palabras = self._palabras(cat, banda)
+        rng = random.Random(f"{self.semilla}:{cat}:{vuelta}" if banda is None
+                            else f"{self.semilla}:{cat}:{banda}:{vuelta}")
+        if self.pesos is None:
+            orden = list(range(len(palabras)))
+            rng.shuffle(orden)
+            return orden
+        # Baraja ponderada (Efraimidis-Spirakis): clave u^(1/peso), de mayor a menor
+        claves = [rng.random() ** (1.0 / max(self.pesos(w), 1e-9)) for w in palabras]
+        return sorted(range(len(palabras)), key=claves.__getitem__, reverse=True)
+
+    def _barajar(self, clave: Tuple[str, str | None], vuelta: int, ultima: int | None = None) -> Any:
+        from array import array
+
+        n = len(self._palabras(*clave))
+        if n == 2:
+            # Con dos palabras la única secuencia sin repetir alterna: todas las vueltas iguales
+            return array("I", self._orden(clave, 0))
+        orden = self._orden(clave, vuelta)
+        # Sin repetir en el borde: la primera de esta vuelta no es la última de la anterior
+        # (el intercambio toca solo las posiciones 0 y 1, así que la última no depende de él)
+        if vuelta and n > 2:
+            if ultima is None:
+                ultima = self._orden(clave, vuelta - 1)[-1]
+            if orden[0] == ultima:
+                orden[0], orden[1] = orden[1], orden[0]
+        return array("I", orden)
+
+    def _anillo(self, clave: Tuple[str, str | None], vuelta: int) -> Any:
+        actual = self._anillos.get(clave)
+        if actual is not None and actual[0] == vuelta:
+            return actual[1]
+        # Al avanzar de vuelta la anterior ya está en memoria: no hace falta rebarajarla
+        previa = actual[1][-1] if actual is not None and actual[0] == vuelta - 1 else None
+        anillo = self._barajar(clave, vuelta, previa)
+        self._anillos[clave] = (vuelta, anillo)
+        return anillo
+
+    def reiniciar(self) -> None:
+        """Olvida cursores y anillos (p. ej. al cambiar el banco): todo vuelve a la posición 0."""
+        with self._lock:
+            self._anillos.clear()
+            self._posiciones.clear()
+
+    def palabra_en(self, cat: str, posicion: int, banda: str | None = None) -> str:
+        """Palabra que reparte (o repartió) la categoría (o su banda) en la `posicion`-ésima extracción."""
+        with self._lock:
+            palabras = self._palabras(cat, banda)
+            n = len(palabras)
+            return palabras[self._anillo((cat, banda), posicion // n)[posicion % n]]
+
+    def sacar(self, categoria: str | None = None, dificultad: str | None = None) -> Tuple[str, str, int]:
+        """(categoria, palabra, posicion); si `categoria` no es válida se elige una al azar.
+
+        Con `dificultad` y bandas de dureza disponibles, la palabra sale de la banda de esa
+        dificultad (la posición cuenta dentro de la banda, ver `banda`).
+        """
+        with self._lock:
+            cats = self.categorias()
+            cat = categoria if categoria in cats else self._rng.choice(cats)
+            clave = (cat, self.banda(cat, dificultad))
+            palabras = self._palabras(*clave)
+            n = len(palabras)
+            pos = self._posiciones.get(clave, 0)
+            self._posiciones[clave] = pos + 1
+            return cat, palabras[self._anillo(clave, pos // n)[pos % n]], pos
+
+
+_POOL: PoolPalabras | None = None
+
+
+def pool_palabras() -> PoolPalabras:
+    """Pool compartido del proceso (consola, servidor y `elegir_palabra`)."""
+    global _POOL
+    if _POOL is None:
+        _POOL = PoolPalabras()
+    return _POOL
+
+
+
+# Utilitarios de consola y helpers de "ventana"
+
+
+def limpiar_consola() -> None:
+    """Limpia la pantalla con una secuencia ANSI; sin terminal (registro) no escribe nada."""
+    if _RENDER is not None:
+        _RENDER.invalidar()
+    if terminal().vt:
+        sys.stdout.write(f"{CSI}2J{CSI}H")
+        sys.stdout.flush()
+
+
+def lineas_banner() -> List[str]:
+    return list(banner_coloreado())
+
+
+def banner() -> None:
+    for line in lineas_banner():
+        print(line)
+
+
+def elegir_palabra(categoria: str | None = None, rng: Any = random,
+                   dificultad: str | None = None) -> Tuple[str, str]:
+    """Devuelve (categoria_elegida, palabra_aleatoria) desde WORD_BANK
+    (o desde el diccionario externo si está activo, ver WORDS_FILE).
+    Si `categoria` no es válida o es None, se elige una al azar.
+    Por defecto sale del pool compartido (sin repetir hasta agotar la categoría);
+    con un `random.Random(seed)` como `rng` la elección es reproducible por semilla.
+    Con `dificultad` la palabra sale de la banda de dureza correspondiente (si hay puntajes).
+    """
+    if rng is random:
+        cat, palabra, _ = pool_palabras().sacar(categoria, dificultad)
+        return cat, palabra
+    bandas = bandas_dureza() if dificultad is not None else None
+    if bandas:
+        cat = categoria if categoria in bandas else rng.choice(list(bandas))
+        if bandas[cat].get(dificultad):
+            return cat, rng.choice(bandas[cat][dificultad])
+    dic = diccionario()
+    if dic is not None:
+        return dic.elegir(categoria, rng)
+    banco = banco_palabras()
+    if categoria and categoria in banco:
+        cat = categoria
+    else:
+        cat = rng.choice(list(banco.keys()))
+    return cat, rng.choice(banco[cat])
+
+
+# ---- helpers para "ventana" (box con bordes) ----
+
+# Definición de Box como tupla nombrada
+Box = Tuple[str, str, str, str, str, str, str, str]
+
+BOX_UNI: Box = ("╔", "╗", "╚", "╝", "═", "║", "╠", "╣")
+BOX_ASC: Box = ("+", "+", "+", "+", "-", "|", "+", "+")
+
+
+def caja() -> Box:
+    """Bordes de caja: Unicode si la salida los admite (ver `usar_unicode`), si no ASCII."""
+    return BOX_UNI if usar_unicode() else BOX_ASC
+
+
+def __getattr__(nombre: str) -> Any:
+    # Compatibilidad: `BOX` era una constante fijada al importar; ahora sigue a `caja()`
+    if nombre == "BOX":
+        return caja()
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+
+def strip_ansi(s: str) -> str:
+    return _ANSI_RE.sub("", s)
+
+
+def _ancho_unicode(s: str) -> int:
+    """Columnas de texto no ASCII: anchos de Asia oriental ocupan 2 y las marcas combinantes 0."""
+    from unicodedata import combining, east_asian_width
+
+    return sum([0 if combining(ch) else 2 if east_asian_width(ch) in "WF" else 1 for ch in s])
+
+
+def _ancho(s: str) -> int:
+    texto = strip_ansi(s) if "\x1b" in s else s
+    return len(texto) if texto.isascii() else _ancho_unicode(texto)
+
+
+def vlen(s: str) -> int:
+    """Columnas visibles de `s` (sin códigos ANSI y con caracteres anchos o combinantes)."""
+    if not RENDER_CACHE:
+        return _ancho(s)
+    if s.isascii() and "\x1b" not in s:
+        return len(s)
+    # Segmentos con estilo o no ASCII: se miden (regex, unicodedata) una sola vez
+    n = _VLEN_CACHE.get(s)
+    if n is None:
+        if len(_VLEN_CACHE) >= _VLEN_MAX:
+            _VLEN_CACHE.clear()
+        n = _VLEN_CACHE[s] = _ancho(s)
+    return n
+
+
+def pad_visible(s: str, width: int) -> str:
+    pad = width - vlen(s)
+    return s + (" " * max(0, pad))
+
+
+def make_box(lines: List[str], title: str | None = None) -> str:
+    v = caja()[5]
+    width = max([vlen(ln) for ln in lines] + ([vlen(title)] if title else [0]))
+    top, sep, bot = _bordes_box(width)
+    out: List[str] = [top]
+    if title:
+        t = pad_visible(f" {title} ", width + 2)
+        out.append(f"{v}{t}{v}")
+        out.append(sep)
+    for ln in lines:
+        out.append(f"{v} {pad_visible(ln, width)} {v}")
+    out.append(bot)
+    return "\n".join(out)
+
+
+def compose_columns(left: List[str], right: List[str], gap: int = 3) -> List[str]:
+    lw = max((vlen(ln) for ln in left), default=0)
+    rw = max((vlen(ln) for ln in right), default=0)
+    sep = " " * gap
+    combo: List[str] = []
+    for L, R in zip_longest(left, right, fillvalue=""):
+        combo.append(pad_visible(L, lw) + sep + pad_visible(R, rw))
+    return combo
+
+
+
+# Caché de recursos de render (banner, horcas coloreadas, bordes y anchos visibles)
+
+# NO_RENDER_CACHE=1 recalcula todo en cada frame (útil para comparar en bench-render)
+RENDER_CACHE = os.environ.get("NO_RENDER_CACHE", "0") != "1"
+
+_VLEN_CACHE: Dict[str, int] = {}
+_VLEN_MAX = 8192
+_ASSETS: Dict[Tuple[bool, bool], Dict[Any, Any]] = {}  # (color, unicode) -> recursos de render
+
+
+def _pintar_horca(idx: int) -> str:
+    color = FG["green"] if idx == 0 else (FG["yellow"] if idx < len(HANGMAN_PICS) - 1 else FG["red"])
+    return "\n".join(c(ln, color) for ln in HANGMAN_PICS[idx].split("\n"))
+
+
+def _recurso(nombre: Any, construir: Callable[[], Any]) -> Any:
+    """Devuelve un recurso de render cacheado para la configuración actual.
+
+    Cada combinación de color y bordes efectivos tiene sus propios recursos: la consola y
+    las sesiones de red (ver `sesion_async`) pueden usar configuraciones distintas a la vez.
+    """
+    if not RENDER_CACHE:
+        return construir()
+    recursos = _ASSETS.setdefault(capacidades(), {})
+    valor = recursos.get(nombre)
+    if valor is None:
+        valor = recursos[nombre] = construir()
+    return valor
+
+
+def horca(idx: int) -> str:
+    """Frame `idx` de la horca ya coloreado."""
+    return _recurso(("horca", idx), lambda: _pintar_horca(idx))
+
+
+def horca_lineas(idx: int) -> Tuple[str, ...]:
+    """Líneas visibles del frame `idx` (con sus anchos ya medidos)."""
+    def construir() -> Tuple[str, ...]:
+        lineas = tuple(ln for ln in horca(idx).split("\n") if strip_ansi(ln).strip())
+        for ln in lineas:
+            vlen(ln)  # precalienta los anchos visibles
+        return lineas
+    return _recurso(("horca_lineas", idx), construir)
+
+
+def banner_coloreado() -> Tuple[str, ...]:
+    return _recurso("banner", lambda: ("", *[c(line, FG["cyan"], BOLD) for line in BANNER], ""))
+
+
+def letras_coloreadas() -> Dict[str, Tuple[str, str, str]]:
+    """Cada letra pintada según su estado: (acierto, fallo, libre)."""
+    return _recurso("letras", lambda: {ch: (c(ch, FG["green"], BOLD), c(ch, FG["red"]), c(ch, FG["gray"]))
+                                       for ch in LETRAS})
+
+
+def _bordes_box(width: int) -> Tuple[str, str, str]:
+    """(superior, separador de título, inferior) de una caja de ancho `width`, cacheados."""
+    def construir() -> Tuple[str, str, str]:
+        tl, tr, bl, br, h, _, t_sep_l, t_sep_r = caja()
+        linea = h * (width + 2)
+        return tl + linea + tr, t_sep_l + linea + t_sep_r, bl + linea + br
+    return _recurso(("bordes", width), construir)
+
+
+
+# Lógica del juego (Programación Funcional)
+
+
+# Definición de tipos para el estado del juego (dict, o EstadoCompacto que se lee igual)
+GameState = Mapping[str, Any]
+
+# create_game_state, intento_letra, progreso, gano... están en ahorcado_core (importadas
+# arriba); aquí queda solo lo que depende del render
+
+
+def estado_ahorcado(game_state: GameState) -> str:
+    """Devuelve el estado actual del ahorcado."""
+    idx = min(intentos_usados(game_state), len(HANGMAN_PICS) - 1)
+    return horca(idx)
+
+
+
+# Modo automático (sin input) para sandbox / pruebas
+
+# Estrategia del modo automático (ver ESTRATEGIAS): frecuencia, aleatoria, informacion...
+AUTO_STRATEGY = os.environ.get("AUTO_STRATEGY", "frecuencia")
+
+LETTER_ORDER = tuple("etaoinshrdlucmfwypvbgkjqxzñ")
+_LETTER_ORDER_BITS = tuple((ch, BIT_LETRA[ch]) for ch in LETTER_ORDER)
+
+
+def next_auto_letter(game_state: GameState) -> str:
+    """Selecciona la siguiente letra para el modo automático."""
+    if isinstance(game_state, EstadoCompacto):
+        usadas = game_state.mask_ok | game_state.mask_bad
+        for ch, bit in _LETTER_ORDER_BITS:
+            if not usadas & bit:
+                return ch
+        return "a"
+    for ch in LETTER_ORDER:
+        if ch not in game_state["letras_ok"] and ch not in game_state["letras_bad"]:
+            return ch
+    for ch in LETRAS:
+        if ch not in game_state["letras_ok"] and ch not in game_state["letras_bad"]:
+            return ch
+    return "a"
+
+
+def letra_aleatoria(game_state: GameState) -> str:
+    """Estrategia de referencia: letra no usada al azar (usa el `random` global, sembrable)."""
+    libres = [ch for ch in LETRAS
+              if ch not in game_state["letras_ok"] and ch not in game_state["letras_bad"]]
+    return random.choice(libres) if libres else "a"
+
+
+
+# Estrategia por teoría de la información (índice de candidatos con bitsets)
+
+
+class _GrupoLongitud:
+    """Palabras de una misma longitud con bitsets por (posición, letra) y por letra contenida.
+
+    El bit `j` de cada entero representa a `palabras[j]`, así filtrar candidatos es un AND.
+    Los bitsets se arman sobre `claves` (las palabras plegadas, ver `clave_palabra`): "á" es
+    "a" y los espacios y signos de las frases ocupan su posición como en `patron`.
+    """
+    __slots__ = ("palabras", "claves", "todos", "pos", "contiene")
+
+    def __init__(self, palabras: List[str]) -> None:
+        n = len(palabras)
+        nbytes = (n + 7) // 8
+        largo = len(palabras[0])
+        pos_ba: List[Dict[str, bytearray]] = [{} for _ in range(largo)]
+        cont_ba: Dict[str, bytearray] = {}
+        claves = [clave_palabra(w) for w in palabras]
+        # Se arma cada bitset en un bytearray y se convierte a int al final (evita O(n²) en ints)
+        for j, palabra in enumerate(claves):
+            byte, bit = j >> 3, 1 << (j & 7)
+            for i, ch in enumerate(palabra):
+                ba = pos_ba[i].get(ch)
+                if ba is None:
+                    ba = pos_ba[i][ch] = bytearray(nbytes)
+                ba[byte] |= bit
+            for ch in set(palabra):
+                ba = cont_ba.get(ch)
+                if ba is None:
+                    ba = cont_ba[ch] = bytearray(nbytes)
+                ba[byte] |= bit
+        self.palabras = palabras
+        self.claves = claves
+        self.todos = (1 << n) - 1
+        self.pos = [{ch: int.from_bytes(ba, "little") for ch, ba in d.items()} for d in pos_ba]
+        self.contiene = {ch: int.from_bytes(ba, "little") for ch, ba in cont_ba.items()}
+
+    def filtrar(self, visto: Sequence[str], letras_ok: Any, letras_bad: Any) -> int:
+        """Bitset de palabras consistentes con el patrón revelado (`patron`) y las letras falladas."""
+        cand = self.todos
+        for i, ch in enumerate(visto):
+            if ch == "_":
+                # Una posición oculta no puede tener una letra ya acertada (se habría revelado)
+                pos_i = self.pos[i]
+                for ok in letras_ok:
+                    cand &= ~pos_i.get(ok, 0)
+            else:
+                cand &= self.pos[i].get(ch, 0)
+            if not cand:
+                return 0
+        for bad in letras_bad:
+            cand &= ~self.contiene.get(bad, 0)
+        return cand
+
+    def indices(self, cand: int) -> List[int]:
+        out: List[int] = []
+        while cand:
+            low = cand & -cand
+            out.append(low.bit_length() - 1)
+            cand ^= low
+        return out
+
+
+class IndiceCandidatos:
+    """Índice (longitud, posición, letra) → bitset de palabras, por categoría y global."""
+
+    def __init__(self, banco: Mapping[str, Sequence[str]]) -> None:
+        self.grupos: Dict[str | None, Dict[int, _GrupoLongitud]] = {}
+        todas: Dict[int, List[str]] = {}
+        for cat, palabras in banco.items():
+            por_largo: Dict[int, List[str]] = {}
+            for palabra in dict.fromkeys(palabras):
+                por_largo.setdefault(len(palabra), []).append(palabra)
+                todas.setdefault(len(palabra), []).append(palabra)
+            self.grupos[cat] = {n: _GrupoLongitud(ps) for n, ps in por_largo.items()}
+        self.grupos[None] = {n: _GrupoLongitud(list(dict.fromkeys(ps))) for n, ps in todas.items()}
+
+    def grupo(self, categoria: str | None, largo: int) -> _GrupoLongitud | None:
+        return self.grupos.get(categoria if categoria in self.grupos else None, {}).get(largo)
+
+
+def _entropia(cuentas: Any, total: int) -> float:
+    return -sum((k / total) * math.log2(k / total) for k in cuentas if k)
+
+
+# Caché de estados: CANDIDATES_CACHE_SIZE entradas como máximo (0 lo desactiva) y, con
+# CANDIDATES_FILE, se guarda al salir y se carga al primer uso (arranques en caliente)
+CANDIDATES_CACHE_SIZE = int(os.environ.get("CANDIDATES_CACHE_SIZE", "65536"))
+CANDIDATES_FILE = os.environ.get("CANDIDATES_FILE", "")
+VERSION_CACHE_CANDIDATOS = 2
+
+# (bitset de candidatos, ranking de letras)
+EntradaCandidatos = Tuple[int, List[Tuple[str, float, float]]]
+
+
+def clave_estado(game_state: GameState) -> str:
+    """Codificación compacta del estado para el caché: categoría, progreso (`revelado`) y la
+    máscara de `letras_bad`. Las letras acertadas ya están en el progreso y las palabras
+    falladas no cambian los candidatos, así que no forman parte de la clave."""
+    if isinstance(game_state, EstadoCompacto):
+        malas = game_state.mask_bad
+    else:
+        malas = 0
+        for ch in game_state["letras_bad"]:
+            malas |= BIT_LETRA.get(ch, 0)
+    return f"{game_state.get('categoria') or ''}\t{progreso(game_state)}\t{malas:x}"
+
+
+class CacheCandidatos:
+    """LRU acotado de clave de estado -> (candidatos, ranking), seguro entre hilos.
+
+    El límite es doble: `capacidad` entradas y `max_bytes` aproximados (los bitsets de grupos
+    grandes pesan). Cuenta aciertos, fallos y desalojos; `guardar`/`cargar` lo persisten en
+    JSON junto con la firma del banco, así un archivo de otro banco se ignora.
+    """
+
+    def __init__(self, capacidad: int = 65536, max_bytes: int = 32 << 20) -> None:
+        import threading
+        from collections import OrderedDict
+
+        self.capacidad = capacidad
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._datos: "OrderedDict[str, EntradaCandidatos]" = OrderedDict()
+        self._bytes = 0
+        self.aciertos = self.fallos = self.desalojos = 0
+
+    @staticmethod
+    def _peso(entrada: EntradaCandidatos) -> int:
+        return entrada[0].bit_length() // 8 + 48 * len(entrada[1]) + 96
+
+    def obtener(self, clave: str) -> EntradaCandidatos | None:
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return entrada
+
+    def guardar(self, clave: str, entrada: EntradaCandidatos) -> None:
+        with self._lock:
+            previa = self._datos.pop(clave, None)
+            if previa is not None:
+                self._bytes -= self._peso(previa)
+            self._datos[clave] = entrada
+            self._bytes += self._peso(entrada)
+            while self._datos and (len(self._datos) > self.capacidad or self._bytes > self.max_bytes):
+                _, vieja = self._datos.popitem(last=False)
+                self._bytes -= self._peso(vieja)
+                self.desalojos += 1
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def metricas(self) -> Dict[str, float]:
+        consultas = self.aciertos + self.fallos
+        return {"entradas": len(self._datos), "bytes": self._bytes, "aciertos": self.aciertos,
+                "fallos": self.fallos, "desalojos": self.desalojos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0}
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+            self._bytes = 0
+            self.aciertos = self.fallos = self.desalojos = 0
+
+    def guardar_en(self, ruta: str, firma: Any) -> int:
+        """Escribe las entradas (de la menos a la más usada); devuelve cuántas."""
+        import json
+
+        with self._lock:
+            entradas = [[clave, format(cand, "x"), rank] for clave, (cand, rank) in self._datos.items()]
+        tmp = ruta + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"v": VERSION_CACHE_CANDIDATOS, "firma": firma, "entradas": entradas}, fh,
+                      ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, ruta)
+        return len(entradas)
+
+    def cargar_de(self, ruta: str, firma: Any) -> int:
+        """Agrega las entradas del archivo si es de este banco; devuelve cuántas cargó."""
+        import json
+
+        try:
+            with open(ruta, encoding="utf-8") as fh:
+                datos = json.load(fh)
+        except (OSError, ValueError):
+            return 0
+        if datos.get("v") != VERSION_CACHE_CANDIDATOS or datos.get("firma") != firma:
+            return 0
+        for clave, cand, rank in datos["entradas"]:
+            self.guardar(clave, (int(cand, 16), [tuple(p) for p in rank]))
+        return len(datos["entradas"])
+
+
+class EstrategiaInformacion:
+    """Estrategia que elige la letra con máxima información esperada sobre los candidatos.
+
+    Los candidatos son las palabras del banco consistentes con `progreso` y `letras_bad`.
+    Con pocos candidatos se usa la partición exacta por posiciones de la letra; con muchos,
+    la entropía de "contiene / no contiene", que sale de popcounts sobre los bitsets.
+    Candidatos y ranking de cada estado se guardan en un `CacheCandidatos` (uno por
+    estrategia, compartido por todas las partidas y los hilos que la usen).
+    """
+
+    def __init__(self, banco: Mapping[str, Sequence[str]] | None = None, limite_exacto: int = 2048,
+                 cache: CacheCandidatos | None = None) -> None:
+        self._banco = banco
+        self._indice: IndiceCandidatos | None = None
+        self.limite_exacto = limite_exacto
+        # Sin `cache` explícito, el de CANDIDATES_CACHE_SIZE se crea a la primera consulta
+        self._cache = cache
+        self._cache_listo = cache is not None
+
+    @property
+    def cache(self) -> CacheCandidatos | None:
+        if not self._cache_listo:
+            self._cache_listo = True
+            if CANDIDATES_CACHE_SIZE > 0:
+                self._cache = CacheCandidatos(CANDIDATES_CACHE_SIZE)
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: CacheCandidatos | None) -> None:
+        self._cache, self._cache_listo = cache, True
+
+    @property
+    def indice(self) -> IndiceCandidatos:
+        # Se construye al primer uso (y una vez por proceso en la simulación paralela)
+        if self._indice is None:
+            self._indice = IndiceCandidatos(self.banco)
+        return self._indice
+
+    @property
+    def banco(self) -> Mapping[str, Sequence[str]]:
+        return self._banco if self._banco is not None else WORD_BANK
+
+    def firma(self) -> Any:
+        """Identifica banco y parámetros: un caché persistido solo vale para la misma firma."""
+        return [firma_banco(self.banco), self.limite_exacto, "".join(LETTER_ORDER)]
+
+    def _grupo(self, game_state: GameState) -> Tuple[_GrupoLongitud | None, str]:
+        visto = patron(game_state)
+        return self.indice.grupo(game_state.get("categoria"), len(visto)), visto
+
+    def _filtrar(self, game_state: GameState) -> Tuple[_GrupoLongitud | None, int]:
+        grupo, visto = self._grupo(game_state)
+        if grupo is None:
+            return None, 0
+        return grupo, grupo.filtrar(visto, game_state["letras_ok"], game_state["letras_bad"])
+
+    def _consultar(self, game_state: GameState) -> EntradaCandidatos:
+        """(candidatos, ranking) del estado: del caché, o calculados y guardados en él."""
+        if self.cache is None:
+            return self._calcular(game_state)
+        clave = clave_estado(game_state)
+        entrada = self.cache.obtener(clave)
+        if entrada is None:
+            # Se calcula fuera del lock: dos hilos con el mismo estado llegan al mismo resultado
+            entrada = self._calcular(game_state)
+            self.cache.guardar(clave, entrada)
+        return entrada
+
+    def candidatos(self, game_state: GameState) -> List[str]:
+        """Palabras del banco aún consistentes con el estado."""
+        cand, _ = self._consultar(game_state)
+        grupo, _ = self._grupo(game_state)
+        return [grupo.palabras[j] for j in grupo.indices(cand)] if grupo and cand else []
+
+    def ranking(self, game_state: GameState) -> List[Tuple[str, float, float]]:
+        """Letras no usadas ordenadas por (información esperada, probabilidad de acierto)."""
+        return self._consultar(game_state)[1]
+
+    def _calcular(self, game_state: GameState) -> EntradaCandidatos:
+        grupo, cand = self._filtrar(game_state)
+        if not cand:
+            return 0, []
+        usadas = set(game_state["letras_ok"]) | set(game_state["letras_bad"])
+        libres = [ch for ch in LETTER_ORDER if ch not in usadas]
+        total = cand.bit_count()
+        puntos: List[Tuple[str, float, float]] = []
+        if total <= self.limite_exacto:
+            palabras = [grupo.claves[j] for j in grupo.indices(cand)]
+            for ch in libres:
+                particion: Dict[Tuple[int, ...], int] = {}
+                for palabra in palabras:
+                    clave = tuple(i for i, x in enumerate(palabra) if x == ch)
+                    particion[clave] = particion.get(clave, 0) + 1
+                aciertos = total - particion.get((), 0)
+                puntos.append((ch, _entropia(particion.values(), total), aciertos / total))
+        else:
+            for ch in libres:
+                k = (cand & grupo.contiene.get(ch, 0)).bit_count()
+                puntos.append((ch, _entropia((k, total - k), total), k / total))
+        # sorted es estable: ante empate se respeta LETTER_ORDER
+        return cand, sorted(puntos, key=lambda p: (p[1], p[2]), reverse=True)
+
+    def __call__(self, game_state: GameState) -> str:
+        rank = self.ranking(game_state)
+        if not rank:
+            # Palabra fuera del banco: se recurre a la frecuencia fija
+            return next_auto_letter(game_state)
+        return rank[0][0]
+
+
+estrategia_informacion = EstrategiaInformacion()
+
+
+def cache_candidatos() -> CacheCandidatos | None:
+    """Caché de la estrategia compartida; con CANDIDATES_FILE se carga una vez y se guarda al salir."""
+    persistir_cache_candidatos()
+    return estrategia_informacion.cache
+
+
+def persistir_cache_candidatos() -> None:
+    """Con CANDIDATES_FILE, carga el caché (una vez) y registra su guardado al salir.
+
+    Lo llaman el menú, el servidor y las herramientas al arrancar; sin CANDIDATES_FILE no crea
+    el caché (ni importa `threading`): eso queda para la primera consulta de la estrategia.
+    """
+    if not CANDIDATES_FILE or _CACHE_PERSISTIDO:
+        return
+    cache = estrategia_informacion.cache
+    if cache is not None:
+        import atexit
+
+        _CACHE_PERSISTIDO.append(CANDIDATES_FILE)
+        cache.cargar_de(CANDIDATES_FILE, estrategia_informacion.firma())
+        atexit.register(_guardar_cache_candidatos)
+
+
+_CACHE_PERSISTIDO: List[str] = []  # ruta ya cargada (y registrada para guardarse al salir)
+
+
+def _guardar_cache_candidatos() -> None:
+    if estrategia_informacion.cache is not None and estrategia_informacion.cache.fallos:
+        try:
+            estrategia_informacion.cache.guardar_en(_CACHE_PERSISTIDO[0], estrategia_informacion.firma())
+        except OSError:
+            pass  # sin permisos de escritura: el próximo arranque empieza en frío
+
+
+
+# Modelo de frecuencias de letras por categoría y longitud (NumPy opcional, vectorizado)
+
+
+@lru_cache(maxsize=None)
+def hay_numpy() -> bool:
+    """True si NumPy está instalado (se comprueba sin importarlo, una vez y solo al consultarlo)."""
+    import importlib.util
+
+    return importlib.util.find_spec("numpy") is not None
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise RuntimeError("ModeloFrecuencias necesita NumPy (pip install numpy)") from e
+    return numpy
+
+
+# Códigos de las matrices del modelo: una columna por letra de LETRAS y una para espacios o signos
+_SIMBOLOS_MODELO = LETRAS + "?"
+_CODIGOS_MODELO = {ch: i for i, ch in enumerate(LETRAS)}
+_SIGNO_MODELO = len(LETRAS)
+
+
+class ModeloFrecuencias:
+    """Frecuencias de letras por (categoría, longitud) sobre matrices `uint8` de NumPy.
+
+    Cada grupo es una matriz n×largo con códigos de `_SIMBOLOS_MODELO` (a-z, ñ y un código
+    para espacios o signos), sobre las palabras plegadas. El ranking de la siguiente letra se
+    condiciona al patrón con máscaras booleanas por columna (sin recorrer palabras en Python).
+    `banco` puede ser un mapeo categoría -> palabras o un `DiccionarioMmap`; por defecto se usa
+    el diccionario externo activo o WORD_BANK. Las matrices se construyen al primer uso.
+    """
+
+    def __init__(self, banco: Mapping[str, Sequence[str]] | DiccionarioMmap | None = None) -> None:
+        self._banco = banco
+        self._matrices: Dict[Tuple[str | None, int], Any] = {}
+
+    @property
+    def banco(self) -> Mapping[str, Sequence[str]] | DiccionarioMmap:
+        if self._banco is None:
+            dic = diccionario()
+            self._banco = dic if dic is not None else WORD_BANK
+        return self._banco
+
+    def _codificar(self, categoria: str, largo: int) -> Any:
+        np = _numpy()
+        banco = self.banco
+        if isinstance(banco, DiccionarioMmap):
+            grupo = banco.grupos.get((categoria, largo))
+            if grupo is None:
+                return np.zeros((0, largo), dtype=np.uint8)
+            fid, offsets = grupo
+            # Se copian los bytes directamente del mmap: offset de cada palabra + columna
+            datos = np.frombuffer(banco._mapas[fid], dtype=np.uint8)
+            inicio = np.frombuffer(offsets, dtype=np.dtype(offsets.typecode)).astype(np.int64)
+            matriz = datos[inicio[:, None] + np.arange(largo)]
+            del datos
+            return (matriz | 0x20) - ord("a")  # a minúsculas y a códigos 0-25
+        claves = [k for k in map(clave_palabra, banco.get(categoria, ())) if len(k) == largo]
+        codigos = [_CODIGOS_MODELO.get(ch, _SIGNO_MODELO) for clave in claves for ch in clave]
+        return np.array(codigos, dtype=np.uint8).reshape(len(claves), largo)
+
+    def matriz(self, categoria: str | None, largo: int) -> Any:
+        """Matriz n×largo de la categoría (None: todas las categorías juntas)."""
+        clave = (categoria, largo)
+        m = self._matrices.get(clave)
+        if m is None:
+            if categoria is None:
+                banco = self.banco
+                cats = banco.categorias if isinstance(banco, DiccionarioMmap) else list(banco)
+                m = _numpy().concatenate([self.matriz(cat, largo) for cat in cats])
+            else:
+                m = self._codificar(categoria, largo)
+            self._matrices[clave] = m
+        return m
+
+    def frecuencias(self, categoria: str | None, largo: int) -> Tuple[Any, Any]:
+        """(posicional largo×símbolos, global por símbolo): fracción de palabras con cada letra
+        en cada posición, y fracción de palabras que contienen cada letra (ver `_SIMBOLOS_MODELO`)."""
+        np = _numpy()
+        m = self.matriz(categoria, largo)
+        n = max(len(m), 1)
+        simbolos = len(_SIMBOLOS_MODELO)
+        posicional = np.stack([np.bincount(m[:, i], minlength=simbolos) for i in range(largo)]) / n
+        return posicional, self._presencia(m).sum(axis=0) / n
+
+    @staticmethod
+    def _presencia(m: Any) -> Any:
+        np = _numpy()
+        pres = np.zeros((len(m), len(_SIMBOLOS_MODELO)), dtype=bool)
+        pres[np.arange(len(m))[:, None], m] = True
+        return pres
+
+    def ranking(self, game_state: GameState) -> List[Tuple[str, float]]:
+        """Letras no usadas por probabilidad de acierto entre los candidatos del patrón."""
+        np = _numpy()
+        visto = patron(game_state)
+        ok, bad = set(game_state["letras_ok"]), set(game_state["letras_bad"])
+        m = self.matriz(game_state.get("categoria"), len(visto))
+        usadas = np.zeros(len(_SIMBOLOS_MODELO), dtype=bool)
+        usadas[[_CODIGOS_MODELO[ch] for ch in ok | bad]] = True
+        # Una máscara por columna: la letra (o el signo) visible, o ninguna letra ya usada en las ocultas
+        mascara = np.ones(len(m), dtype=bool)
+        ocultas = []
+        for i, ch in enumerate(visto):
+            if ch == "_":
+                mascara &= ~usadas[m[:, i]]
+                ocultas.append(i)
+            else:
+                mascara &= m[:, i] == _CODIGOS_MODELO.get(ch, _SIGNO_MODELO)
+        cand = m[mascara][:, ocultas]
+        if not len(cand):
+            return []
+        cuentas = self._presencia(cand).sum(axis=0)
+        libres = [ch for ch in LETTER_ORDER if not usadas[_CODIGOS_MODELO[ch]]]
+        total = len(cand)
+        # sorted es estable: ante empate se respeta LETTER_ORDER
+        puntos = [(ch, float(cuentas[_CODIGOS_MODELO[ch]]) / total) for ch in libres]
+        return sorted(puntos, key=lambda p: p[1], reverse=True)
+
+    def __call__(self, game_state: GameState) -> str:
+        rank = self.ranking(game_state)
+        if not rank:
+            # Palabra fuera del banco: se recurre a la frecuencia fija
+            return next_auto_letter(game_state)
+        return rank[0][0]
+
+
+modelo_frecuencias = ModeloFrecuencias()
+
+
+
+# Tablas de juego precalculadas (árbol minimax por categoría, formato binario compacto)
+
+TABLES_FILE = os.environ.get("TABLES_FILE", "ahorcado_tablas.bin")
+
+
+def _resolver_minimax(cands: Tuple[str, ...], memo: Dict[Tuple[str, ...], Tuple[int, str | None]]
+                      ) -> Tuple[int, str | None]:
+    """(peor caso de fallos, mejor letra) para identificar la palabra entre `cands`.
+
+    Basta con memoizar por el conjunto de candidatos: las letras ya usadas aparecen igual en
+    todos ellos (no parten el conjunto) y por eso nunca vuelven a elegirse.
+    """
+    if len(cands) == 1:
+        return 0, None
+    previo = memo.get(cands)
+    if previo is not None:
+        return previo
+    presentes = set("".join(cands))
+    mejor: Tuple[int, str | None] = (len(cands), None)
+    for ch in LETTER_ORDER:
+        if ch not in presentes:
+            continue
+        partes: Dict[Tuple[int, ...], List[str]] = {}
+        for w in cands:
+            partes.setdefault(tuple(i for i, x in enumerate(w) if x == ch), []).append(w)
+        if len(partes) == 1:
+            continue  # no distingue candidatos
+        costo = 0
+        for clave, parte in partes.items():
+            costo = max(costo, _resolver_minimax(tuple(parte), memo)[0] + (0 if clave else 1))
+            if costo >= mejor[0]:
+                break  # poda: ya no mejora la mejor letra encontrada
+        if costo < mejor[0]:
+            mejor = (costo, ch)
+    memo[cands] = mejor
+    return mejor
+
+
+def _clave_tabla(visto: str, letras_bad: Any) -> str:
+    return visto + "|" + "".join(sorted(letras_bad))
+
+
+def construir_tabla(palabras: Sequence[str]) -> Tuple[Dict[str, str], Dict[str, int]]:
+    """Expande la política minimax de una categoría.
+
+    Devuelve `(tabla, fallos)`: `tabla` mapea cada estado alcanzable (patrón revelado,
+    letras falladas) a la letra óptima, y `fallos` da los intentos que gasta cada palabra.
+    """
+    memo: Dict[Tuple[str, ...], Tuple[int, str | None]] = {}
+    # Se juega sobre las claves plegadas (como `patron`), agrupadas por lo que se ve al empezar:
+    # el largo y los espacios o signos de las frases
+    claves = {w: clave_palabra(w) for w in dict.fromkeys(palabras)}
+    por_forma: Dict[str, Dict[str, None]] = {}
+    for clave in claves.values():
+        forma = "".join("_" if ch in LETRAS else ch for ch in clave)
+        por_forma.setdefault(forma, {})[clave] = None
+    tabla: Dict[str, str] = {}
+    fallos_clave: Dict[str, int] = {}
+    for grupo in por_forma.values():
+        for palabra in grupo:
+            cands = tuple(grupo)
+            letras = {ch for ch in palabra if ch in LETRAS}
+            ok: Set[str] = set()
+            bad: Set[str] = set()
+            while not letras <= ok:
+                if len(cands) > 1:
+                    ch = _resolver_minimax(cands, memo)[1]
+                else:
+                    # Candidato único: se revelan sus letras (todas aciertos)
+                    ch = next(x for x in palabra if x in LETRAS and x not in ok)
+                visto = "".join(x if x in ok or x not in LETRAS else "_" for x in palabra)
+                tabla[_clave_tabla(visto, bad)] = ch
+                (ok if ch in letras else bad).add(ch)
+                pos = tuple(i for i, x in enumerate(palabra) if x == ch)
+                cands = tuple(w for w in cands if tuple(i for i, x in enumerate(w) if x == ch) == pos)
+            fallos_clave[palabra] = len(bad)
+    return tabla, {w: fallos_clave[clave] for w, clave in claves.items()}
+
+
+def construir_tablas(banco: Mapping[str, Sequence[str]] | None = None
+                     ) -> Dict[str, Tuple[Dict[str, str], Dict[str, int]]]:
+    """Tablas de todas las categorías del banco (por defecto WORD_BANK)."""
+    banco = WORD_BANK if banco is None else banco
+    return {cat: construir_tabla(palabras) for cat, palabras in banco.items()}
+
+
+_MAGIA_TABLAS = b"AHTB2\n"
+# Sube cuando cambian las reglas de `construir_tabla`: invalida los archivos ya generados
+VERSION_TABLAS = 3
+
+
+def firma_tablas(banco: Mapping[str, Sequence[str]] | None = None) -> int:
+    """Identifica banco y reglas de las tablas: si cambian, un archivo guardado ya no sirve."""
+    from zlib import crc32
+
+    banco = WORD_BANK if banco is None else banco
+    return crc32(f"{VERSION_TABLAS}|{''.join(LETTER_ORDER)}|{firma_banco(banco)}".encode("utf-8"))
+
+
+def guardar_tablas(tablas: Mapping[str, Tuple[Dict[str, str], Dict[str, int]]], ruta: str,
+                   firma: int | None = None) -> int:
+    """Serializa las tablas en binario; devuelve los bytes escritos.
+
+    Formato: magia, u32 firma (`firma_tablas`, por defecto la de WORD_BANK), u16 nº de tablas
+    y por tabla: categoría (u8 + utf-8), u32 entradas (u8 largo + clave, u8 largo + letra),
+    u16 palabras (u8 largo + palabra + u8 fallos). Los textos van en utf-8 (ñ, tildes).
+    """
+    import struct
+
+    def texto(t: str) -> bytes:
+        b = t.encode("utf-8")
+        return struct.pack("<B", len(b)) + b
+
+    firma = firma_tablas() if firma is None else firma
+    partes = [_MAGIA_TABLAS, struct.pack("<IH", firma, len(tablas))]
+    for cat, (tabla, fallos) in tablas.items():
+        partes.append(texto(cat) + struct.pack("<I", len(tabla)))
+        for clave, ch in tabla.items():
+            partes.append(texto(clave) + texto(ch))
+        partes.append(struct.pack("<H", len(fallos)))
+        for palabra, n in fallos.items():
+            partes.append(texto(palabra) + struct.pack("<B", n))
+    datos = b"".join(partes)
+    with open(ruta, "wb") as fh:
+        fh.write(datos)
+    return len(datos)
+
+
+def cargar_tablas(ruta: str, firma: int | None = None) -> Dict[str, Tuple[Dict[str, str], Dict[str, int]]]:
+    """Lee el archivo de `guardar_tablas` a diccionarios (búsqueda O(1) por estado).
+
+    Con `firma`, un archivo generado para otro banco o con otras reglas da ValueError.
+    """
+    import struct
+
+    with open(ruta, "rb") as fh:
+        datos = fh.read()
+    if not datos.startswith(_MAGIA_TABLAS):
+        raise ValueError(f"{ruta} no es un archivo de tablas (o es de una versión anterior)")
+    pos = len(_MAGIA_TABLAS)
+
+    def leer(fmt: str) -> int:
+        nonlocal pos
+        (valor,) = struct.unpack_from(fmt, datos, pos)
+        pos += struct.calcsize(fmt)
+        return valor
+
+    def leer_bytes(n: int) -> bytes:
+        nonlocal pos
+        pos += n
+        return datos[pos - n:pos]
+
+    def leer_texto() -> str:
+        return leer_bytes(leer("<B")).decode("utf-8")
+
+    guardada = leer("<I")
+    if firma is not None and guardada != firma:
+        raise ValueError(f"{ruta} se generó para otro banco o con otras reglas: regenerarlo con `tablas`")
+    tablas: Dict[str, Tuple[Dict[str, str], Dict[str, int]]] = {}
+    for _ in range(leer("<H")):
+        cat = leer_texto()
+        tabla = {}
+        for _ in range(leer("<I")):
+            clave = leer_texto()
+            tabla[clave] = leer_texto()
+        fallos = {}
+        for _ in range(leer("<H")):
+            palabra = leer_texto()
+            fallos[palabra] = leer("<B")
+        tablas[cat] = (tabla, fallos)
+    return tablas
+
+
+class EstrategiaTabla:
+    """Juega consultando la tabla precalculada de la categoría; fuera de ella usa la frecuencia."""
+
+    def __init__(self, tablas: Mapping[str, Tuple[Dict[str, str], Dict[str, int]]] | None = None,
+                 ruta: str | None = None) -> None:
+        self._tablas = tablas
+        self._ruta = ruta
+
+    @property
+    def tablas(self) -> Mapping[str, Tuple[Dict[str, str], Dict[str, int]]]:
+        if self._tablas is None:
+            ruta = self._ruta or TABLES_FILE
+            self._tablas = None
+            if os.path.exists(ruta):
+                try:
+                    self._tablas = cargar_tablas(ruta, firma_tablas())
+                except ValueError as e:
+                    print(f"Aviso: {e}; se usan tablas calculadas en memoria", file=sys.stderr)
+            if self._tablas is None:
+                # Sin archivo válido se expanden en memoria (rápido para WORD_BANK)
+                self._tablas = construir_tablas()
+        return self._tablas
+
+    def __call__(self, game_state: GameState) -> str:
+        tabla = self.tablas.get(game_state.get("categoria"))
+        if tabla is not None:
+            clave = _clave_tabla(patron(game_state), game_state["letras_bad"])
+            ch = tabla[0].get(clave)
+            if ch is not None and ch not in game_state["letras_ok"] and ch not in game_state["letras_bad"]:
+                return ch
+        return next_auto_letter(game_state)
+
+
+estrategia_tabla = EstrategiaTabla()
+
+
+
+# Simulación sin interfaz (headless) para benchmarks y carga
+
+# Una estrategia recibe el estado y propone la siguiente letra
+Estrategia = Callable[[GameState], str]
+
+
+def jugar_partida_auto(palabra: str, max_intentos: int = 6,
+                       estrategia: Estrategia = next_auto_letter,
+                       compacto: bool = False, categoria: str | None = None) -> GameState:
+    """Juega una partida completa sin E/S ni pausas y devuelve el estado final."""
+    state = create_game_state(palabra, max_intentos=max_intentos, compacto=compacto, categoria=categoria)
+    pasos = 0
+    while not (gano(state) or perdio(state)) and pasos < len(LETRAS):
+        try:
+            state, _ = intento_letra(state, estrategia(state))
+        except ValueError:
+            # La estrategia propuso una letra inválida o repetida: la partida termina
+            break
+        pasos += 1
+    return state
+
+
+def nuevo_resumen() -> Dict[str, Any]:
+    """Crea un acumulador vacío de estadísticas de simulación."""
+    return {"partidas": 0, "ganadas": 0, "grupos": {}, "intentos": {}, "segundos": 0.0}
+
+
+def registrar_partida(resumen: Dict[str, Any], cat: str, diff: str, game_state: GameState) -> None:
+    """Agrega el resultado de una partida al resumen (por grupo e histograma de intentos)."""
+    ok = int(gano(game_state))
+    usados = intentos_usados(game_state)
+    resumen["partidas"] += 1
+    resumen["ganadas"] += ok
+    grupo = resumen["grupos"].setdefault((cat, diff), [0, 0])
+    grupo[0] += 1
+    grupo[1] += ok
+    resumen["intentos"][usados] = resumen["intentos"].get(usados, 0) + 1
+
+
+def simular_partidas(n: int, estrategia: Estrategia = next_auto_letter,
+                     categorias: List[str] | None = None,
+                     dificultades: List[str] | None = None,
+                     seed: int | None = None, compacto: bool = False) -> Dict[str, Any]:
+    """Simula `n` partidas sobre WORD_BANK sin renderizar y devuelve el resumen agregado."""
+    rng = random.Random(seed)
+    cats = list(categorias or WORD_BANK.keys())
+    diffs = list(dificultades or DIFFICULTY.keys())
+    resumen = nuevo_resumen()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        cat = rng.choice(cats)
+        diff = rng.choice(diffs)
+        estado = jugar_partida_auto(rng.choice(WORD_BANK[cat]), DIFFICULTY[diff]["max_intentos"], estrategia,
+                                    compacto, cat)
+        registrar_partida(resumen, cat, diff, estado)
+    resumen["segundos"] = time.perf_counter() - t0
+    return resumen
+
+
+def fusionar_resumen(destino: Dict[str, Any], parcial: Dict[str, Any]) -> Dict[str, Any]:
+    """Suma un resumen parcial (de otro proceso/shard) sobre `destino` y lo devuelve."""
+    destino["partidas"] += parcial["partidas"]
+    destino["ganadas"] += parcial["ganadas"]
+    for clave, (jugadas, ganadas) in parcial["grupos"].items():
+        grupo = destino["grupos"].setdefault(clave, [0, 0])
+        grupo[0] += jugadas
+        grupo[1] += ganadas
+    for usados, cuenta in parcial["intentos"].items():
+        destino["intentos"][usados] = destino["intentos"].get(usados, 0) + cuenta
+    return destino
+
+
+def medir_estado(compacto: bool, partidas: int = 2000) -> Dict[str, float]:
+    """Mide tiempo y memoria retenida por intento de letra para una representación de estado."""
+    import tracemalloc
+
+    palabras = [p for ps in WORD_BANK.values() for p in ps]
+    t0 = time.perf_counter()
+    intentos = 0
+    for i in range(partidas):
+        state = create_game_state(palabras[i % len(palabras)], max_intentos=26, compacto=compacto)
+        while not (gano(state) or perdio(state)):
+            state, _ = intento_letra(state, next_auto_letter(state))
+            intentos += 1
+    segundos = time.perf_counter() - t0
+
+    # Memoria: se retienen todos los estados intermedios de una partida por palabra
+    tracemalloc.start()
+    retenidos: List[GameState] = []
+    for palabra in palabras:
+        state = create_game_state(palabra, max_intentos=26, compacto=compacto)
+        while not (gano(state) or perdio(state)):
+            state, _ = intento_letra(state, next_auto_letter(state))
+            retenidos.append(state)
+    usados, _ = tracemalloc.get_traced_memory()
+    bloques = sum(st.count for st in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    return {
+        "us_por_intento": 1e6 * segundos / max(intentos, 1),
+        "bytes_por_estado": usados / max(len(retenidos), 1),
+        "bloques_por_estado": bloques / max(len(retenidos), 1),
+    }
+
+
+def medir_progreso(largo: int = 400, partidas: int = 200) -> Dict[str, float]:
+    """µs por jugada (intento + progreso coloreado) en una palabra de `largo` letras: recorriendo
+    la palabra en cada frame (como antes) o derivándolo del buffer `revelado` del estado."""
+    rng = random.Random(0)
+    palabra = "".join(rng.choice(LETTER_ORDER[:20]) for _ in range(largo))
+    oculta = c("_", FG["yellow"])
+
+    def escaneando(state: GameState) -> str:
+        prog = " ".join([ch if ch in state["letras_ok"] else "_" for ch in state["palabra"]])
+        return " ".join([p if p != "_" else oculta for p in prog.split(" ")])
+
+    def con_buffer(state: GameState) -> str:
+        return progreso(state).replace("_", oculta)
+
+    res: Dict[str, float] = {}
+    for nombre, pintar in (("escaneando", escaneando), ("buffer", con_buffer)):
+        t0 = time.perf_counter()
+        jugadas = 0
+        for _ in range(partidas):
+            state = create_game_state(palabra, max_intentos=26, compacto=True)
+            for letra in LETTER_ORDER:
+                if gano(state):
+                    break
+                state, _ = intento_letra(state, letra)
+                pintar(state)
+                jugadas += 1
+        res[nombre] = 1e6 * (time.perf_counter() - t0) / jugadas
+    return res
+
+
+# Estrategias disponibles por nombre (los workers las resuelven por nombre, así son serializables)
+ESTRATEGIAS: Dict[str, Estrategia] = {
+    "frecuencia": next_auto_letter,
+    "aleatoria": letra_aleatoria,
+    "informacion": estrategia_informacion,
+    "tabla": estrategia_tabla,
+}
+
+
+def estrategias_disponibles() -> Dict[str, Estrategia]:
+    """ESTRATEGIAS con `modelo` si hay NumPy: la comprobación se hace al primer uso, no al importar."""
+    if "modelo" not in ESTRATEGIAS and hay_numpy():
+        ESTRATEGIAS["modelo"] = modelo_frecuencias
+    return ESTRATEGIAS
+
+# Unidad de trabajo: (categoria, palabra, dificultad, estrategia)
+Unidad = Tuple[str, str, str, str]
+
+
+def unidades_exhaustivas(estrategias: List[str] | None = None,
+                         repeticiones: int = 1) -> List[Unidad]:
+    """Todas las combinaciones (palabra, dificultad, estrategia) de WORD_BANK, `repeticiones` veces."""
+    nombres = list(estrategias or estrategias_disponibles().keys())
+    return [
+        (cat, palabra, diff, est)
+        for _ in range(repeticiones)
+        for cat, palabras in WORD_BANK.items()
+        for palabra in palabras
+        for diff in DIFFICULTY
+        for est in nombres
+    ]
+
+
+def _simular_shard(trabajo: Tuple[int, int, List[Unidad]]) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+    """Ejecuta un shard en un worker: devuelve (id_shard, resumen por estrategia)."""
+    shard_id, seed, unidades = trabajo
+    # Semilla derivada del shard: el resultado no depende de qué proceso lo ejecute
+    random.seed(seed * 1_000_003 + shard_id)
+    resumenes: Dict[str, Dict[str, Any]] = {}
+    for cat, palabra, diff, est in unidades:
+        estado = jugar_partida_auto(palabra, DIFFICULTY[diff]["max_intentos"], estrategias_disponibles()[est],
+                                    categoria=cat)
+        registrar_partida(resumenes.setdefault(est, nuevo_resumen()), cat, diff, estado)
+    return shard_id, resumenes
+
+
+def iter_simulacion_paralela(unidades: List[Unidad], jobs: int | None = None, seed: int = 0,
+                             tam_shard: int = 2000):
+    """Reparte `unidades` en shards sobre un pool de procesos y va entregando
+    `(id_shard, resumen_por_estrategia)` a medida que terminan (orden no garantizado)."""
+    shards = [(i, seed, unidades[ini:ini + tam_shard])
+              for i, ini in enumerate(range(0, len(unidades), tam_shard))]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(shards) <= 1:
+        for shard in shards:
+            yield _simular_shard(shard)
+        return
+    import multiprocessing
+    with multiprocessing.Pool(processes=min(jobs, len(shards))) as pool:
+        yield from pool.imap_unordered(_simular_shard, shards)
+
+
+def simular_paralelo(unidades: List[Unidad], jobs: int | None = None, seed: int = 0,
+                     tam_shard: int = 2000,
+                     al_recibir: Callable[[int, Dict[str, Dict[str, Any]]], None] | None = None,
+                     ) -> Dict[str, Dict[str, Any]]:
+    """Simula las unidades en paralelo y fusiona los parciales en orden de shard (determinista)."""
+    t0 = time.perf_counter()
+    parciales: Dict[int, Dict[str, Dict[str, Any]]] = {}
+    for shard_id, parcial in iter_simulacion_paralela(unidades, jobs, seed, tam_shard):
+        parciales[shard_id] = parcial
+        if al_recibir is not None:
+            al_recibir(shard_id, parcial)
+    total: Dict[str, Dict[str, Any]] = {}
+    for shard_id in sorted(parciales):
+        for est, parcial in parciales[shard_id].items():
+            fusionar_resumen(total.setdefault(est, nuevo_resumen()), parcial)
+    segundos = time.perf_counter() - t0
+    for resumen in total.values():
+        resumen["segundos"] = segundos
+    return total
+
+
+def formatear_resumen(resumen: Dict[str, Any]) -> List[str]:
+    """Convierte un resumen de simulación en líneas listas para `make_box`."""
+    total = resumen["partidas"]
+    seg = resumen["segundos"]
+    lines = [
+        f"Partidas: {total}   Ganadas: {resumen['ganadas']} ({100.0 * resumen['ganadas'] / max(total, 1):.1f}%)",
+        f"Tiempo: {seg:.3f}s   Partidas/s: {total / seg if seg > 0 else 0:,.0f}",
+        "",
+        c("Tasa de victoria por categoria / dificultad", BOLD),
+    ]
+    for (cat, diff), (jugadas, ganadas) in sorted(resumen["grupos"].items()):
+        lines.append(f"  {cat:<12} {diff:<8} {ganadas:>8}/{jugadas:<8} {100.0 * ganadas / jugadas:5.1f}%")
+    lines += ["", c("Distribucion de intentos usados", BOLD)]
+    pico = max(resumen["intentos"].values(), default=1)
+    for usados, cuenta in sorted(resumen["intentos"].items()):
+        barra = "#" * max(1, round(30 * cuenta / pico))
+        lines.append(f"  {usados:>2} | {barra:<30} {cuenta}")
+    return lines
+
+
+
+# Dureza de palabras (puntajes precalculados con el solver automático y bandas por dificultad)
+
+# Archivo de puntajes que escribe el comando `dureza` ("": no se lee; WORD_BANK se puntúa en
+# memoria al primer sorteo por dificultad). Jugar nunca lo escribe.
+HARDNESS_FILE = os.environ.get("HARDNESS_FILE", "")
+VERSION_DUREZA = 1
+# Intentos de sobra: el solver siempre termina y el puntaje es cuántas letras falló
+_INTENTOS_PUNTAJE = len(LETRAS)
+# Palabras mínimas por banda: con menos, el pool sin repetición de cada banda se vuelve fijo
+_MIN_BANDA = 3
+
+_PUNTUADOR: Dict[str, Any] = {}
+
+
+class _DecisionesMemo:
+    """Envuelve una estrategia determinista y recuerda su letra por (categoría, patrón, falladas).
+
+    Al puntuar, todas las palabras de una longitud empiezan en el mismo estado y recorren el
+    mismo árbol de decisiones: cada nodo se calcula una vez y no una vez por palabra.
+    """
+
+    def __init__(self, estrategia: Estrategia, limite: int = 200_000) -> None:
+        self.estrategia = estrategia
+        self.limite = limite
+        self._memo: Dict[Tuple[Any, str, FrozenSet[str]], str] = {}
+
+    def __call__(self, game_state: GameState) -> str:
+        clave = (game_state.get("categoria"), progreso(game_state), frozenset(game_state["letras_bad"]))
+        letra = self._memo.get(clave)
+        if letra is None:
+            if len(self._memo) >= self.limite:
+                self._memo.clear()
+            letra = self._memo[clave] = self.estrategia(game_state)
+        return letra
+
+
+_BANDAS: Dict[str, Any] = {}  # "actual" -> bandas del banco activo (o None si no hay puntajes)
+
+
+def _iniciar_puntuador(estrategia: str, banco: Mapping[str, Sequence[str]] | str | None) -> None:
+    """Prepara la estrategia una vez por proceso (con "informacion", su índice sobre el banco)."""
+    if isinstance(banco, str):
+        # Ruta de un diccionario externo: cada worker lo abre (el índice `.idx` ya está escrito)
+        dic = DiccionarioMmap(banco)
+        banco = {cat: list(dic.vista(cat)) for cat in dic.categorias}
+        dic.cerrar()
+    elegida = EstrategiaInformacion(banco) if estrategia == "informacion" else estrategias_disponibles()[estrategia]
+    # "aleatoria" no es determinista: memorizar sus decisiones cambiaría lo que mide
+    _PUNTUADOR["estrategia"] = elegida if estrategia == "aleatoria" else _DecisionesMemo(elegida)
+
+
+def puntaje_dureza(palabra: str, categoria: str | None = None,
+                   estrategia: Estrategia = next_auto_letter) -> int:
+    """Letras falladas por `estrategia` hasta adivinar `palabra` (más alto = más difícil)."""
+    state = jugar_partida_auto(palabra, _INTENTOS_PUNTAJE, estrategia, compacto=True, categoria=categoria)
+    return intentos_usados(state) if gano(state) else _INTENTOS_PUNTAJE
+
+
+def _puntuar_lote(lote: Tuple[str, List[str]]) -> Tuple[str, List[Tuple[str, int]]]:
+    cat, palabras = lote
+    estrategia = _PUNTUADOR["estrategia"]
+    return cat, [(w, puntaje_dureza(w, cat, estrategia)) for w in palabras]
+
+
+def puntuar_palabras(banco: Mapping[str, Sequence[str]] | DiccionarioMmap | None = None,
+                     estrategia: str = "frecuencia", jobs: int | None = None,
+                     tam_lote: int = 500) -> Dict[str, Dict[str, int]]:
+    """Puntaje de dureza de cada palabra del banco: `{categoria: {palabra: puntaje}}`.
+
+    Por defecto se puntúa con la estrategia del jugador automático ("frecuencia"): la de
+    información ya conoce el banco chico y adivina cualquiera de sus palabras sin fallar.
+    Los lotes se reparten en un pool de procesos; cada worker arma su estrategia una sola vez.
+    """
+    if banco is None:
+        banco = diccionario() or banco_palabras()
+    if isinstance(banco, DiccionarioMmap):
+        listas = {cat: banco.vista(cat) for cat in banco.categorias}
+        origen: Any = banco.ruta
+    else:
+        listas, origen = banco, banco
+    lotes = []
+    for cat, palabras in listas.items():
+        # Ordenadas por longitud: las palabras de un lote comparten el árbol de decisiones
+        unicas = sorted(dict.fromkeys(palabras), key=len)
+        lotes += [(cat, unicas[i:i + tam_lote]) for i in range(0, len(unicas), tam_lote)]
+    puntajes: Dict[str, Dict[str, int]] = {cat: {} for cat in listas}
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(lotes) <= 1:
+        _iniciar_puntuador(estrategia, dict(listas) if isinstance(origen, str) else origen)
+        for cat, pares in map(_puntuar_lote, lotes):
+            puntajes[cat].update(pares)
+        return puntajes
+    import multiprocessing
+    with multiprocessing.Pool(min(jobs, len(lotes)), _iniciar_puntuador, (estrategia, origen)) as pool:
+        for cat, pares in pool.imap_unordered(_puntuar_lote, lotes):
+            puntajes[cat].update(pares)
+    return puntajes
+
+
+def firma_banco(banco: Mapping[str, Sequence[str]] | DiccionarioMmap) -> Any:
+    """Identifica el banco puntuado: si cambia, los puntajes guardados ya no sirven."""
+    import json
+    from zlib import crc32
+
+    if isinstance(banco, DiccionarioMmap):
+        return banco._firma()
+    return crc32(json.dumps({cat: list(ps) for cat, ps in banco.items()}, sort_keys=True).encode("utf-8"))
+
+
+def guardar_dureza(puntajes: Mapping[str, Mapping[str, int]], ruta: str, firma: Any,
+                   estrategia: str = "frecuencia") -> None:
+    import json
+
+    datos = {"v": VERSION_DUREZA, "estrategia": estrategia, "firma": firma, "puntajes": puntajes}
+    tmp = ruta + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(datos, fh, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, ruta)
+
+
+def cargar_dureza(ruta: str) -> Dict[str, Any] | None:
+    """Contenido del archivo de puntajes, o None si no existe o es de otra versión."""
+    import json
+
+    try:
+        with open(ruta, encoding="utf-8") as fh:
+            datos = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return datos if datos.get("v") == VERSION_DUREZA else None
+
+
+def bandas_por_dureza(puntajes: Mapping[str, Mapping[str, int]],
+                      minimo: int = _MIN_BANDA) -> Dict[str, Dict[str, Tuple[str, ...]]]:
+    """Por categoría, ventanas de las palabras ordenadas por puntaje: las más fáciles para
+    "facil", las del medio para "media" y las más difíciles para "dificil".
+
+    Cada banda tiene un tercio de la categoría y al menos `minimo` palabras (en categorías
+    chicas se solapan), y nunca corta un empate: incluye todas las palabras con el puntaje de
+    sus extremos. Si todos los puntajes son iguales no hay bandas y cada dificultad usa la
+    categoría entera.
+    """
+    nombres = tuple(DIFFICULTY)
+    bandas: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+    for cat, por_palabra in puntajes.items():
+        orden = sorted(por_palabra, key=lambda w: (por_palabra[w], w))
+        if not orden or por_palabra[orden[0]] == por_palabra[orden[-1]]:
+            bandas[cat] = {nombre: tuple(orden) for nombre in nombres}
+            continue
+        tam = min(len(orden), max(-(-len(orden) // len(nombres)), minimo))
+        bandas[cat] = {}
+        for i, nombre in enumerate(nombres):
+            inicio = (len(orden) - tam) * i // max(1, len(nombres) - 1)
+            bajo, alto = por_palabra[orden[inicio]], por_palabra[orden[inicio + tam - 1]]
+            bandas[cat][nombre] = tuple(w for w in orden if bajo <= por_palabra[w] <= alto)
+    return bandas
+
+
+def _cargar_bandas() -> Dict[str, Dict[str, Tuple[str, ...]]] | None:
+    dic = diccionario()
+    origen = dic if dic is not None else banco_palabras()
+    firma = firma_banco(origen)
+    datos = cargar_dureza(HARDNESS_FILE) if HARDNESS_FILE else None
+    if datos is not None and datos["firma"] == firma:
+        return bandas_por_dureza(datos["puntajes"])
+    if dic is not None:
+        # Un diccionario grande se puntúa aparte (`dureza`): sin puntajes se sortea sin bandas
+        return None
+    # El banco en memoria es chico: se puntúa aquí y no se escribe nada en disco
+    return bandas_por_dureza(puntuar_palabras(origen, jobs=1))
+
+
+def bandas_dureza() -> Dict[str, Dict[str, Tuple[str, ...]]] | None:
+    """Bandas del banco activo; se leen (o se calculan) una vez, al primer sorteo por dificultad."""
+    if "actual" not in _BANDAS:
+        _BANDAS["actual"] = _cargar_bandas()
+    return _BANDAS["actual"]
+
+
+
+# Torneo de estrategias (misma secuencia de palabras para todas, en un pool de procesos)
+
+# Una estrategia del torneo: nombre de estrategias_disponibles(), "modulo:funcion" o un callable importable
+EspecEstrategia = Any
+
+
+class _TiempoAgotado(BaseException):
+    """La estrategia superó el presupuesto de tiempo por decisión (no la atrapa un `except Exception`)."""
+
+
+_ESTRATEGIAS_RESUELTAS: Dict[str, Estrategia] = {}
+
+
+def resolver_estrategia(spec: EspecEstrategia) -> Estrategia:
+    """Callable de una estrategia: tal cual, por nombre en ESTRATEGIAS o importando "modulo:funcion"."""
+    if callable(spec):
+        return spec
+    if spec in estrategias_disponibles():
+        return estrategias_disponibles()[spec]
+    est = _ESTRATEGIAS_RESUELTAS.get(spec)
+    if est is None:
+        import importlib
+
+        modulo, sep, nombre = spec.partition(":")
+        if not sep:
+            raise ValueError(f"Estrategia desconocida: {spec!r} (usa un nombre o modulo:funcion)")
+        est = _ESTRATEGIAS_RESUELTAS[spec] = getattr(importlib.import_module(modulo), nombre)
+    return est
+
+
+def secuencia_torneo(n: int, seed: int = 0,
+                     banco: Mapping[str, Sequence[str]] | DiccionarioMmap | None = None) -> List[Tuple[str, str]]:
+    """`n` pares (categoria, palabra) sorteados con `random.Random(seed)`: la misma para todos."""
+    rng = random.Random(seed)
+    banco = banco_palabras() if banco is None else banco
+    if isinstance(banco, DiccionarioMmap):
+        return [banco.elegir(None, rng) for _ in range(n)]
+    cats = list(banco)
+    secuencia = []
+    for _ in range(n):
+        cat = rng.choice(cats)
+        secuencia.append((cat, rng.choice(banco[cat])))
+    return secuencia
+
+
+def _nuevo_marcador() -> Dict[str, Any]:
+    return {"partidas": 0, "ganadas": 0, "intentos": 0, "decisiones": 0, "segundos": 0.0,
+            "excedidos": 0, "errores": 0, "por_dificultad": {}}
+
+
+def _jugar_lote_torneo(tarea: Tuple[int, str, EspecEstrategia, str, List[Tuple[str, str]], float, int]
+                       ) -> Tuple[str, Dict[str, Any]]:
+    """Juega un lote de la secuencia con una estrategia y una dificultad (corre en un worker).
+
+    Cada decisión tiene `presupuesto` segundos: con `signal.setitimer` (POSIX, hilo principal) la
+    llamada se interrumpe al vencer; sin él (Windows, o `torneo` llamado desde otro hilo, donde
+    `signal.signal` no se puede usar) se mide y se penaliza después. Pasarse o fallar pierde la partida.
+    """
+    import signal
+    import threading
+
+    lote_id, nombre, spec, dificultad, palabras, presupuesto, seed = tarea
+    random.seed(seed * 1_000_003 + lote_id)  # para estrategias con azar: no depende del worker
+    estrategia = resolver_estrategia(spec)
+    max_int = DIFFICULTY[dificultad]["max_intentos"]
+    marcador = _nuevo_marcador()
+    por_dif = marcador["por_dificultad"].setdefault(dificultad, [0, 0])
+    reloj = time.perf_counter
+    alarma = (hasattr(signal, "setitimer") and presupuesto > 0
+              and threading.current_thread() is threading.main_thread())
+
+    def vencido(signum: int, frame: Any) -> None:
+        raise _TiempoAgotado()
+
+    def decidir(state: GameState, limite: float) -> str | None:
+        """Letra propuesta, o None si se agotó `limite` (las excepciones de la estrategia siguen)."""
+        if not alarma:
+            return estrategia(state)
+        signal.setitimer(signal.ITIMER_REAL, limite)
+        try:
+            return estrategia(state)
+        except _TiempoAgotado:
+            return None
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    previo = signal.signal(signal.SIGALRM, vencido) if alarma else None
+    try:
+        if palabras:
+            # Calentamiento sin contar (índices y modelos perezosos), con un límite más holgado
+            try:
+                decidir(create_game_state(palabras[0][1], max_int, compacto=True, categoria=palabras[0][0]),
+                        max(1.0, 20 * presupuesto))
+            except (Exception, _TiempoAgotado):
+                pass
+        for cat, palabra in palabras:
+            state = create_game_state(palabra, max_int, compacto=True, categoria=cat)
+            while not (gano(state) or perdio(state)):
+                t0 = reloj()
+                try:
+                    letra = decidir(state, presupuesto)
+                except _TiempoAgotado:
+                    letra = None  # venció justo al desarmar la alarma
+                except Exception:
+                    marcador["errores"] += 1
+                    break
+                dt = reloj() - t0
+                marcador["decisiones"] += 1
+                marcador["segundos"] += dt
+                if letra is None or (presupuesto > 0 and dt > presupuesto):
+                    marcador["excedidos"] += 1
+                    break
+                try:
+                    state, _ = intento_letra(state, letra)
+                except ValueError:
+                    marcador["errores"] += 1
+                    break
+            ganada = gano(state)
+            marcador["partidas"] += 1
+            marcador["ganadas"] += ganada
+            # Una partida abandonada cuenta todos los intentos (como si se hubiera perdido)
+            marcador["intentos"] += intentos_usados(state) if ganada or perdio(state) else max_int
+            por_dif[0] += 1
+            por_dif[1] += ganada
+    finally:
+        if alarma:
+            signal.signal(signal.SIGALRM, previo)
+    return nombre, marcador
+
+
+def _sumar_marcador(destino: Dict[str, Any], parcial: Mapping[str, Any]) -> None:
+    for clave in ("partidas", "ganadas", "intentos", "decisiones", "segundos", "excedidos", "errores"):
+        destino[clave] += parcial[clave]
+    for dif, (jugadas, ganadas) in parcial["por_dificultad"].items():
+        acum = destino["por_dificultad"].setdefault(dif, [0, 0])
+        acum[0] += jugadas
+        acum[1] += ganadas
+
+
+def torneo(estrategias: Mapping[str, EspecEstrategia], secuencia: Sequence[Tuple[str, str]],
+           jobs: int | None = None, presupuesto: float = 0.05, seed: int = 0,
+           tam_lote: int = 100) -> Dict[str, Dict[str, Any]]:
+    """Juega cada estrategia contra la misma `secuencia` en cada DIFFICULTY; marcador por nombre.
+
+    Las estrategias viajan a los workers por nombre o "modulo:funcion" (un callable debe ser
+    importable por el worker, p. ej. una función de nivel de módulo).
+    """
+    tareas = []
+    for nombre, spec in estrategias.items():
+        for dificultad in DIFFICULTY:
+            for ini in range(0, len(secuencia), tam_lote):
+                tareas.append((len(tareas), nombre, spec, dificultad, list(secuencia[ini:ini + tam_lote]),
+                               presupuesto, seed))
+    marcadores = {nombre: _nuevo_marcador() for nombre in estrategias}
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(tareas) <= 1:
+        for nombre, parcial in map(_jugar_lote_torneo, tareas):
+            _sumar_marcador(marcadores[nombre], parcial)
+        return marcadores
+    import multiprocessing
+    with multiprocessing.Pool(processes=min(jobs, len(tareas))) as pool:
+        for nombre, parcial in pool.imap_unordered(_jugar_lote_torneo, tareas):
+            _sumar_marcador(marcadores[nombre], parcial)
+    return marcadores
+
+
+def tabla_torneo(marcadores: Mapping[str, Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """Filas de la tabla de posiciones: más victorias, luego menos intentos, luego más rápida."""
+    filas = []
+    for nombre, m in marcadores.items():
+        fila = {
+            "estrategia": nombre,
+            "partidas": m["partidas"],
+            "ganadas": m["ganadas"],
+            "tasa": m["ganadas"] / max(m["partidas"], 1),
+            "intentos_medios": m["intentos"] / max(m["partidas"], 1),
+            "us_por_decision": 1e6 * m["segundos"] / max(m["decisiones"], 1),
+            "excedidos": m["excedidos"],
+            "errores": m["errores"],
+        }
+        for dif in DIFFICULTY:
+            jugadas, ganadas = m["por_dificultad"].get(dif, (0, 0))
+            fila[f"tasa_{dif}"] = ganadas / max(jugadas, 1)
+        filas.append(fila)
+    filas.sort(key=lambda f: (-f["tasa"], f["intentos_medios"], f["us_por_decision"], f["estrategia"]))
+    for puesto, fila in enumerate(filas, 1):
+        fila["puesto"] = puesto
+    return filas
+
+
+def lineas_torneo(filas: Sequence[Mapping[str, Any]]) -> List[str]:
+    """La tabla de posiciones en líneas para `make_box`."""
+    difs = " ".join(f"{d[:7]:>7}" for d in DIFFICULTY)
+    lines = [c(f"{'#':>2} {'estrategia':<16} {'ganadas':>8} {'intentos':>8} {'us/dec':>9} "
+               f"{'excedidos':>9}  {difs}", BOLD)]
+    for f in filas:
+        tasas = " ".join(f"{100 * f[f'tasa_{d}']:6.1f}%" for d in DIFFICULTY)
+        lines.append(f"{f['puesto']:>2} {f['estrategia'][:16]:<16} {100 * f['tasa']:7.1f}% "
+                     f"{f['intentos_medios']:>8.2f} {f['us_por_decision']:>9.1f} {f['excedidos']:>9}  {tasas}")
+    return lines
+
+
+def exportar_torneo_csv(filas: Sequence[Mapping[str, Any]], salida: Any) -> None:
+    """Escribe la tabla de posiciones como CSV en el archivo abierto `salida`."""
+    import csv
+
+    columnas = ["puesto", "estrategia", "partidas", "ganadas", "tasa", "intentos_medios", "us_por_decision",
+                "excedidos", "errores"] + [f"tasa_{d}" for d in DIFFICULTY]
+    escritor = csv.DictWriter(salida, fieldnames=columnas, lineterminator="\n")
+    escritor.writeheader()
+    for fila in filas:
+        escritor.writerow({k: (f"{v:.6f}" if isinstance(v, float) else v) for k, v in fila.items()})
+
+
+
+# Grabación y reproducción determinista de partidas (una línea JSON por partida)
+
+# REPLAY_FILE=ruta agrega cada partida de consola al archivo de grabaciones
+REPLAY_FILE = os.environ.get("REPLAY_FILE", "")
+VERSION_GRABACION = 1
+
+
+def resultado_partida(game_state: GameState) -> str:
+    return "gano" if gano(game_state) else "perdio" if perdio(game_state) else "en_curso"
+
+
+def registro_partida(semilla: int, cat: str, dificultad: str, palabra: str, entradas: Sequence[str],
+                     game_state: GameState, posicion: int | None = None,
+                     banda: str | None = None) -> Dict[str, Any]:
+    """Registro de una partida: lo necesario para repetirla y el resultado para comparar.
+
+    Sin `posicion`, la palabra sale de `random.Random(semilla)`; con ella, es la que el pool
+    de semilla `semilla` reparte en esa posición de la categoría (o de su `banda` de dureza).
+    """
+    reg = {"v": VERSION_GRABACION, "seed": semilla, "cat": cat, "diff": dificultad, "palabra": palabra,
+           "entradas": list(entradas), "resultado": resultado_partida(game_state),
+           "intentos": intentos_usados(game_state)}
+    if posicion is not None:
+        reg["pos"] = posicion
+    if banda is not None:
+        reg["banda"] = banda
+    return reg
+
+
+def grabar_partidas(registros: Any, ruta: str | None = None) -> int:
+    """Agrega registros (iterable) al archivo de grabaciones; devuelve cuántos escribió."""
+    import json
+
+    n = 0
+    with open(ruta or REPLAY_FILE, "a", encoding="utf-8") as fh:
+        for reg in registros:
+            fh.write(json.dumps(reg, ensure_ascii=False, separators=(",", ":")) + "\n")
+            n += 1
+    return n
+
+
+def leer_grabaciones(ruta: str):
+    """Itera los registros del archivo de a uno (memoria acotada aunque haya millones)."""
+    import json
+
+    with open(ruta, encoding="utf-8") as fh:
+        for linea in fh:
+            if linea.strip():
+                yield json.loads(linea)
+
+
+def generar_grabaciones(n: int, estrategia: Estrategia = next_auto_letter, seed: int = 0):
+    """Partidas automáticas como registros (para armar una línea base de comparación)."""
+    rng = random.Random(seed)
+    cats = categorias()
+    for _ in range(n):
+        semilla = rng.getrandbits(32)
+        cat = rng.choice(cats)
+        diff = rng.choice(list(DIFFICULTY))
+        _, palabra = elegir_palabra(cat, random.Random(semilla))
+        state = create_game_state(palabra, DIFFICULTY[diff]["max_intentos"], compacto=True, categoria=cat)
+        entradas = []
+        while not (gano(state) or perdio(state)) and len(entradas) < len(LETRAS):
+            entradas.append(estrategia(state))
+            try:
+                state, _ = intento_letra(state, entradas[-1])
+            except ValueError:
+                break
+        yield registro_partida(semilla, cat, diff, palabra, entradas, state)
+
+
+def reproducir_partida(reg: Mapping[str, Any], estrategia: Estrategia | None = None) -> GameState:
+    """Vuelve a jugar un registro con las funciones puras (sin render ni pausas).
+
+    Sin `estrategia` se aplican las entradas grabadas tal cual (las inválidas se ignoran, como
+    en la consola); con una estrategia se juega la misma palabra para comparar resultados.
+    """
+    max_int = DIFFICULTY.get(reg["diff"], DIFFICULTY["media"])["max_intentos"]
+    if estrategia is not None:
+        return jugar_partida_auto(reg["palabra"], max_int, estrategia, compacto=True, categoria=reg["cat"])
+    state = create_game_state(reg["palabra"], max_int, compacto=True, categoria=reg["cat"])
+    conocida = validador_palabras()
+    for entrada in reg["entradas"]:
+        if gano(state) or perdio(state):
+            break
+        try:
+            state, _ = jugada(state, entrada, conocida)
+        except ValueError:
+            pass
+    return state
+
+
+def comparar_grabaciones(registros: Any, estrategia: Estrategia | None = None,
+                         max_diferencias: int = 20) -> Dict[str, Any]:
+    """Reproduce un flujo de registros y compara (resultado, intentos) con lo grabado.
+
+    Además verifica que la semilla siga eligiendo la misma palabra (detecta cambios del banco
+    o del sorteo). Solo se guardan contadores y las primeras `max_diferencias` diferencias.
+    """
+    res: Dict[str, Any] = {"partidas": 0, "iguales": 0, "distintas": 0, "palabra_distinta": 0,
+                           "cambios": {}, "diferencias": []}
+    t0 = time.perf_counter()
+    pool: PoolPalabras | None = None  # un pool por semilla; las grabaciones suelen compartirla
+    for reg in registros:
+        res["partidas"] += 1
+        if "pos" in reg:
+            if pool is None or pool.semilla != reg["seed"]:
+                pool = PoolPalabras(semilla=reg["seed"])
+            palabra = pool.palabra_en(reg["cat"], reg["pos"], reg.get("banda"))
+        else:
+            palabra = elegir_palabra(reg["cat"], random.Random(reg["seed"]), reg.get("banda"))[1]
+        if palabra != reg["palabra"]:
+            res["palabra_distinta"] += 1
+        state = reproducir_partida(reg, estrategia)
+        nuevo = (resultado_partida(state), intentos_usados(state))
+        if nuevo == (reg["resultado"], reg["intentos"]):
+            res["iguales"] += 1
+            continue
+        res["distintas"] += 1
+        clave = f"{reg['resultado']}->{nuevo[0]}"
+        res["cambios"][clave] = res["cambios"].get(clave, 0) + 1
+        if len(res["diferencias"]) < max_diferencias:
+            res["diferencias"].append((reg["cat"], reg["palabra"], reg["diff"],
+                                       (reg["resultado"], reg["intentos"]), nuevo))
+    res["segundos"] = time.perf_counter() - t0
+    return res
+
+
+
+# Estadísticas persistentes (SQLite en modo WAL, escrituras en lote desde un hilo aparte)
+
+# Base de datos del historial: opcional (STATS_FILE=ahorcado_stats.db la activa; por defecto no
+# se crea ningún archivo); JUGADOR identifica a quien juega
+STATS_FILE = os.environ.get("STATS_FILE", "")
+JUGADOR = os.environ.get("JUGADOR") or os.environ.get("USER") or os.environ.get("USERNAME") or "jugador"
+
+_ESQUEMA_STATS = """
+CREATE TABLE IF NOT EXISTS partidas (
+    id INTEGER PRIMARY KEY, fecha REAL, jugador TEXT, categoria TEXT, dificultad TEXT,
+    palabra TEXT, gano INTEGER, intentos INTEGER, max_intentos INTEGER, letras_bad TEXT,
+    jugadas INTEGER, segundos REAL);
+CREATE TABLE IF NOT EXISTS agg_categoria (
+    categoria TEXT, dificultad TEXT, partidas INTEGER, ganadas INTEGER,
+    PRIMARY KEY (categoria, dificultad));
+CREATE TABLE IF NOT EXISTS agg_palabra (
+    categoria TEXT, palabra TEXT, partidas INTEGER, ganadas INTEGER, fallos INTEGER,
+    PRIMARY KEY (categoria, palabra));
+CREATE TABLE IF NOT EXISTS agg_jugador (
+    jugador TEXT PRIMARY KEY, partidas INTEGER, ganadas INTEGER, segundos REAL);
+"""
+
+_COLUMNAS_PARTIDA = ("fecha", "jugador", "categoria", "dificultad", "palabra", "gano", "intentos",
+                     "max_intentos", "letras_bad", "jugadas", "segundos")
+
+
+class EstadisticasSQLite:
+    """Historial de partidas en SQLite (WAL) con agregados precalculados.
+
+    `registrar` solo encola: un hilo escritor junta hasta `lote` partidas (o lo que llegue en
+    `intervalo` segundos) y las guarda en una transacción, actualizando en la misma las tablas
+    `agg_*`. Así el bucle del juego nunca espera al disco y el menú lee tablas pequeñas.
+    """
+
+    def __init__(self, ruta: str, lote: int = 64, intervalo: float = 0.5) -> None:
+        import queue
+        import sqlite3
+        import threading
+
+        self.ruta = ruta
+        self.lote = lote
+        self.intervalo = intervalo
+        self.escritas = 0
+        self.errores = 0
+        self._cola: Any = queue.Queue()
+        con = sqlite3.connect(ruta)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.executescript(_ESQUEMA_STATS)
+        con.close()
+        # Conexión de lectura (hilo que consulta); el escritor abre la suya
+        self._lectura = sqlite3.connect(ruta, check_same_thread=False)
+        self._hilo = threading.Thread(target=self._escritor, name="ahorcado-stats", daemon=True)
+        self._hilo.start()
+
+    def registrar(self, partida: Mapping[str, Any]) -> None:
+        """Encola una partida terminada (claves de `_COLUMNAS_PARTIDA`); no bloquea."""
+        self._cola.put(tuple(partida[k] for k in _COLUMNAS_PARTIDA))
+
+    def _escritor(self) -> None:
+        import queue
+        import sqlite3
+
+        con = sqlite3.connect(self.ruta)
+        con.execute("PRAGMA synchronous=NORMAL")  # suficiente con WAL, y mucho más barato
+        fin = False
+        while not fin:
+            filas = [self._cola.get()]
+            limite = time.monotonic() + self.intervalo
+            # Se corta el lote al llenarse, al vencer `intervalo` o ante un vaciado/cierre (marcas vacías)
+            while len(filas) < self.lote and filas[-1]:
+                try:
+                    filas.append(self._cola.get(timeout=max(0.0, limite - time.monotonic())))
+                except queue.Empty:
+                    break
+            if filas[-1] is None:
+                fin = True
+            datos = [f for f in filas if f]
+            try:
+                if datos:
+                    with con:
+                        self._guardar_lote(con, datos)
+                    self.escritas += len(datos)
+            except sqlite3.Error:
+                self.errores += len(datos)  # el juego sigue aunque falle el disco
+            for _ in filas:
+                self._cola.task_done()
+        con.close()
+
+    @staticmethod
+    def _guardar_lote(con: Any, filas: List[Tuple[Any, ...]]) -> None:
+        con.executemany(f"INSERT INTO partidas ({', '.join(_COLUMNAS_PARTIDA)}) "
+                        f"VALUES ({', '.join('?' * len(_COLUMNAS_PARTIDA))})", filas)
+        # Se agregan en memoria primero: una fila por clave en lugar de una por partida
+        cats: Dict[Tuple[str, str], List[int]] = {}
+        pals: Dict[Tuple[str, str], List[int]] = {}
+        jugs: Dict[str, List[float]] = {}
+        for _, jugador, cat, diff, palabra, gano_, _, _, bad, _, seg in filas:
+            a = cats.setdefault((cat, diff), [0, 0])
+            a[0] += 1
+            a[1] += gano_
+            a = pals.setdefault((cat, palabra), [0, 0, 0])
+            a[0] += 1
+            a[1] += gano_
+            a[2] += len(bad)
+            b = jugs.setdefault(jugador, [0, 0, 0.0])
+            b[0] += 1
+            b[1] += gano_
+            b[2] += seg
+        con.executemany(
+            "INSERT INTO agg_categoria VALUES (?, ?, ?, ?) ON CONFLICT (categoria, dificultad) DO UPDATE "
+            "SET partidas = partidas + excluded.partidas, ganadas = ganadas + excluded.ganadas",
+            [(*k, *v) for k, v in cats.items()])
+        con.executemany(
+            "INSERT INTO agg_palabra VALUES (?, ?, ?, ?, ?) ON CONFLICT (categoria, palabra) DO UPDATE "
+            "SET partidas = partidas + excluded.partidas, ganadas = ganadas + excluded.ganadas, "
+            "fallos = fallos + excluded.fallos",
+            [(*k, *v) for k, v in pals.items()])
+        con.executemany(
+            "INSERT INTO agg_jugador VALUES (?, ?, ?, ?) ON CONFLICT (jugador) DO UPDATE "
+            "SET partidas = partidas + excluded.partidas, ganadas = ganadas + excluded.ganadas, "
+            "segundos = segundos + excluded.segundos",
+            [(k, *v) for k, v in jugs.items()])
+
+    def vaciar(self) -> None:
+        """Escribe ya lo encolado (sin esperar a `intervalo`) y espera a que termine."""
+        self._cola.put(())
+        self._cola.join()
+
+    def resumen(self, jugador: str | None = None, dificiles: int = 5) -> Dict[str, Any]:
+        """Agregados ya calculados: por categoría/dificultad, palabras más difíciles y jugador."""
+        con = self._lectura
+        res: Dict[str, Any] = {
+            "categorias": con.execute("SELECT categoria, dificultad, partidas, ganadas FROM agg_categoria "
+                                      "ORDER BY categoria, dificultad").fetchall(),
+            # Más difícil: menor tasa de victoria y, a igualdad, más fallos por partida
+            "dificiles": con.execute("SELECT categoria, palabra, partidas, 1.0 * ganadas / partidas AS tasa, "
+                                     "1.0 * fallos / partidas FROM agg_palabra "
+                                     "ORDER BY tasa, 1.0 * fallos / partidas DESC LIMIT ?",
+                                     (dificiles,)).fetchall(),
+        }
+        fila = con.execute("SELECT SUM(partidas), SUM(ganadas) FROM agg_categoria").fetchone()
+        res["partidas"], res["ganadas"] = fila[0] or 0, fila[1] or 0
+        if jugador is not None:
+            res["jugador"] = con.execute("SELECT partidas, ganadas, segundos FROM agg_jugador WHERE jugador = ?",
+                                         (jugador,)).fetchone() or (0, 0, 0.0)
+        return res
+
+    def cerrar(self) -> None:
+        """Escribe lo pendiente y detiene el hilo escritor."""
+        if self._hilo.is_alive():
+            self._cola.put(None)
+            self._hilo.join()
+        self._lectura.close()
+
+
+_ESTADISTICAS: EstadisticasSQLite | None = None
+
+
+def estadisticas() -> EstadisticasSQLite | None:
+    """Almacén de estadísticas activo (se abre al primer uso; None si STATS_FILE está vacío)."""
+    global _ESTADISTICAS
+    if _ESTADISTICAS is None and STATS_FILE:
+        import atexit
+        import sqlite3
+
+        try:
+            _ESTADISTICAS = EstadisticasSQLite(STATS_FILE)
+        except (OSError, sqlite3.Error):
+            return None  # sin disco escribible se juega igual, sin historial
+        atexit.register(_ESTADISTICAS.cerrar)
+    return _ESTADISTICAS
+
+
+def guardar_resultado(state: GameState, cat: str, dificultad: str, jugadas: int, segundos: float,
+                      jugador: str | None = None) -> None:
+    """Encola el resultado de una partida terminada en el historial (si está activo)."""
+    stats = estadisticas()
+    if stats is None:
+        return
+    stats.registrar({
+        "fecha": time.time(), "jugador": jugador or JUGADOR, "categoria": cat, "dificultad": dificultad,
+        "palabra": state["palabra"], "gano": int(gano(state)), "intentos": intentos_usados(state),
+        "max_intentos": state["max_intentos"], "letras_bad": "".join(sorted(state["letras_bad"])),
+        "jugadas": jugadas, "segundos": segundos,
+    })
+
+
+def lineas_estadisticas(res: Mapping[str, Any]) -> List[str]:
+    """Líneas para la caja de estadísticas a partir de `EstadisticasSQLite.resumen`."""
+    if not res["partidas"]:
+        return ["Todavia no hay partidas registradas."]
+    lines = [f"Partidas: {res['partidas']}   Ganadas: {res['ganadas']} "
+             f"({100 * res['ganadas'] / res['partidas']:.1f}%)"]
+    if "jugador" in res:
+        n, g, seg = res["jugador"]
+        if n:
+            lines.append(f"{JUGADOR}: {g}/{n} ganadas, {seg / n:.1f} s por partida")
+    lines += ["", c("Tasa de victoria por categoria / dificultad", BOLD)]
+    for cat, diff, n, g in res["categorias"]:
+        lines.append(f"  {cat:<12} {diff:<8} {g:>5}/{n:<5} {100 * g / n:6.1f}%")
+    lines += ["", c("Palabras mas dificiles", BOLD)]
+    for cat, palabra, n, tasa, fallos in res["dificiles"]:
+        lines.append(f"  {palabra:<14} {cat:<12} {100 * tasa:5.1f}% en {n} partidas, {fallos:.1f} fallos")
+    return lines
+
+
+
+# UI de consola (con "ventana"/box)
+
+
+def pintar_alfabeto(letras_ok: Set[str], letras_bad: Set[str]) -> str:
+    """Pinta el alfabeto con colores según el estado."""
+    letras = letras_coloreadas()
+    partes: List[str] = []
+    for ch in LETRAS:
+        ok, bad, libre = letras[ch]
+        partes.append(ok if ch in letras_ok else (bad if ch in letras_bad else libre))
+    return " ".join(partes)
+
+
+# Renderizado diferencial: solo se reescriben las celdas que cambian entre frames
+
+# "diff", "clasico" (limpiar y reimprimir todo) o "auto": diff si `terminal().vt`, si no
+# registro plano de solo-agregar
+RENDER_MODE = os.environ.get("RENDER", "auto")
+
+Celda = Tuple[str, str]  # (estilo ANSI activo, caracter); "" = 2ª columna de un caracter ancho
+
+
+def _agregar_celdas(celdas: List[Celda], estilo: str, texto: str) -> None:
+    """Una celda por columna, medida con el mismo ancho que `vlen`: las marcas combinantes se
+    pegan a la celda anterior y un caracter ancho deja una celda vacía de continuación."""
+    if texto.isascii():
+        celdas.extend((estilo, ch) for ch in texto)
+        return
+    for ch in texto:
+        ancho = _ancho_unicode(ch)
+        if ancho == 0 and celdas:
+            j = len(celdas) - 1 if celdas[-1][1] else len(celdas) - 2
+            celdas[j] = (celdas[j][0], celdas[j][1] + ch)
+            continue
+        celdas.append((estilo, ch))
+        if ancho == 2:
+            celdas.append((estilo, ""))
+
+
+@lru_cache(maxsize=2048)
+def _celdas(linea: str) -> Tuple[Celda, ...]:
+    """Descompone una línea con códigos ANSI en celdas (estilo, caracter), una por columna."""
+    celdas: List[Celda] = []
+    estilo = ""
+    pos = 0
+    for m in _ANSI_RE.finditer(linea):
+        _agregar_celdas(celdas, estilo, linea[pos:m.start()])
+        seq = m.group()
+        estilo = "" if seq == RESET else estilo + seq
+        pos = m.end()
+    _agregar_celdas(celdas, estilo, linea[pos:])
+    return tuple(celdas)
+
+
+def _pintar_celdas(celdas: Sequence[Celda]) -> str:
+    partes: List[str] = []
+    estilo = ""
+    for st, ch in celdas:
+        if st != estilo:
+            partes.append(RESET + st if estilo else st)
+            estilo = st
+        partes.append(ch)
+    if estilo:
+        partes.append(RESET)
+    return "".join(partes)
+
+
+class RenderDiferencial:
+    """Recuerda el frame anterior y emite solo movimientos de cursor + celdas cambiadas.
+
+    `bytes_escritos`, `frames` y `segundos` permiten medir el costo por frame.
+    """
+    HUECO = 6  # celdas iguales entre dos cambios que conviene reescribir en vez de mover el cursor
+
+    def __init__(self, salida: Any = None) -> None:
+        self._salida = salida
+        self._previo: List[str] | None = None
+        self.frames = 0
+        self.bytes_escritos = 0
+        self.segundos = 0.0
+
+    def invalidar(self) -> None:
+        """Fuerza un redibujado completo en el próximo frame (p. ej. tras limpiar la pantalla)."""
+        self._previo = None
+
+    def _diff_fila(self, fila: int, nueva: Tuple[Celda, ...], vieja: Tuple[Celda, ...], out: List[str]) -> None:
+        n, m = len(nueva), len(vieja)
+        cambios = [i for i in range(min(n, m)) if nueva[i] != vieja[i]]
+        cambios.extend(range(m, n))
+        i = 0
+        while i < len(cambios):
+            ini = fin = cambios[i]
+            i += 1
+            while i < len(cambios) and cambios[i] - fin <= self.HUECO:
+                fin = cambios[i]
+                i += 1
+            while ini > 0 and ini < n and not nueva[ini][1]:
+                ini -= 1  # continuación de un caracter ancho: se reescribe desde el caracter
+            out.append(f"{CSI}{fila + 1};{ini + 1}H")
+            out.append(_pintar_celdas(nueva[ini:fin + 1]))
+        if n < m:
+            out.append(f"{CSI}{fila + 1};{n + 1}H{CSI}K")
+
+    def componer(self, lineas: List[str]) -> str:
+        """Secuencia a escribir para pasar del frame anterior a `lineas`."""
+        out: List[str] = []
+        previo = self._previo
+        alto = terminal().filas
+        # Si el frame no entra en la terminal habrá scroll y las posiciones absolutas no sirven
+        if previo is None or (alto and len(lineas) + 2 > alto):
+            out.append(f"{CSI}2J{CSI}H")
+            previo = []
+        for fila, linea in enumerate(lineas):
+            vieja = previo[fila] if fila < len(previo) else ""
+            if linea != vieja:
+                self._diff_fila(fila, _celdas(linea), _celdas(vieja), out)
+        # Deja el cursor bajo el frame y borra lo que quedó debajo (prompt, avisos, filas sobrantes)
+        out.append(f"{CSI}{len(lineas) + 1};1H{CSI}J")
+        self._previo = list(lineas)
+        return "".join(out)
+
+    def dibujar(self, lineas: List[str]) -> None:
+        t0 = time.perf_counter()
+        texto = self.componer(lineas)
+        escribir_frame(texto, self._salida)
+        self.segundos += time.perf_counter() - t0
+        self.frames += 1
+        self.bytes_escritos += len(texto.encode("utf-8"))
+
+
+_RENDER: RenderDiferencial | None = None if RENDER_MODE == "clasico" else RenderDiferencial()
+
+
+def _render_activo() -> RenderDiferencial | None:
+    """El render diferencial, salvo en modo "auto" sin una terminal ANSI."""
+    if _RENDER is None or (RENDER_MODE == "auto" and not terminal().vt):
+        return None
+    return _RENDER
+
+
+# SYNC_OUTPUT=1 envuelve cada frame en "synchronized update" (la terminal lo pinta de una vez)
+SYNC_OUTPUT = os.environ.get("SYNC_OUTPUT", "0") == "1"
+_SYNC_INICIO = f"{CSI}?2026h"
+_SYNC_FIN = f"{CSI}?2026l"
+
+
+def escribir_frame(texto: str, salida: Any = None) -> None:
+    """Escribe un frame ya compuesto con una sola escritura y un solo flush."""
+    if SYNC_OUTPUT and terminal().vt:
+        texto = _SYNC_INICIO + texto + _SYNC_FIN
+    salida = salida or sys.stdout
+    salida.write(texto)
+    salida.flush()
+
+
+def mostrar_pantalla(lineas: List[str]) -> None:
+    """Dibuja un frame completo: diferencial si está activo, si no limpia y reimprime
+    (el borrado va dentro del mismo buffer que el frame). Sin terminal ANSI cada frame se
+    agrega como texto plano tras una línea en blanco (un registro legible y barato)."""
+    render = _render_activo()
+    if render is not None:
+        render.dibujar(lineas)
+        return
+    if not terminal().vt:
+        escribir_frame("\n" + "\n".join(lineas) + "\n")
+        return
+    escribir_frame(f"{CSI}2J{CSI}H" + "\n".join(lineas) + "\n")
+
+
+@_frame
+def construir_pantalla(cat: str, diff: str, game_state: GameState) -> List[str]:
+    """Líneas del frame de juego (banner + ventana), sin escribir nada."""
+    # Izquierda: dibujo
+    left = list(horca_lineas(min(intentos_usados(game_state), len(HANGMAN_PICS) - 1)))
+
+    # Derecha: estado
+    # El progreso sale del buffer del estado; el coloreado es un reemplazo sobre él (sin
+    # volver a recorrer la palabra ni partirla por espacios)
+    prog = progreso(game_state)
+    if usar_color():
+        prog = prog.replace("_", _recurso("oculta", lambda: c("_", FG["yellow"])))
+    right: List[str] = [
+        c("Estado", BOLD),
+        f"Palabra: {prog}",
+        f"Intentos: {intentos_usados(game_state)}/{game_state['max_intentos']}",
+        f"Restantes: {intentos_restantes(game_state)}",
+        "",
+        c("Letras", BOLD),
+        pintar_alfabeto(game_state["letras_ok"], game_state["letras_bad"]),
+    ]
+    if game_state["letras_bad"]:
+        right.append(f"Incorrectas: {' '.join(sorted(game_state['letras_bad']))}")
+    if game_state["palabras_bad"]:
+        right.append(f"Palabras fallidas: {', '.join(sorted(game_state['palabras_bad']))}")
+
+    # Componer columnas y encerrarlas en box
+    cols = compose_columns(left, right, gap=4)
+    title = f"Ahorcado — {cat} | {diff} | Intentos {intentos_usados(game_state)}/{game_state['max_intentos']}"
+    ventana = make_box(cols, title=title)
+    return lineas_banner() + ventana.split("\n")
+
+
+def pantalla_juego(cat: str, diff: str, game_state: GameState, extra: List[str] | None = None) -> None:
+    """Muestra la pantalla del juego; `extra` (avisos, resultado) va en el mismo frame."""
+    mostrar_pantalla(construir_pantalla(cat, diff, game_state) + (extra or []))
+
+
+def seleccionar_opcion(titulo: str, opciones: List[str], pie: List[str] | None = None) -> str:
+    """Permite al usuario seleccionar una opción del menú (`pie`: líneas extra en la caja)."""
+    aviso: List[str] = []
+    while True:
+        lines = [f"  {i}. {op}" for i, op in enumerate(opciones, 1)]
+        if pie:
+            lines += ["", *pie]
+        caja = make_box([c(titulo, BOLD), "", *lines], title="Menu")
+        mostrar_pantalla(lineas_banner() + caja.split("\n") + aviso)
+        sel = safe_input(c("Selecciona una opcion: ", FG["yellow"]))
+        if not sel:
+            # Sin I/O o Enter vacío → elegir la primera opción para no bloquear
+            return opciones[0]
+        if sel.isdigit() and 1 <= int(sel) <= len(opciones):
+            return opciones[int(sel) - 1]
+        # El aviso se muestra en el siguiente frame (no hace falta pausar antes de redibujar)
+        aviso = [c("Opcion invalida. Intenta de nuevo.", FG["red"])]
+
+
+def aplicar_entrada(state: GameState, entrada: str) -> Tuple[GameState, str]:
+    """Aplica una letra o la palabra completa; devuelve (nuevo_estado, feedback). Lanza ValueError."""
+    new_state, acierto = jugada(state, entrada, validador_palabras())
+    if len(entrada.strip()) == 1:
+        feedback = c("Acierto.", FG["green"]) if acierto else c("No esta en la palabra.", FG["red"])
+    else:
+        feedback = c("¡Adivinaste la palabra completa!", FG["green"]) if acierto else c("No es la palabra.", FG["red"])
+    return new_state, feedback
+
+
+def caja_resultado(state: GameState) -> str | None:
+    """Caja de "Ganaste."/"Perdiste." si la partida terminó; None si sigue en curso."""
+    if gano(state):
+        return make_box([c("Ganaste.", FG["green"], BOLD), f"La palabra era: {state['palabra']}"], title="Resultado")
+    if perdio(state):
+        return make_box([c("Perdiste.", FG["red"], BOLD), f"La palabra era: {state['palabra']}"], title="Resultado")
+    return None
+
+
+def jugar_consola(categoria: str | None = None, dificultad: str = "media") -> None:
+    """Función principal del juego. Si la entrada se termina, EOFError sale de la partida
+    sin guardarla (ver `safe_input`)."""
+    if categoria is None:
+        categoria = seleccionar_opcion("Elige una categoria", categorias())
+    if dificultad not in DIFFICULTY:
+        dificultad = seleccionar_opcion("Elige una dificultad", list(DIFFICULTY.keys()))
+
+    # Del pool compartido: no se repite la palabra hasta agotar la categoría (o la banda de
+    # dureza de la dificultad), y (semilla del pool, categoria, banda, posicion) permiten
+    # reconstruirla al reproducir
+    pool = pool_palabras()
+    cat, palabra, posicion = pool.sacar(categoria, dificultad)
+    banda = pool.banda(cat, dificultad)
+    max_int = DIFFICULTY.get(dificultad, DIFFICULTY["media"])['max_intentos']
+    game_state = create_game_state(palabra=palabra, max_intentos=max_int, categoria=cat)
+    entradas: List[str] | None = [] if REPLAY_FILE else None
+
+    # Bucle del juego iterativo: profundidad de pila y memoria constantes
+    # (solo se conserva el estado actual, sin importar cuántas jugadas haya)
+    # Cada frame (banner, ventana y aviso de la jugada anterior) se escribe de una vez
+    state = game_state
+    aviso: List[str] = []
+    jugadas, inicio = 0, time.monotonic()
+    while True:
+        # Fin de juego
+        msg = caja_resultado(state)
+        if msg is not None:
+            if not AUTO_MODE:
+                # Las demos automáticas no son partidas del jugador: no van a su historial
+                guardar_resultado(state, cat, dificultad, jugadas, time.monotonic() - inicio)
+            if entradas is not None:
+                grabar_partidas([registro_partida(pool.semilla, cat, dificultad, palabra, entradas, state,
+                                                  posicion, banda)])
+            pantalla_juego(cat, dificultad, state, ["", *msg.split("\n")])
+            break
+        pantalla_juego(cat, dificultad, state, aviso)
+
+        entrada = safe_input(c("Ingresa una letra o la palabra completa: ", FG["yellow"]))
+        if AUTO_MODE or not entrada:
+            entrada = estrategias_disponibles().get(AUTO_STRATEGY, next_auto_letter)(state)
+        if entradas is not None:
+            entradas.append(entrada)
+
+        try:
+            state, feedback = aplicar_entrada(state, entrada)
+            jugadas += 1
+            aviso = make_box([f"Entrada: {entrada}", feedback], title="Movimiento").split("\n")
+        except ValueError as e:
+            aviso = make_box([f"Aviso: {e}"], title="Entrada invalida").split("\n")
+        if AUTO_MODE:
+            _pausa(0.2)  # ritmo de la demo automática
+
+    print()
+    if not AUTO_MODE:
+        safe_input(c("Presiona Enter para volver al menu... ", FG["gray"]))
+
+
+def main() -> None:
+    """Función principal del programa. Termina con "Salir" o cuando se acaba la entrada."""
+    persistir_cache_candidatos()  # con CANDIDATES_FILE: arranque en caliente y guardado al salir
+    try:
+        _menu_principal()
+    except EOFError:
+        # Pipe agotado o Ctrl-D: se sale igual que con "Salir" (la partida en curso no se guarda)
+        print()
+        print(make_box([c("Hasta pronto.", FG["gray"])], title="Salir"))
+
+
+def _menu_principal() -> None:
+    # Bucle del menú principal (iterativo: cada partida vuelve aquí sin apilar llamadas)
+    while True:
+        # Los agregados ya están calculados en la base: leerlos no demora el menú
+        stats = estadisticas()
+        pie = None
+        if stats is not None:
+            res = stats.resumen()
+            if res["partidas"]:
+                pie = [c(f"Historial: {res['partidas']} partidas, "
+                         f"{100 * res['ganadas'] / res['partidas']:.0f}% ganadas", FG["gray"])]
+        opcion = seleccionar_opcion(
+            "Menu principal",
+            ["Jugar", "Cambiar categoria", "Cambiar dificultad", "Estadisticas", "Salir"],
+            pie,
+        )
+        if opcion == "Jugar":
+            jugar_consola()
+        elif opcion == "Cambiar categoria":
+            cat = seleccionar_opcion("Elige una categoria", categorias())
+            jugar_consola(categoria=cat)
+        elif opcion == "Cambiar dificultad":
+            diff = seleccionar_opcion("Elige una dificultad", list(DIFFICULTY.keys()))
+            jugar_consola(dificultad=diff)
+        elif opcion == "Estadisticas":
+            lineas = lineas_estadisticas(stats.resumen(JUGADOR)) if stats is not None else [
+                "Historial desactivado (STATS_FILE vacio o no escribible)."]
+            mostrar_pantalla(lineas_banner() + make_box(lineas, title="Estadisticas").split("\n"))
+            safe_input(c("Presiona Enter para volver al menu... ", FG["gray"]))
+        else:
+            limpiar_consola()
+            print(make_box([c("Hasta pronto.", FG["gray"])], title="Salir"))
+            break
+
+
+def prueba_resistencia(jugadas: int = 100_000, seed: int = 0, limite_pila: int = 250,
+                       muestras: int = 10) -> Dict[str, Any]:
+    """Soak test: recorre `main()` con entradas guionadas (letras, Enter e inválidas) hasta
+    `jugadas` jugadas, sin pausas y con la salida descartada. Mide la memoria en `muestras`
+    puntos y corre con un límite de recursión bajo: si los bucles apilaran, fallaría."""
+    import contextlib
+    import string
+    import tracemalloc
+
+    global safe_input, PAUSAS, STATS_FILE, HARDNESS_FILE, _ESTADISTICAS
+    rng = random.Random(seed)
+    cuenta = 0
+    memoria: List[int] = []
+    paso_muestra = max(1, jugadas // muestras)
+
+    def entrada_guionada(prompt: str, default: str = "") -> str:
+        nonlocal cuenta
+        if "Ingresa" in prompt:
+            cuenta += 1
+            if cuenta % paso_muestra == 0:
+                memoria.append(tracemalloc.get_traced_memory()[0])
+            if cuenta >= jugadas:
+                return ""  # deja terminar la partida con la estrategia automática
+            return rng.choice(("", "", "", "", "?", "zz", "1", rng.choice(string.ascii_lowercase)))
+        if "Selecciona" in prompt:
+            # Menú principal: 5 = Salir; antes de eso, cualquier opción válida en todos los menús
+            return "5" if cuenta >= jugadas else rng.choice("123")
+        return default
+
+    previos = (safe_input, PAUSAS, sys.getrecursionlimit(), STATS_FILE, HARDNESS_FILE, _ESTADISTICAS)
+    # Sin historial ni archivos: las jugadas guionadas no deben tocar los datos del usuario
+    safe_input, PAUSAS, STATS_FILE, HARDNESS_FILE, _ESTADISTICAS = entrada_guionada, False, "", "", None
+    sys.setrecursionlimit(limite_pila)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        with open(os.devnull, "w", encoding="utf-8") as nulo, contextlib.redirect_stdout(nulo):
+            main()
+    finally:
+        segundos = time.perf_counter() - t0
+        tracemalloc.stop()
+        safe_input, PAUSAS = previos[0], previos[1]
+        sys.setrecursionlimit(previos[2])
+        STATS_FILE, HARDNESS_FILE, _ESTADISTICAS = previos[3], previos[4], previos[5]
+    # Se descarta la primera muestra (calentamiento). Los cachés acotados hacen oscilar la
+    # memoria, así que se compara el pico de la segunda mitad contra el de la primera.
+    estables = memoria[1:] or memoria
+    mitad = len(estables) // 2
+    crecimiento = max(estables[mitad:]) - max(estables[:mitad]) if mitad else 0
+    return {
+        "jugadas": cuenta,
+        "segundos": segundos,
+        "memoria": memoria,
+        "crecimiento": max(0, crecimiento),
+    }
+
+
+
+# Servidor multi-sesión (asyncio, TCP/telnet local)
+
+# Cada frame enviado termina con este prompt; el cliente de carga lo usa como delimitador
+PROMPT_RED = "\n> "
+_PROMPT_RED_B = PROMPT_RED.replace("\n", "\r\n").encode("utf-8")
+
+
+async def sesion_async(reader: Any, writer: Any, pausa: float = 0.0, espera: float = 300.0,
+                       color: bool = False, unicode: bool = False) -> None:
+    """Partidas de una conexión como corrutina: mismas funciones puras y `make_box` que la consola.
+
+    `color` y `unicode` son las capacidades del cliente, no las de la terminal del servidor:
+    por defecto texto plano con bordes ASCII (cualquier telnet lo muestra bien).
+    """
+    import asyncio
+
+    # La tarea de la conexión tiene su propio contexto: esto no afecta a otras sesiones
+    _CAPACIDADES_SESION.set((color, unicode))
+
+    def enviar(lineas: List[str]) -> None:
+        texto = "\n".join([f"{CSI}2J{CSI}H", *lineas]) + PROMPT_RED
+        writer.write(texto.replace("\n", "\r\n").encode("utf-8"))
+
+    async def leer() -> str | None:
+        try:
+            linea = await asyncio.wait_for(reader.readline(), espera)
+        except asyncio.TimeoutError:
+            return None
+        return linea.decode("utf-8", "replace").strip() if linea else None
+
+    peer = writer.get_extra_info("peername")
+    jugador = f"red:{peer[0]}" if peer else "red"
+    try:
+        while True:
+            diff = "media"
+            cat, palabra = elegir_palabra(None, dificultad=diff)
+            state = create_game_state(palabra, DIFFICULTY[diff]["max_intentos"], categoria=cat)
+            aviso: List[str] = []
+            jugadas, inicio = 0, time.monotonic()
+            while True:
+                lineas = construir_pantalla(cat, diff, state)
+                resultado = caja_resultado(state)
+                if resultado is not None:
+                    # Solo encola: el hilo escritor guarda sin frenar el bucle de eventos
+                    guardar_resultado(state, cat, diff, jugadas, time.monotonic() - inicio, jugador)
+                    enviar(lineas + resultado.split("\n") + ["Otra partida? (s/n)"])
+                    await writer.drain()
+                    break
+                enviar(lineas + aviso + ["Ingresa una letra o la palabra completa:"])
+                await writer.drain()
+                entrada = await leer()
+                if entrada is None:
+                    return
+                try:
+                    state, feedback = aplicar_entrada(state, entrada)
+                    jugadas += 1
+                    aviso = make_box([f"Entrada: {entrada}", feedback], title="Movimiento").split("\n")
+                except ValueError as e:
+                    aviso = make_box([f"Aviso: {e}"], title="Entrada invalida").split("\n")
+                if pausa:
+                    await asyncio.sleep(pausa)  # temporizador no bloqueante (no frena otras sesiones)
+            respuesta = await leer()
+            if not respuesta or respuesta.lower().startswith("n"):
+                return
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        writer.close()
+
+
+async def iniciar_servidor(host: str = "127.0.0.1", port: int = 7777, pausa: float = 0.0,
+                           espera: float = 300.0, color: bool = False, unicode: bool = False) -> Any:
+    """Arranca el servidor asyncio; devuelve el `asyncio.Server` (puerto 0 = libre).
+
+    `color`/`unicode` declaran lo que admiten los clientes (ver `sesion_async`).
+    """
+    import asyncio
+
+    persistir_cache_candidatos()  # las sesiones comparten el caché de la estrategia: persistirlo como en la consola
+    return await asyncio.start_server(lambda r, w: sesion_async(r, w, pausa, espera, color, unicode),
+                                      host, port, backlog=4096)
+
+
+async def carga_async(host: str, port: int, sesiones: int = 1000, concurrencia: int = 500) -> Dict[str, float]:
+    """Cliente de carga: juega `sesiones` partidas con `concurrencia` conexiones simultáneas
+    y mide la latencia de cada jugada (envío → siguiente prompt)."""
+    import asyncio
+
+    latencias: List[float] = []
+    errores = 0
+    limite = asyncio.Semaphore(concurrencia)
+
+    async def cliente() -> None:
+        nonlocal errores
+        async with limite:
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+            except OSError:
+                errores += 1
+                return
+            try:
+                await reader.readuntil(_PROMPT_RED_B)
+                for ch in LETTER_ORDER:
+                    t0 = time.perf_counter()
+                    writer.write(ch.encode("ascii") + b"\r\n")
+                    await writer.drain()
+                    datos = await reader.readuntil(_PROMPT_RED_B)
+                    latencias.append(time.perf_counter() - t0)
+                    if b"Ganaste." in datos or b"Perdiste." in datos:
+                        break
+                writer.write(b"n\r\n")
+                await writer.drain()
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError):
+                errores += 1
+            finally:
+                writer.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(sesiones)))
+    segundos = time.perf_counter() - t0
+    orden = sorted(latencias) or [0.0]
+
+    def percentil(p: float) -> float:
+        return 1000 * orden[min(len(orden) - 1, int(p * len(orden)))]
+
+    return {
+        "sesiones": sesiones, "errores": errores, "jugadas": len(latencias), "segundos": segundos,
+        "jugadas_por_s": len(latencias) / segundos if segundos else 0.0,
+        "p50_ms": percentil(0.50), "p99_ms": percentil(0.99), "max_ms": 1000 * orden[-1],
+    }
+
+
+
+# Instrumentación opcional (PERF_MODE=1 contadores y tiempos, PERF_PROFILE=archivo cProfile)
+
+PERF_MODE = os.environ.get("PERF_MODE", "0") == "1"
+PERF_PROFILE = os.environ.get("PERF_PROFILE", "")
+
+# Funciones de lógica y render que se envuelven. Como se llaman entre sí por nombre global,
+# reemplazarlas en el módulo basta para medir también las llamadas internas.
+FUNCIONES_INSTRUMENTADAS: Tuple[str, ...] = (
+    "create_game_state", "intento_letra", "intento_palabra", "aplicar_entrada", "progreso",
+    "intentos_usados", "gano", "perdio", "estado_ahorcado", "next_auto_letter",
+    "limpiar_consola", "strip_ansi", "vlen", "pad_visible", "make_box", "compose_columns",
+    "pintar_alfabeto", "construir_pantalla", "mostrar_pantalla", "_pausa",
+)
+
+_METRICAS: Dict[str, List[float]] = {}  # nombre -> [llamadas, segundos acumulados]
+_FRAMES: Dict[str, int] = {"frames": 0, "bytes": 0, "max": 0, "marca": 0}
+_ORIGINALES: Dict[str, Callable[..., Any]] = {}
+
+
+class _SalidaContada:
+    """Envuelve stdout y cuenta los bytes escritos (el resto se delega al original)."""
+
+    def __init__(self, destino: Any) -> None:
+        self._destino = destino
+        self.bytes = 0
+
+    def write(self, texto: str) -> int:
+        self.bytes += len(texto.encode("utf-8", "replace"))
+        return self._destino.write(texto)
+
+    def __getattr__(self, nombre: str) -> Any:
+        return getattr(self._destino, nombre)
+
+
+def _cerrar_frame() -> None:
+    salida = sys.stdout
+    if isinstance(salida, _SalidaContada):
+        n = salida.bytes - _FRAMES["marca"]
+        _FRAMES["marca"] = salida.bytes
+        if n:
+            _FRAMES["frames"] += 1
+            _FRAMES["bytes"] += n
+            _FRAMES["max"] = max(_FRAMES["max"], n)
+
+
+def _envolver(nombre: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    metrica = _METRICAS.setdefault(nombre, [0, 0.0])
+    reloj = time.perf_counter
+    es_frame = nombre == "mostrar_pantalla"
+
+    @wraps(fn)
+    def envuelta(*args: Any, **kwargs: Any) -> Any:
+        if es_frame:
+            _cerrar_frame()  # lo escrito desde el frame anterior (frame + avisos) le pertenece
+        t0 = reloj()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            metrica[0] += 1
+            metrica[1] += reloj() - t0
+
+    return envuelta
+
+
+def activar_instrumentacion() -> None:
+    """Envuelve las funciones calientes y cuenta los bytes de stdout por frame."""
+    import ahorcado_core
+
+    g = globals()
+    for nombre in FUNCIONES_INSTRUMENTADAS:
+        if nombre not in _ORIGINALES:
+            _ORIGINALES[nombre] = g[nombre]
+            g[nombre] = _envolver(nombre, g[nombre])
+            # Las reglas del núcleo también se llaman entre sí (p. ej. perdio -> intentos_usados)
+            if hasattr(ahorcado_core, nombre):
+                setattr(ahorcado_core, nombre, g[nombre])
+    if not isinstance(sys.stdout, _SalidaContada):
+        sys.stdout = _SalidaContada(sys.stdout)
+
+
+def desactivar_instrumentacion() -> None:
+    """Restaura las funciones originales y stdout."""
+    import ahorcado_core
+
+    g = globals()
+    for nombre, fn in _ORIGINALES.items():
+        g[nombre] = fn
+        if hasattr(ahorcado_core, nombre):
+            setattr(ahorcado_core, nombre, fn)
+    _ORIGINALES.clear()
+    if isinstance(sys.stdout, _SalidaContada):
+        sys.stdout = sys.stdout._destino
+
+
+def resumen_instrumentacion() -> List[str]:
+    """Tabla (para `make_box`) de llamadas y tiempo acumulado por función, y bytes por frame."""
+    _cerrar_frame()
+    lines = [f"{'funcion':<20} {'llamadas':>10} {'total ms':>10} {'us/llamada':>11}"]
+    for nombre, (n, seg) in sorted(_METRICAS.items(), key=lambda kv: -kv[1][1]):
+        if n:
+            lines.append(f"{nombre:<20} {int(n):>10} {seg * 1000:>10.2f} {1e6 * seg / n:>11.2f}")
+    frames = _FRAMES["frames"]
+    lines += ["", f"Frames: {frames}  bytes/frame: {_FRAMES['bytes'] / frames if frames else 0:,.0f}"
+                  f"  maximo: {_FRAMES['max']:,}"]
+    return lines
+
+
+def _al_salir_instrumentacion() -> None:
+    lineas = resumen_instrumentacion()
+    caja = _ORIGINALES.get("make_box", make_box)
+    desactivar_instrumentacion()
+    print(caja(lineas, title="Instrumentacion (PERF_MODE)"))
+
+
+if PERF_MODE:
+    import atexit
+
+    activar_instrumentacion()
+    atexit.register(_al_salir_instrumentacion)
+
+if PERF_PROFILE:
+    import atexit
+    import cProfile
+
+    _PERFIL = cProfile.Profile()
+    _PERFIL.enable()
+
+    def _guardar_perfil() -> None:
+        _PERFIL.disable()
+        _PERFIL.dump_stats(PERF_PROFILE)
+        print(f"Perfil guardado en {PERF_PROFILE} (python -m pstats {PERF_PROFILE})", file=sys.stderr)
+
+    atexit.register(_guardar_perfil)
+
+
+
+# Herramientas de línea de comandos
+
+
+def _cmd_simular(args: Any) -> int:
+    resumen = simular_partidas(
+        args.partidas,
+        estrategia=estrategias_disponibles()[args.estrategia],
+        categorias=[args.categoria] if args.categoria else None,
+        dificultades=[args.dificultad] if args.dificultad else None,
+        seed=args.seed,
+        compacto=args.compacto,
+    )
+    print(make_box(formatear_resumen(resumen), title=f"Simulacion — {args.estrategia}"))
+    return 0
+
+
+def _medir_llamada(fn: Callable[[], Any], min_tiempo: float = 0.2, repeticiones: int = 5) -> float:
+    """Segundos por llamada de `fn` (mínimo de varias repeticiones, como `timeit`)."""
+    import timeit
+
+    timer = timeit.Timer(fn)
+    n, t = timer.autorange()
+    n = max(1, int(n * min_tiempo / max(t, 1e-9)))
+    return min(timer.repeat(repeat=repeticiones, number=n)) / n
+
+
+def _metadatos_entorno() -> Dict[str, Any]:
+    import datetime
+    import platform
+    import subprocess
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "implementacion": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "maquina": platform.machine(),
+        "cpus": os.cpu_count(),
+        "color": usar_color(),
+        "unicode": usar_unicode(),
+    }
+
+
+def ejecutar_benchmarks(min_tiempo: float = 0.2) -> Dict[str, Any]:
+    """Mide las rutas calientes de lógica y render y el throughput de simulación.
+
+    Devuelve `{"meta": {...}, "resultados": {caso: {"us_por_op", "ops_por_s"}}}`.
+    """
+    import contextlib
+
+    global _RENDER
+    inicio = create_game_state("programacion", max_intentos=8, categoria="Tecnologia")
+    medio = inicio
+    for ch in "eaor":
+        medio, _ = intento_letra(medio, ch)
+    cols_izq = list(horca_lineas(2))
+    cols_der = [c("Estado", BOLD), f"Palabra: {progreso(medio)}", f"Intentos: {intentos_usados(medio)}/8",
+                "", c("Letras", BOLD), pintar_alfabeto(medio["letras_ok"], medio["letras_bad"])]
+    casos: Dict[str, Callable[[], Any]] = {
+        "intento_letra": lambda: intento_letra(medio, "n"),
+        "intento_palabra": lambda: intento_palabra(medio, "programador"),
+        "progreso": lambda: progreso(medio),
+        "gano": lambda: gano(medio),
+        "next_auto_letter": lambda: next_auto_letter(medio),
+        "pintar_alfabeto": lambda: pintar_alfabeto(medio["letras_ok"], medio["letras_bad"]),
+        "compose_columns": lambda: compose_columns(cols_izq, cols_der, gap=4),
+        "make_box": lambda: make_box(cols_der, title="Ahorcado"),
+        "pantalla_juego": lambda: pantalla_juego("Tecnologia", "media", medio),
+    }
+    resultados: Dict[str, Dict[str, float]] = {}
+    render_previo = _RENDER
+    try:
+        # Frame completo (limpiar + imprimir) contra un sumidero nulo
+        _RENDER = None
+        with open(os.devnull, "w", encoding="utf-8") as nulo, contextlib.redirect_stdout(nulo):
+            for nombre, fn in casos.items():
+                seg = _medir_llamada(fn, min_tiempo)
+                resultados[nombre] = {"us_por_op": 1e6 * seg, "ops_por_s": 1 / seg}
+    finally:
+        _RENDER = render_previo
+    for nombre, compacto in (("simulacion", False), ("simulacion_compacta", True)):
+        resumen = simular_partidas(max(200, int(20000 * min_tiempo)), seed=0, compacto=compacto)
+        seg = resumen["segundos"] / resumen["partidas"]
+        resultados[nombre] = {"us_por_op": 1e6 * seg, "ops_por_s": 1 / seg}
+    return {"meta": _metadatos_entorno(), "resultados": resultados}
+
+
+def comparar_benchmarks(actual: Dict[str, Any], base: Dict[str, Any],
+                        umbral: float = 10.0) -> List[Tuple[str, float, bool]]:
+    """(caso, variación % del tiempo por operación, ¿regresión?) para los casos comunes."""
+    filas = []
+    for caso, res in actual["resultados"].items():
+        previo = base.get("resultados", {}).get(caso)
+        if not previo:
+            continue
+        delta = 100.0 * (res["us_por_op"] - previo["us_por_op"]) / previo["us_por_op"]
+        filas.append((caso, delta, delta > umbral))
+    return filas
+
+
+def _cmd_bench(args: Any) -> int:
+    import json
+
+    datos = ejecutar_benchmarks(args.min_tiempo)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as fh:
+            json.dump(datos, fh, indent=2)
+    meta = datos["meta"]
+    lines = [f"Python {meta['python']} ({meta['implementacion']}) | {meta['plataforma']} | commit {meta['commit']}", ""]
+    lines.append(f"{'caso':<22} {'us/op':>10} {'ops/s':>14}")
+    for caso, res in datos["resultados"].items():
+        lines.append(f"{caso:<22} {res['us_por_op']:>10.3f} {res['ops_por_s']:>14,.0f}")
+    codigo = 0
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as fh:
+            base = json.load(fh)
+        lines += ["", c(f"Comparacion con {args.comparar} (umbral {args.umbral:.0f}%)", BOLD)]
+        for caso, delta, regresion in comparar_benchmarks(datos, base, args.umbral):
+            marca = c("REGRESION", FG["red"], BOLD) if regresion else c("ok", FG["green"])
+            lines.append(f"{caso:<22} {delta:>+9.1f}%  {marca}")
+            codigo = 1 if regresion else codigo
+    print(make_box(lines, title="Benchmarks"))
+    return codigo
+
+
+def _cmd_bench_estado(args: Any) -> int:
+    lines = [f"{'estado':<10} {'us/intento':>11} {'bytes/estado':>13} {'bloques/estado':>15}"]
+    for nombre, compacto in (("dict", False), ("compacto", True)):
+        m = medir_estado(compacto, args.partidas)
+        lines.append(f"{nombre:<10} {m['us_por_intento']:>11.3f} {m['bytes_por_estado']:>13.0f}"
+                     f" {m['bloques_por_estado']:>15.1f}")
+    lines += ["", c(f"Progreso coloreado, palabra de {args.largo} letras (us/jugada)", BOLD)]
+    for nombre, us in medir_progreso(args.largo).items():
+        lines.append(f"{nombre:<10} {us:>11.2f}")
+    print(make_box(lines, title="Benchmark de estado (dict vs mascaras de bits)"))
+    return 0
+
+
+def medir_cache_candidatos(partidas: int = 2000, hilos: int = 4, seed: int = 0,
+                           ruta: str | None = None) -> Dict[str, Any]:
+    """Partidas con la estrategia de información: sin caché, con caché en frío, en caliente y
+    con `hilos` hilos compartiendo el caché (µs por decisión), más guardar/cargar el caché."""
+    import tempfile
+    import threading
+
+    secuencia = secuencia_torneo(partidas, seed, WORD_BANK)
+
+    def correr(estrategia: EstrategiaInformacion, pares: Sequence[Tuple[str, str]]) -> Tuple[int, float]:
+        decisiones, t0 = 0, time.perf_counter()
+        for cat, palabra in pares:
+            state = jugar_partida_auto(palabra, 6, estrategia, categoria=cat)
+            decisiones += len(state["letras_ok"]) + len(state["letras_bad"])
+        return decisiones, time.perf_counter() - t0
+
+    def us(d: int, seg: float) -> float:
+        return seg / max(1, d) * 1e6
+
+    sin_cache = EstrategiaInformacion()
+    sin_cache.cache = None
+    cache = CacheCandidatos(max(1, CANDIDATES_CACHE_SIZE))
+    con_cache = EstrategiaInformacion(cache=cache)
+    for est in (sin_cache, con_cache):
+        est.indice  # se construye fuera de la medición
+    res: Dict[str, Any] = {"partidas": partidas, "hilos": hilos}
+    res["sin_cache"] = us(*correr(sin_cache, secuencia))
+    res["frio"] = us(*correr(con_cache, secuencia))
+    res["tasa_frio"] = cache.metricas()["tasa_aciertos"]
+    res["caliente"] = us(*correr(con_cache, secuencia))
+
+    cache.limpiar()
+    trozos = [secuencia[i::hilos] for i in range(hilos)]
+    medidas: List[Tuple[int, float]] = []
+    t0 = time.perf_counter()
+    workers = [threading.Thread(target=lambda p=p: medidas.append(correr(con_cache, p))) for p in trozos]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    res["hilos_frio"] = us(sum(d for d, _ in medidas), time.perf_counter() - t0)
+    res["metricas"] = cache.metricas()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        destino = ruta or os.path.join(tmp, "candidatos.json")
+        t0 = time.perf_counter()
+        con_cache.cache.guardar_en(destino, con_cache.firma())
+        res["guardar_ms"] = (time.perf_counter() - t0) * 1000
+        res["bytes_archivo"] = os.path.getsize(destino)
+        nuevo = CacheCandidatos(cache.capacidad)
+        t0 = time.perf_counter()
+        nuevo.cargar_de(destino, con_cache.firma())
+        res["cargar_ms"] = (time.perf_counter() - t0) * 1000
+        res["arranque_caliente"] = us(*correr(EstrategiaInformacion(cache=nuevo), secuencia))
+        res["tasa_arranque_caliente"] = nuevo.metricas()["tasa_aciertos"]
+    return res
+
+
+def _cmd_cache_candidatos(args: Any) -> int:
+    m = medir_cache_candidatos(args.partidas, args.hilos, args.seed, args.archivo or None)
+    met = m["metricas"]
+    lines = [
+        f"{'modo':<22} {'us/decision':>12}",
+        f"{'sin cache':<22} {m['sin_cache']:>12.1f}",
+        f"{'cache en frio':<22} {m['frio']:>12.1f}   aciertos {m['tasa_frio']:.1%}",
+        f"{'cache en caliente':<22} {m['caliente']:>12.1f}",
+        f"{f'{args.hilos} hilos, compartido':<22} {m['hilos_frio']:>12.1f}   aciertos {met['tasa_aciertos']:.1%}",
+        f"{'arranque desde archivo':<22} {m['arranque_caliente']:>12.1f}   aciertos {m['tasa_arranque_caliente']:.1%}",
+        "",
+        f"entradas {met['entradas']}  ~{met['bytes'] / 1024:.0f} KiB  desalojos {met['desalojos']}",
+        f"archivo {m['bytes_archivo'] / 1024:.0f} KiB  guardar {m['guardar_ms']:.1f} ms  cargar {m['cargar_ms']:.1f} ms",
+    ]
+    print(make_box(lines, title=f"Cache de candidatos — {args.partidas} partidas"))
+    return 0
+
+
+def medir_arranque(repeticiones: int = 15) -> Tuple[Dict[str, float], List[Tuple[str, int]]]:
+    """Arranque en frío (procesos nuevos, mediana en ms) de cada forma de invocar el juego,
+    y los módulos con más tiempo propio según `-X importtime` en la ruta rápida (`-m`)."""
+    import statistics
+    import subprocess
+
+    aqui = os.path.dirname(os.path.abspath(__file__))
+    modulo = "Autonomo2ProgramaElAhorcado"
+    corrida = ["simular", "-n", "1"]
+    casos = {
+        "interprete": [sys.executable, "-c", "pass"],
+        "nucleo": [sys.executable, "-c", "import ahorcado_core"],
+        "import": [sys.executable, "-c", f"import {modulo}"],
+        "script": [sys.executable, os.path.join(aqui, modulo + ".py"), *corrida],
+        "python -m": [sys.executable, "-m", modulo, *corrida],
+    }
+    entorno = {**os.environ, "NO_COLOR": "1", "STATS_FILE": ""}
+    # Bytecode al día en __pycache__ (con PYTHONDONTWRITEBYTECODE el intérprete no lo escribe):
+    # el script de entrada se recompila en cada arranque, pero solo es el lanzador
+    import py_compile
+
+    for nombre in ("ahorcado_core", "ahorcado_consola", modulo):
+        py_compile.compile(os.path.join(aqui, nombre + ".py"), doraise=True)
+    tiempos: Dict[str, float] = {}
+    for nombre, cmd in casos.items():
+        muestras = []
+        for _ in range(repeticiones):
+            t0 = time.perf_counter()
+            subprocess.run(cmd, cwd=aqui, env=entorno, stdout=subprocess.DEVNULL, check=True)
+            muestras.append(time.perf_counter() - t0)
+        tiempos[nombre] = 1000 * statistics.median(muestras)
+    traza = subprocess.run([sys.executable, "-X", "importtime", "-m", modulo, *corrida], cwd=aqui,
+                           env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True).stderr
+    propios = []
+    for linea in traza.splitlines():
+        partes = linea.split("|")
+        if len(partes) == 3 and partes[0].split(":")[-1].strip().isdigit():
+            propios.append((partes[2].strip(), int(partes[0].split(":")[-1])))
+    return tiempos, sorted(propios, key=lambda x: -x[1])[:6]
+
+
+def _cmd_bench_arranque(args: Any) -> int:
+    tiempos, propios = medir_arranque(args.repeticiones)
+    base = tiempos["interprete"]
+    lines = [f"{'invocacion':<12} {'ms':>8} {'sobre el interprete':>20}"]
+    for nombre, ms in tiempos.items():
+        lines.append(f"{nombre:<12} {ms:>8.1f} {ms - base:>17.1f} ms")
+    lines += ["", c("Mas tiempo propio al importar (python -m)", BOLD)]
+    lines += [f"  {nombre:<24} {us / 1000:>6.2f} ms" for nombre, us in propios]
+    extra = tiempos["python -m"] - base
+    ok = extra <= args.presupuesto
+    lines += ["", c(f"python -m: {extra:.1f} ms sobre el interprete (presupuesto {args.presupuesto:.0f} ms)",
+                    FG["green"] if ok else FG["red"])]
+    print(make_box(lines, title="Arranque en frio"))
+    return 0 if ok else 1
+
+
+def medir_render(partidas: int = 20) -> Dict[str, Dict[str, float]]:
+    """Bytes y tiempo por frame de partidas automáticas: reimpresión completa vs diferencial."""
+    import io
+
+    juegos: List[List[List[str]]] = []
+    palabras = [(cat, p) for cat, ps in WORD_BANK.items() for p in ps]
+    for i in range(partidas):
+        cat, palabra = palabras[i % len(palabras)]
+        state = create_game_state(palabra, max_intentos=6, categoria=cat)
+        frames = [construir_pantalla(cat, "media", state)]
+        while not (gano(state) or perdio(state)):
+            state, _ = intento_letra(state, next_auto_letter(state))
+            frames.append(construir_pantalla(cat, "media", state))
+        juegos.append(frames)
+    total = sum(len(f) for f in juegos)
+
+    sink = io.StringIO()
+    t0 = time.perf_counter()
+    nbytes = 0
+    for frames in juegos:
+        for lineas in frames:
+            texto = f"{CSI}2J{CSI}H" + "\n".join(lineas) + "\n"
+            sink.write(texto)
+            nbytes += len(texto.encode("utf-8"))
+    clasico = {"bytes_por_frame": nbytes / total, "ms_por_frame": 1000 * (time.perf_counter() - t0) / total}
+
+    render = RenderDiferencial(io.StringIO())
+    for frames in juegos:
+        render.invalidar()
+        for lineas in frames:
+            render.dibujar(lineas)
+    diferencial = {"bytes_por_frame": render.bytes_escritos / render.frames,
+                   "ms_por_frame": 1000 * render.segundos / render.frames}
+    return {"clasico": clasico, "diferencial": diferencial}
+
+
+def contar_escrituras(fn: Callable[[], Any]) -> Tuple[int, int]:
+    """Ejecuta `fn` con un stdout como el de una terminal (texto con buffer de línea)
+    sobre un dispositivo que cuenta escrituras: devuelve (escrituras al SO, bytes)."""
+    import contextlib
+    import io
+
+    class _DispositivoContador(io.RawIOBase):
+        escrituras = 0
+        nbytes = 0
+
+        def writable(self) -> bool:
+            return True
+
+        def write(self, b: Any) -> int:
+            self.escrituras += 1
+            self.nbytes += len(b)
+            return len(b)
+
+    dispositivo = _DispositivoContador()
+    salida = io.TextIOWrapper(io.BufferedWriter(dispositivo), encoding="utf-8", line_buffering=True)
+    with contextlib.redirect_stdout(salida):
+        fn()
+        salida.flush()
+    return dispositivo.escrituras, dispositivo.nbytes
+
+
+def medir_escrituras(partidas: int = 5) -> Dict[str, float]:
+    """Escrituras al SO por frame: impresión por partes (como antes) vs frame en un buffer."""
+    global _RENDER
+    frames: List[Tuple[List[str], List[str]]] = []
+    palabras = [(cat, p) for cat, ps in WORD_BANK.items() for p in ps]
+    for i in range(partidas):
+        cat, palabra = palabras[i % len(palabras)]
+        state = create_game_state(palabra, max_intentos=6, categoria=cat)
+        aviso: List[str] = []
+        while not (gano(state) or perdio(state)):
+            frames.append((construir_pantalla(cat, "media", state), aviso))
+            state, feedback = aplicar_entrada(state, next_auto_letter(state))
+            aviso = make_box(["Entrada: x", feedback], title="Movimiento").split("\n")
+
+    def por_partes() -> None:
+        for lineas, aviso in frames:
+            sys.stdout.write(f"{CSI}2J{CSI}H")
+            sys.stdout.flush()
+            for ln in lineas[:len(BANNER) + 2]:
+                print(ln)
+            print("\n".join(lineas[len(BANNER) + 2:]))
+            if aviso:
+                print("\n".join(aviso))
+
+    def en_buffer() -> None:
+        for lineas, aviso in frames:
+            mostrar_pantalla(lineas + aviso)
+
+    render_previo = _RENDER
+    try:
+        _RENDER = None
+        antes, _ = contar_escrituras(por_partes)
+        despues, _ = contar_escrituras(en_buffer)
+    finally:
+        _RENDER = render_previo
+    return {"por_partes": antes / len(frames), "buffer_unico": despues / len(frames)}
+
+
+def medir_construccion(partidas: int = 20, repeticiones: int = 5) -> Dict[str, float]:
+    """Microsegundos por `construir_pantalla` sin y con el caché de recursos de render."""
+    global RENDER_CACHE
+    palabras = [(cat, p) for cat, ps in WORD_BANK.items() for p in ps]
+    estados: List[Tuple[str, GameState]] = []
+    for i in range(partidas):
+        cat, palabra = palabras[i % len(palabras)]
+        state = create_game_state(palabra, max_intentos=6, categoria=cat)
+        estados.append((cat, state))
+        while not (gano(state) or perdio(state)):
+            state, _ = intento_letra(state, next_auto_letter(state))
+            estados.append((cat, state))
+    previo = RENDER_CACHE
+    res: Dict[str, float] = {}
+    try:
+        for nombre, activo in (("sin_cache", False), ("con_cache", True)):
+            RENDER_CACHE = activo
+            _VLEN_CACHE.clear()
+            _ASSETS.clear()
+            t0 = time.perf_counter()
+            for _ in range(repeticiones):
+                for cat, state in estados:
+                    construir_pantalla(cat, "media", state)
+            res[nombre] = 1e6 * (time.perf_counter() - t0) / (repeticiones * len(estados))
+    finally:
+        RENDER_CACHE = previo
+    return res
+
+
+def _cmd_bench_render(args: Any) -> int:
+    res = medir_render(args.partidas)
+    lines = [f"{'modo':<12} {'bytes/frame':>12} {'ms/frame':>10}"]
+    for modo, m in res.items():
+        lines.append(f"{modo:<12} {m['bytes_por_frame']:>12.0f} {m['ms_por_frame']:>10.3f}")
+    escrituras = medir_escrituras(max(1, args.partidas // 4))
+    lines += ["", c("Escrituras al SO por frame (stdout de terminal)", BOLD)]
+    for modo, n in escrituras.items():
+        lines.append(f"{modo:<12} {n:>12.1f}")
+    cons = medir_construccion(args.partidas)
+    lines += ["", c("Construccion de pantalla completa", BOLD)]
+    for modo, us in cons.items():
+        lines.append(f"{modo:<12} {us:>12.1f} us/frame")
+    lines.append(f"{'mejora':<12} {cons['sin_cache'] / cons['con_cache']:>12.2f}x")
+    print(make_box(lines, title="Benchmark de renderizado"))
+    return 0
+
+
+def _cmd_tablas(args: Any) -> int:
+    t0 = time.perf_counter()
+    tablas = construir_tablas()
+    seg = time.perf_counter() - t0
+    nbytes = guardar_tablas(tablas, args.salida)
+    lines = [f"{sum(len(t) for t, _ in tablas.values())} estados en {seg * 1000:.1f} ms"
+             f" -> {args.salida} ({nbytes} bytes)", ""]
+    for cat, (tabla, fallos) in tablas.items():
+        lines.append(c(f"{cat}: peor caso garantizado {max(fallos.values())} fallos", BOLD))
+        for diff, conf in DIFFICULTY.items():
+            perdidas = sorted(p for p, n in fallos.items() if n >= conf["max_intentos"])
+            estado = c("todas ganables", FG["green"]) if not perdidas else c("no ganables: " + ", ".join(perdidas), FG["red"])
+            lines.append(f"  {diff:<8} ({conf['max_intentos']} intentos): {estado}")
+        lines.append("  " + ", ".join(f"{p}={n}" for p, n in sorted(fallos.items(), key=lambda kv: -kv[1])))
+    print(make_box(lines, title="Tablas de juego precalculadas"))
+    return 0
+
+
+def _cmd_resistencia(args: Any) -> int:
+    res = prueba_resistencia(args.jugadas, seed=args.seed)
+    tolerancia = args.tolerancia_kb * 1024
+    ok = res["crecimiento"] <= tolerancia
+    lines = [
+        f"Jugadas: {res['jugadas']} en {res['segundos']:.1f}s ({res['jugadas'] / res['segundos']:,.0f}/s)",
+        "Memoria (KB): " + " ".join(f"{m / 1024:.0f}" for m in res["memoria"]),
+        f"Crecimiento tras calentamiento: {res['crecimiento'] / 1024:.1f} KB (tolerancia {args.tolerancia_kb} KB)",
+        c("Memoria estable.", FG["green"]) if ok else c("La memoria crece con las jugadas.", FG["red"]),
+    ]
+    print(make_box(lines, title="Prueba de resistencia"))
+    return 0 if ok else 1
+
+
+def _cmd_servidor(args: Any) -> int:
+    import asyncio
+
+    async def servir() -> None:
+        server = await iniciar_servidor(args.host, args.port, args.pausa, args.espera,
+                                        args.color, args.unicode)
+        print(make_box([f"Escuchando en {args.host}:{args.port}",
+                        f"Conectate con: telnet {args.host} {args.port}"], title="Servidor"))
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(servir())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _cmd_carga(args: Any) -> int:
+    import asyncio
+
+    res = asyncio.run(carga_async(args.host, args.port, args.sesiones, args.concurrencia))
+    lines = [
+        f"Sesiones: {res['sesiones']}  (concurrencia {args.concurrencia}, errores {res['errores']})",
+        f"Jugadas: {res['jugadas']} en {res['segundos']:.2f}s  ({res['jugadas_por_s']:,.0f} jugadas/s)",
+        f"Latencia por jugada: p50 {res['p50_ms']:.2f} ms | p99 {res['p99_ms']:.2f} ms | max {res['max_ms']:.2f} ms",
+    ]
+    print(make_box(lines, title="Prueba de carga"))
+    return 1 if res["errores"] else 0
+
+
+def medir_vocabulario(dic: DiccionarioMmap, consultas: int = 20000, seed: int = 0) -> Dict[str, float]:
+    """Memoria y costo por consulta de `IndiceVocabulario` frente a un `set` con las mismas palabras."""
+    import string
+    import tracemalloc
+
+    rng = random.Random(seed)
+    t0 = time.perf_counter()
+    indice = IndiceVocabulario(dic)
+    construir = time.perf_counter() - t0
+    aciertos = [dic.elegir(None, rng)[1] for _ in range(consultas)]
+    fallos = ["".join(rng.choice(string.ascii_lowercase) for _ in range(len(w))) for w in aciertos]
+    res = {"palabras": sum(dic.total(cat) for cat in dic.categorias), "construir_s": construir,
+           "indice_bytes": indice.memoria()}
+    for nombre, lote in (("acierto", aciertos), ("fallo", fallos)):
+        t0 = time.perf_counter()
+        for w in lote:
+            w in indice
+        res[f"us_{nombre}"] = 1e6 * (time.perf_counter() - t0) / consultas
+    tracemalloc.start()
+    conjunto = {dic.palabra(cat, i) for cat in dic.categorias for i in range(dic.total(cat))}
+    res["set_bytes"] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    t0 = time.perf_counter()
+    for w in aciertos:
+        w in conjunto
+    res["us_set"] = 1e6 * (time.perf_counter() - t0) / consultas
+    assert all(w in indice for w in aciertos[:100])
+    return res
+
+
+def _cmd_indice(args: Any) -> int:
+    t0 = time.perf_counter()
+    dic = DiccionarioMmap(args.ruta, usar_cache=not args.sin_cache)
+    seg = time.perf_counter() - t0
+    lines = [
+        f"Origen: {'indice en cache' if dic.desde_cache else 'escaneo completo'} ({seg * 1000:.1f} ms)",
+        "",
+    ]
+    for cat in dic.categorias:
+        largos = sorted(largo for (c_, largo) in dic.grupos if c_ == cat)
+        lines.append(f"  {cat:<16} {dic.total(cat):>10} palabras  (longitudes {largos[0]}-{largos[-1]})")
+    if args.muestra:
+        t0 = time.perf_counter()
+        muestra = [dic.elegir() for _ in range(args.muestra)]
+        us = 1e6 * (time.perf_counter() - t0) / args.muestra
+        lines += ["", f"Muestra ({us:.2f} us/eleccion): " + ", ".join(p for _, p in muestra[:8])]
+    if args.vocabulario:
+        v = medir_vocabulario(dic)
+        lines += [
+            "", c(f"Validacion de palabras ({v['palabras']:,} palabras)", BOLD),
+            f"  indice hash   {v['indice_bytes'] / 2 ** 20:>9.1f} MiB  construido en {v['construir_s']:.2f}s",
+            f"  set de str    {v['set_bytes'] / 2 ** 20:>9.1f} MiB",
+            f"  consulta      {v['us_acierto']:.2f} us (acierto)  {v['us_fallo']:.2f} us (fallo)"
+            f"  set: {v['us_set']:.2f} us",
+        ]
+    print(make_box(lines, title=f"Diccionario — {args.ruta}"))
+    return 0
+
+
+def _cmd_modelo(args: Any) -> int:
+    if not hay_numpy():
+        print(c("El modelo de frecuencias necesita NumPy (pip install numpy)", FG["red"]))
+        return 1
+    import numpy as np
+
+    banco: Any = None
+    if args.sinteticas:
+        # Palabras al azar (categoría "sintetica") para medir el costo con diccionarios grandes
+        rng = np.random.default_rng(args.seed)
+        texto = (rng.integers(0, 26, size=args.sinteticas * args.largo, dtype=np.uint8) + ord("a")).tobytes()
+        banco = {"sintetica": [texto[i:i + args.largo].decode("ascii")
+                               for i in range(0, len(texto), args.largo)]}
+    modelo = ModeloFrecuencias(banco)
+    lines: List[str] = []
+    for cat in (list(modelo.banco.categorias) if isinstance(modelo.banco, DiccionarioMmap)
+                else list(modelo.banco)):
+        t0 = time.perf_counter()
+        largo = args.largo
+        m = modelo.matriz(cat, largo)
+        construir = time.perf_counter() - t0
+        if not len(m):
+            continue
+        _, global_ = modelo.frecuencias(cat, largo)
+        top = "".join(_SIMBOLOS_MODELO[i] for i in np.argsort(-global_, kind="stable")[:8])
+        # Consultas: patrón vacío y tras dos aciertos de una palabra real del grupo
+        palabra = "".join(_SIMBOLOS_MODELO[x] for x in m[0])
+        estado = create_game_state(palabra, categoria=cat)
+        consultas = [estado]
+        for ch in dict.fromkeys(palabra[:2]):
+            estado, _ = intento_letra(estado, ch)
+            consultas.append(estado)
+        t0 = time.perf_counter()
+        for st in consultas:
+            modelo.ranking(st)
+        ms = 1000 * (time.perf_counter() - t0) / len(consultas)
+        lines.append(f"  {cat:<12} {len(m):>9} palabras  top {top}  "
+                     f"construir {construir * 1000:7.1f} ms  consulta {ms:7.2f} ms")
+    if not lines:
+        lines = [f"Sin palabras de longitud {args.largo}"]
+    print(make_box(lines, title=f"Modelo de frecuencias — longitud {args.largo}"))
+    return 0
+
+
+def medir_estadisticas(partidas: int = 2000) -> Dict[str, float]:
+    """Costo visto por el bucle del juego al guardar una partida: commit por partida
+    (síncrono) vs encolar para el hilo escritor (en lote). En us por partida."""
+    import sqlite3
+    import tempfile
+
+    fila = {"fecha": 0.0, "jugador": "bench", "categoria": "T", "dificultad": "media", "palabra": "casa",
+            "gano": 1, "intentos": 2, "max_intentos": 6, "letras_bad": "xz", "jugadas": 6, "segundos": 3.0}
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "sync.db")
+        con = sqlite3.connect(ruta)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.executescript(_ESQUEMA_STATS)
+        t0 = time.perf_counter()
+        for _ in range(partidas):
+            with con:
+                EstadisticasSQLite._guardar_lote(con, [tuple(fila[k] for k in _COLUMNAS_PARTIDA)])
+        sincrono = time.perf_counter() - t0
+        con.close()
+        stats = EstadisticasSQLite(os.path.join(tmp, "lote.db"))
+        t0 = time.perf_counter()
+        for _ in range(partidas):
+            stats.registrar(fila)
+        encolar = time.perf_counter() - t0
+        stats.vaciar()
+        total = time.perf_counter() - t0
+        stats.cerrar()
+    return {"sincrono": 1e6 * sincrono / partidas, "encolar": 1e6 * encolar / partidas,
+            "lote_total": 1e6 * total / partidas}
+
+
+def _cmd_estadisticas(args: Any) -> int:
+    if args.bench:
+        res = medir_estadisticas(args.bench)
+        lines = [f"{modo:<12} {us:>10.1f} us/partida" for modo, us in res.items()]
+        print(make_box(lines, title=f"Guardar {args.bench} partidas — commit por partida vs lote"))
+        return 0
+    stats = estadisticas()
+    if stats is None:
+        print(c("Historial desactivado (STATS_FILE vacio o no escribible)", FG["red"]))
+        return 1
+    print(make_box(lineas_estadisticas(stats.resumen(JUGADOR, args.dificiles)), title=f"Estadisticas — {STATS_FILE}"))
+    return 0
+
+
+def _cmd_grabar(args: Any) -> int:
+    t0 = time.perf_counter()
+    n = grabar_partidas(generar_grabaciones(args.partidas, estrategias_disponibles()[args.estrategia], args.seed), args.ruta)
+    print(make_box([f"{n} partidas ({args.estrategia}) en {time.perf_counter() - t0:.2f}s"],
+                   title=f"Grabacion — {args.ruta}"))
+    return 0
+
+
+def _cmd_reproducir(args: Any) -> int:
+    estrategia = estrategias_disponibles()[args.estrategia] if args.estrategia else None
+    res = comparar_grabaciones(leer_grabaciones(args.ruta), estrategia, args.diferencias)
+    ritmo = res["partidas"] / max(res["segundos"], 1e-9)
+    lines = [
+        f"Partidas: {res['partidas']}   Tiempo: {res['segundos']:.2f}s   Partidas/s: {ritmo:,.0f}",
+        f"Iguales: {res['iguales']}   Distintas: {res['distintas']}   "
+        f"Semilla con otra palabra: {res['palabra_distinta']}",
+    ]
+    if res["cambios"]:
+        lines += ["", c("Cambios de resultado", BOLD)]
+        lines += [f"  {clave:<18} {n:>8}" for clave, n in sorted(res["cambios"].items())]
+    if res["diferencias"]:
+        lines += ["", c("Primeras diferencias (grabado -> reproducido)", BOLD)]
+        for cat, palabra, diff, antes, despues in res["diferencias"]:
+            lines.append(f"  {palabra:<14} {cat:<12} {diff:<8} {antes[0]}/{antes[1]} -> {despues[0]}/{despues[1]}")
+    modo = args.estrategia or "entradas grabadas"
+    print(make_box(lines, title=f"Reproduccion — {modo}"))
+    return 1 if res["distintas"] and not args.estrategia else 0
+
+
+def _cmd_dureza(args: Any) -> int:
+    banco: Any = DiccionarioMmap(args.palabras) if args.palabras else (diccionario() or banco_palabras())
+    ruta = args.salida or HARDNESS_FILE or "ahorcado_dureza.json"
+    t0 = time.perf_counter()
+    puntajes = puntuar_palabras(banco, args.estrategia, args.jobs)
+    segundos = time.perf_counter() - t0
+    guardar_dureza(puntajes, ruta, firma_banco(banco), args.estrategia)
+    total = sum(len(ps) for ps in puntajes.values())
+    lines = [f"Palabras: {total}   Tiempo: {segundos:.2f}s   Palabras/s: {total / max(segundos, 1e-9):,.0f}",
+             f"Estrategia: {args.estrategia}   Archivo: {ruta}", ""]
+    for cat, bandas in bandas_por_dureza(puntajes).items():
+        rangos = "  ".join(f"{nombre} {puntajes[cat][ps[0]]}-{puntajes[cat][ps[-1]]}"
+                           for nombre, ps in bandas.items() if ps)
+        lines.append(f"  {cat:<12} {len(puntajes[cat]):>8}  {rangos}")
+        dificiles = sorted(puntajes[cat].items(), key=lambda kv: (-kv[1], kv[0]))[:args.mostrar]
+        lines.append("    " + ", ".join(f"{w} ({p})" for w, p in dificiles))
+    print(make_box(lines, title="Dureza de palabras (letras falladas por el solver)"))
+    return 0
+
+
+def _cmd_torneo(args: Any) -> int:
+    nombres = args.estrategia or list(estrategias_disponibles().keys())
+    banco = DiccionarioMmap(args.palabras) if args.palabras else None
+    secuencia = secuencia_torneo(args.partidas, args.seed, banco)
+    t0 = time.perf_counter()
+    filas = tabla_torneo(torneo({n: n for n in nombres}, secuencia, args.jobs, args.presupuesto_ms / 1000.0,
+                                args.seed, args.tam_lote))
+    segundos = time.perf_counter() - t0
+    if args.csv:
+        if args.csv == "-":
+            exportar_torneo_csv(filas, sys.stdout)
+            return 0
+        with open(args.csv, "w", encoding="utf-8", newline="") as fh:
+            exportar_torneo_csv(filas, fh)
+    lines = lineas_torneo(filas) + [
+        "", f"{len(secuencia)} palabras x {len(DIFFICULTY)} dificultades por estrategia en {segundos:.2f}s   "
+            f"presupuesto {args.presupuesto_ms:g} ms/decision"]
+    if args.csv:
+        lines.append(f"CSV: {args.csv}")
+    print(make_box(lines, title="Torneo de estrategias"))
+    return 0
+
+
+def _cmd_simular_paralelo(args: Any) -> int:
+    unidades = unidades_exhaustivas(args.estrategia, args.repeticiones)
+    jobs = args.jobs or os.cpu_count() or 1
+
+    def progreso_shard(shard_id: int, parcial: Dict[str, Dict[str, Any]]) -> None:
+        n = sum(r["partidas"] for r in parcial.values())
+        print(c(f"  shard {shard_id}: {n} partidas", FG["gray"]))
+
+    total = simular_paralelo(unidades, jobs=jobs, seed=args.seed, tam_shard=args.tam_shard,
+                             al_recibir=progreso_shard if args.verbose else None)
+    for est, resumen in total.items():
+        print(make_box(formatear_resumen(resumen), title=f"Simulacion paralela — {est} | {jobs} procesos"))
+    return 0
+
+
+def _cli(argv: List[str]) -> int:
+    """Punto de entrada de las herramientas (`python Autonomo2ProgramaElAhorcado.py <comando>`)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="Autonomo2ProgramaElAhorcado.py",
+                                     description="Herramientas del Ahorcado (simulacion y benchmarks)")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("simular", help="simula partidas automaticas sin interfaz y mide partidas/s")
+    p.add_argument("-n", "--partidas", type=int, default=10000)
+    p.add_argument("--categoria", choices=list(WORD_BANK.keys()))
+    p.add_argument("--dificultad", choices=list(DIFFICULTY.keys()))
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--compacto", action="store_true", help="usa EstadoCompacto (mascaras de bits)")
+    p.add_argument("--estrategia", choices=list(estrategias_disponibles().keys()), default="frecuencia")
+    p.set_defaults(func=_cmd_simular)
+
+    p = sub.add_parser("indice", help="construye/valida el indice de un diccionario externo (mmap)")
+    p.add_argument("ruta", help="archivo de palabras o directorio con un .txt por categoria")
+    p.add_argument("--muestra", type=int, default=0, help="elige N palabras al azar y mide el costo")
+    p.add_argument("--sin-cache", action="store_true", help="no lee ni escribe el archivo .idx")
+    p.add_argument("--vocabulario", action="store_true",
+                   help="construye el indice de validacion de palabras y lo compara con un set")
+    p.set_defaults(func=_cmd_indice)
+
+    p = sub.add_parser("modelo", help="frecuencias de letras por categoria y longitud (NumPy) y costo por consulta")
+    p.add_argument("--largo", type=int, default=5)
+    p.add_argument("--sinteticas", type=int, default=0, help="usa N palabras al azar en lugar del banco")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=_cmd_modelo)
+
+    p = sub.add_parser("estadisticas", help="historial de partidas: tasas por categoria y palabras mas dificiles")
+    p.add_argument("--dificiles", type=int, default=10)
+    p.add_argument("--bench", type=int, default=0, help="mide el costo de guardar N partidas (sincrono vs lote)")
+    p.set_defaults(func=_cmd_estadisticas)
+
+    p = sub.add_parser("grabar", help="genera partidas automaticas grabadas (una linea JSON por partida)")
+    p.add_argument("ruta")
+    p.add_argument("-n", "--partidas", type=int, default=10000)
+    p.add_argument("--estrategia", choices=list(estrategias_disponibles().keys()), default="frecuencia")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=_cmd_grabar)
+
+    p = sub.add_parser("reproducir", help="re-ejecuta partidas grabadas sin render y compara resultados")
+    p.add_argument("ruta")
+    p.add_argument("--estrategia", choices=list(estrategias_disponibles().keys()),
+                   help="juega cada palabra grabada con esta estrategia en lugar de las entradas grabadas")
+    p.add_argument("--diferencias", type=int, default=20, help="diferencias a listar como maximo")
+    p.set_defaults(func=_cmd_reproducir)
+
+    p = sub.add_parser("dureza", help="puntua cada palabra con el solver y guarda las bandas por dificultad")
+    p.add_argument("--palabras", default="", help="archivo o directorio de palabras (por defecto el banco activo)")
+    p.add_argument("--estrategia", choices=list(estrategias_disponibles().keys()), default="frecuencia")
+    p.add_argument("-j", "--jobs", type=int, default=None)
+    p.add_argument("--salida", default="", help="archivo de puntajes (por defecto HARDNESS_FILE)")
+    p.add_argument("--mostrar", type=int, default=5, help="palabras mas dificiles a listar por categoria")
+    p.set_defaults(func=_cmd_dureza)
+
+    p = sub.add_parser("tablas", help="precalcula la politica optima por categoria y la guarda en binario")
+    p.add_argument("--salida", default=TABLES_FILE)
+    p.set_defaults(func=_cmd_tablas)
+
+    p = sub.add_parser("resistencia", help="soak test: N jugadas por los bucles de consola, memoria estable")
+    p.add_argument("--jugadas", type=int, default=100_000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--tolerancia-kb", type=int, default=256)
+    p.set_defaults(func=_cmd_resistencia)
+
+    p = sub.add_parser("servidor", help="servidor asyncio multi-sesion por TCP (telnet)")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=7777)
+    p.add_argument("--pausa", type=float, default=0.0, help="pausa (no bloqueante) tras cada jugada, en s")
+    p.add_argument("--espera", type=float, default=300.0, help="cierra sesiones inactivas tras N s")
+    p.add_argument("--color", action="store_true", help="envia colores ANSI a los clientes")
+    p.add_argument("--unicode", action="store_true", help="envia bordes de caja Unicode a los clientes")
+    p.set_defaults(func=_cmd_servidor)
+
+    p = sub.add_parser("carga", help="cliente de carga contra el servidor: latencia p50/p99 por jugada")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=7777)
+    p.add_argument("--sesiones", type=int, default=1000)
+    p.add_argument("--concurrencia", type=int, default=500)
+    p.set_defaults(func=_cmd_carga)
+
+    p = sub.add_parser("bench", help="benchmarks de rutas calientes y simulacion; JSON y deteccion de regresiones")
+    p.add_argument("--salida", help="escribe los resultados (con metadatos del entorno) en JSON")
+    p.add_argument("--comparar", help="JSON de una corrida anterior; falla si hay regresiones")
+    p.add_argument("--umbral", type=float, default=10.0, help="regresion maxima tolerada, en %%")
+    p.add_argument("--min-tiempo", type=float, default=0.2, help="segundos minimos por medicion")
+    p.set_defaults(func=_cmd_bench)
+
+    p = sub.add_parser("bench-render", help="bytes y tiempo por frame: reimpresion completa vs diferencial")
+    p.add_argument("--partidas", type=int, default=20)
+    p.set_defaults(func=_cmd_bench_render)
+
+    p = sub.add_parser("bench-arranque", help="arranque en frio por forma de invocacion (-X importtime)")
+    p.add_argument("--repeticiones", type=int, default=15)
+    p.add_argument("--presupuesto", type=float, default=50.0,
+                   help="ms maximos de `python -m` por encima del interprete vacio")
+    p.set_defaults(func=_cmd_bench_arranque)
+
+    p = sub.add_parser("bench-estado", help="compara tiempo y memoria por intento: dict vs EstadoCompacto")
+    p.add_argument("--partidas", type=int, default=20000)
+    p.add_argument("--largo", type=int, default=400, help="letras de la palabra larga del benchmark de progreso")
+    p.set_defaults(func=_cmd_bench_estado)
+
+    p = sub.add_parser("cache-candidatos", help="mide el cache patron -> candidatos de la estrategia de informacion")
+    p.add_argument("-n", "--partidas", type=int, default=2000)
+    p.add_argument("--hilos", type=int, default=4)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--archivo", default="", help="conserva el cache guardado en esta ruta")
+    p.set_defaults(func=_cmd_cache_candidatos)
+
+    p = sub.add_parser("torneo", help="enfrenta estrategias con la misma secuencia de palabras y arma la tabla")
+    p.add_argument("--estrategia", action="append",
+                   help="nombre de ESTRATEGIAS o modulo:funcion (repetible; por defecto todas)")
+    p.add_argument("-n", "--partidas", type=int, default=300, help="palabras de la secuencia (por dificultad)")
+    p.add_argument("--palabras", default="", help="archivo o directorio de palabras (por defecto el banco)")
+    p.add_argument("--presupuesto-ms", type=float, default=50.0, help="tiempo maximo por decision (0: sin limite)")
+    p.add_argument("-j", "--jobs", type=int, default=None)
+    p.add_argument("--tam-lote", type=int, default=100)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--csv", default="", help="exporta la tabla a CSV ('-' para stdout)")
+    p.set_defaults(func=_cmd_torneo)
+
+    p = sub.add_parser("simular-paralelo",
+                       help="simula cada (palabra, dificultad, estrategia) en un pool de procesos")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="procesos (por defecto: todos los nucleos)")
+    p.add_argument("--estrategia", action="append", choices=list(estrategias_disponibles().keys()))
+    p.add_argument("--repeticiones", type=int, default=100)
+    p.add_argument("--tam-shard", type=int, default=2000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("-v", "--verbose", action="store_true", help="muestra los parciales de cada shard")
+    p.set_defaults(func=_cmd_simular_paralelo)
+
+    args = parser.parse_args(argv)
+    persistir_cache_candidatos()  # con CANDIDATES_FILE: arranque en caliente y guardado al salir
+    return args.func(args)
+
+
+
+# PRUEBAS (lógicas, sin I/O de consola)
+
+
+def _run_tests() -> None:
+    # Configuración del módulo que las pruebas cambian (y restauran) en el camino
+    global STATS_FILE, HARDNESS_FILE, VALIDAR_PALABRAS, MODO_FRASES, USE_COLOR, _RENDER, _TERMINAL, AUTO_MODE
+    print("== Pruebas HangmanGame ==")
+    STATS_FILE = ""  # las partidas de las pruebas no van al historial del usuario
+    HARDNESS_FILE = ""  # ni sus puntajes de dureza al archivo
+    # 1) progreso inicial
+    g = create_game_state("abc", max_intentos=3)
+    assert "_ _ _" in progreso(g), "Progreso inicial"
+    # 2) acierto
+    new_g, acierto = intento_letra(g, 'a')
+    assert acierto is True
+    assert 'a' in progreso(new_g)
+    # 3) repetida
+    try:
+        intento_letra(new_g, 'a')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Debe rechazar repetidas")
+    # 4) fallo e incremento
+    new_g2, acierto = intento_letra(g, 'x')
+    assert acierto is False
+    assert intentos_usados(new_g2) == 1
+    # 5) ganar
+    new_g3, _ = intento_letra(new_g, 'b')
+    new_g4, _ = intento_letra(new_g3, 'c')
+    assert gano(new_g4) and not perdio(new_g4)
+    # 6) perder
+    h = create_game_state("z", max_intentos=1)
+    new_h, acierto = intento_letra(h, 'x')
+    assert perdio(new_h) and not gano(new_h)
+    # 7) validacion de entrada
+    i = create_game_state("hola")
+    for inval in ["", "ab", "ß", "1", " "]:
+        try:
+            intento_letra(i, inval)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Entrada invalida: {inval!r}")
+    # 8) saturacion de frame
+    j = create_game_state("xyz", max_intentos=2)
+    j["letras_bad"] = {'a', 'b', 'c'}
+    assert isinstance(estado_ahorcado(j), str)
+    # 9) dificultad media
+    assert DIFFICULTY['media']['max_intentos'] == 6
+    # 10) estrategia automática propone letras no repetidas
+    t = create_game_state("python", max_intentos=8)
+    seen: Set[str] = set()
+    for _ in range(5):
+        ch = next_auto_letter(t)
+        assert ch not in seen, "next_auto_letter debe proponer letras nuevas"
+        seen.add(ch)
+        try:
+            t, _ = intento_letra(t, ch)
+        except ValueError:
+            pass
+    # 11) demo automática termina en estado válido (gana o pierde)
+    u = create_game_state("variable", max_intentos=8)
+    steps = 0
+    current_state = u
+    while not (gano(current_state) or perdio(current_state)) and steps < 26:
+        ch = next_auto_letter(current_state)
+        try:
+            new_state, _ = intento_letra(current_state, ch)
+            current_state = new_state
+        except ValueError:
+            pass
+        steps += 1
+    assert gano(current_state) or perdio(current_state), "La demo automática debe finalizar"
+    # 12) progreso() no debe contener códigos ANSI
+    v = create_game_state("abc")
+    assert "\033[" not in progreso(v), "progreso() debe ser texto plano"
+    # 13) 'print' debe aceptar el argumento 'end' (no debe estar sombreado)
+    try:
+        print("", end="")
+    except TypeError as e:
+        raise AssertionError(f"El builtin print fue sombreado: {e}")
+    # 14) intentos_restantes disminuye en fallos
+    w = create_game_state("aa", max_intentos=3)
+    antes = intentos_restantes(w)
+    new_w, _ = intento_letra(w, 'z') if 'z' not in w["palabra"] else intento_letra(w, 'x')
+    assert intentos_restantes(new_w) == antes - 1, "Debe descontar intento en fallo"
+    # 15) elegir_palabra retorna categoria/word válidos
+    cat, word = elegir_palabra(None)
+    assert cat in WORD_BANK and word in WORD_BANK[cat] and isinstance(word, str), "elegir_palabra inválida"
+    # 16) adivinar palabra completa (correcta) gana sin gastar intentos
+    x = create_game_state("sol", max_intentos=6)
+    new_x, acierto = intento_palabra(x, "sol")
+    assert acierto is True
+    assert gano(new_x) and intentos_usados(new_x) == 0
+    # 17) adivinar palabra completa (incorrecta) consume 1 intento y se registra
+    y = create_game_state("sol", max_intentos=2)
+    usados_antes = intentos_usados(y)
+    new_y, acierto = intento_palabra(y, "sal")
+    assert acierto is False
+    assert intentos_usados(new_y) == usados_antes + 1 and "sal" in new_y["palabras_bad"]
+    # 18) palabra repetida debe lanzar error
+    try:
+        intento_palabra(new_y, "sal")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Debe rechazar palabra completa repetida")
+    # 19) simulación headless: agrega resultados y es reproducible con semilla
+    r1 = simular_partidas(200, seed=7)
+    r2 = simular_partidas(200, seed=7)
+    assert r1["partidas"] == 200 and sum(r1["intentos"].values()) == 200
+    assert r1["grupos"] == r2["grupos"] and r1["intentos"] == r2["intentos"], "Simulación no reproducible"
+    assert gano(jugar_partida_auto("sol", max_intentos=26)), "Con intentos suficientes siempre gana"
+    # 20) simulación por shards: mismo resultado con 1 o varios procesos
+    units = unidades_exhaustivas(["frecuencia", "aleatoria"], repeticiones=2)
+    s1 = simular_paralelo(units, jobs=1, seed=3, tam_shard=50)
+    s2 = simular_paralelo(units, jobs=2, seed=3, tam_shard=50)
+    assert set(s1) == {"frecuencia", "aleatoria"} and s1["aleatoria"]["partidas"] == len(units) // 2
+    for est in s1:
+        assert s1[est]["grupos"] == s2[est]["grupos"] and s1[est]["intentos"] == s2[est]["intentos"]
+    # 21) estado compacto: misma semántica que el dict en la API funcional
+    for palabra in ("variable", "tenis"):
+        d = create_game_state(palabra, max_intentos=6)
+        k = create_game_state(palabra, max_intentos=6, compacto=True)
+        while not (gano(d) or perdio(d)):
+            ch = next_auto_letter(d)
+            assert ch == next_auto_letter(k)
+            d, ok_d = intento_letra(d, ch)
+            k, ok_k = intento_letra(k, ch)
+            assert ok_d == ok_k and progreso(d) == progreso(k) and intentos_usados(d) == intentos_usados(k)
+            assert set(d["letras_bad"]) == set(k["letras_bad"]) and gano(d) == gano(k) and perdio(d) == perdio(k)
+    k = create_game_state("sol", compacto=True)
+    k2, acierto = intento_palabra(k, "sal")
+    assert not acierto and intentos_usados(k2) == 1 and intentos_usados(k) == 0, "Debe ser inmutable"
+    assert gano(intento_palabra(k2, "sol")[0])
+    try:
+        k.mask_ok = 1
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("EstadoCompacto debe ser inmutable")
+    # 22) estrategia por información: filtra candidatos y nunca repite letras
+    est = EstrategiaInformacion({"T": ("casa", "cosa", "cata", "mesa", "perro")})
+    z = create_game_state("cosa", max_intentos=6, categoria="T")
+    assert sorted(est.candidatos(z)) == ["casa", "cata", "cosa", "mesa"]
+    z, _ = intento_letra(z, "a")
+    assert sorted(est.candidatos(z)) == ["cosa", "mesa"], "Una 'a' oculta descarta casa/cata"
+    z, _ = intento_letra(z, "e")
+    assert est.candidatos(z) == ["cosa"] and est(z) in "cos"
+    z = jugar_partida_auto("programacion", 8, estrategia_informacion, categoria="Tecnologia")
+    assert gano(z) and intentos_usados(z) == 0, "Con el banco completo no debería fallar"
+    # 23) diccionario mmap: índice por categoría/longitud y caché lateral
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "palabras.txt")
+        with open(ruta, "w", encoding="utf-8") as fh:
+            fh.write("Frutas\tpera\nFrutas\tmanzana\nColores\trojo\nColores\tazul\nsinTab\n x1 \n")
+        dic = DiccionarioMmap(ruta)
+        assert not dic.desde_cache and os.path.exists(ruta + ".idx")
+        assert set(dic.categorias) == {"Frutas", "Colores", "palabras"}
+        assert sorted(dic.vista("Frutas")) == ["manzana", "pera"] and list(dic.vista("palabras")) == ["sintab"]
+        cat_d, pal_d = dic.elegir("Colores")
+        assert cat_d == "Colores" and pal_d in ("rojo", "azul")
+        dic.cerrar()
+        dic2 = DiccionarioMmap(ruta)
+        assert dic2.desde_cache and sorted(dic2.vista("Colores")) == ["azul", "rojo"]
+        dic2.cerrar()
+    # 24) render diferencial: el segundo frame solo reescribe la celda que cambió
+    import io
+    rd = RenderDiferencial(io.StringIO())
+    primero = rd.componer(["hola", c("mundo", FG["red"]), "fin"])
+    segundo = rd.componer(["hola", c("munda", FG["red"]), "fin"])
+    assert f"{CSI}2J" in primero and f"{CSI}2J" not in segundo
+    assert f"{CSI}2;5H" in segundo and "mund" not in segundo and "hola" not in segundo
+    assert len(segundo) < len(primero)
+    # 25) caché de render: se invalida al cambiar USE_COLOR y respeta NO_COLOR en la horca
+    color_previo = USE_COLOR
+    try:
+        USE_COLOR = False
+        assert "\033[" not in estado_ahorcado(create_game_state("abc")), "Sin color no debe haber ANSI"
+        USE_COLOR = True
+        assert "\033[" in estado_ahorcado(create_game_state("abc")), "El caché debe invalidarse"
+        # un frame resuelve las capacidades al empezar y las suelta al terminar
+        pintado = _frame(lambda: (c("x", BOLD), capacidades()[0]))
+        assert pintado() == (BOLD + "x" + RESET, True) and _CAPACIDADES_FRAME is None
+        import ahorcado_consola
+        assert ahorcado_consola.BOX == caja()  # alias de compatibilidad
+    finally:
+        USE_COLOR = color_previo
+    assert vlen(c("hola", FG["red"], BOLD)) == 4 and vlen("hola") == 4
+    # 26) servidor asyncio: varias sesiones concurrentes terminan sus partidas
+    import asyncio
+
+    async def _prueba_servidor() -> Dict[str, float]:
+        server = await iniciar_servidor("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await carga_async("127.0.0.1", port, sesiones=20, concurrencia=10)
+
+    res = asyncio.run(_prueba_servidor())
+    assert res["errores"] == 0 and res["jugadas"] >= 20, res
+    # Los frames siguen las capacidades declaradas para el cliente, no la TTY del servidor
+
+    async def _primer_frame(color: bool) -> str:
+        server = await iniciar_servidor("127.0.0.1", 0, color=color)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            frame = await reader.readuntil(_PROMPT_RED_B)
+            writer.close()
+            await writer.wait_closed()
+            await asyncio.sleep(0.05)  # la sesión ve el EOF y termina antes de cerrar el servidor
+            return frame.decode("utf-8")
+
+    color_previo_s, USE_COLOR = USE_COLOR, True
+    try:
+        plano_s, color_s = asyncio.run(_primer_frame(False)), asyncio.run(_primer_frame(True))
+    finally:
+        USE_COLOR = color_previo_s
+    assert RESET not in plano_s and BOX_UNI[0] not in plano_s and BOX_ASC[0] in plano_s
+    assert RESET in color_s and usar_color() == (USE_COLOR if USE_COLOR is not None else terminal().colores > 0)
+    # 27) bucles iterativos: muchas jugadas (con inválidas) sin crecer la pila
+    res = prueba_resistencia(jugadas=600, seed=1, muestras=3)
+    assert res["jugadas"] >= 600, "La prueba de resistencia debe completar las jugadas"
+    # 28) tablas precalculadas: serialización ida y vuelta y juego sin desviarse de la tabla
+    tablas = construir_tablas({"T": ("casa", "cosa", "mesa", "perro", "gato")})
+    tabla_t, fallos_t = tablas["T"]
+    assert fallos_t["perro"] == 0 and max(fallos_t.values()) <= 1
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "tablas.bin")
+        guardar_tablas(tablas, ruta, firma=7)
+        assert cargar_tablas(ruta) == tablas == cargar_tablas(ruta, firma=7)
+        try:
+            cargar_tablas(ruta, firma=8)
+            assert False, "tablas de otro banco aceptadas"
+        except ValueError:
+            pass
+        tablas_n = construir_tablas({"Ñ": ("ñandú", "piñata")})
+        guardar_tablas(tablas_n, ruta)
+        assert cargar_tablas(ruta, firma_tablas()) == tablas_n
+    assert firma_tablas({"T": ("casa",)}) != firma_tablas({"T": ("cosa",)}) != firma_tablas()
+    est_t = EstrategiaTabla(tablas)
+    for palabra, n in fallos_t.items():
+        fin = jugar_partida_auto(palabra, 6, est_t, categoria="T")
+        assert gano(fin) and intentos_usados(fin) == n
+    # 29) comparación de benchmarks: detecta regresiones por encima del umbral
+    base_b = {"resultados": {"gano": {"us_por_op": 1.0}, "progreso": {"us_por_op": 2.0}}}
+    act_b = {"resultados": {"gano": {"us_por_op": 1.05}, "progreso": {"us_por_op": 3.0}, "nuevo": {"us_por_op": 9}}}
+    filas_b = {caso: regresion for caso, _, regresion in comparar_benchmarks(act_b, base_b, umbral=10)}
+    assert filas_b == {"gano": False, "progreso": True}
+    # 30) instrumentación: cuenta llamadas (también las internas) y se puede desactivar
+    activar_instrumentacion()
+    try:
+        jugar_partida_auto("tenis", 6)
+        assert _METRICAS["intento_letra"][0] >= 3 and _METRICAS["gano"][0] >= 3
+    finally:
+        desactivar_instrumentacion()
+    assert not hasattr(intento_letra, "__wrapped__"), "Debe restaurar las funciones originales"
+    # 31) frame en un buffer: una sola escritura al SO por frame (con aviso incluido)
+    render_previo = _RENDER
+    try:
+        _RENDER = None
+        n_escrituras, _ = contar_escrituras(lambda: pantalla_juego("T", "media", create_game_state("abc"),
+                                                                   ["aviso 1", "aviso 2"]))
+        assert n_escrituras == 1, n_escrituras
+    finally:
+        _RENDER = render_previo
+    # 32) modelo de frecuencias (solo si NumPy está instalado)
+    if hay_numpy():
+        mini_m = ModeloFrecuencias({"t": ["casa", "cama", "cana", "pato", "sol"]})
+        st = create_game_state("cama", categoria="t")
+        assert mini_m.ranking(st)[0] == ("a", 1.0) and dict(mini_m.ranking(st))["c"] == 0.75
+        st, _ = intento_letra(st, "a")  # quedan casa, cama, cana
+        rank_m = dict(mini_m.ranking(st))
+        assert rank_m["c"] == 1.0 and abs(rank_m["m"] - 1 / 3) < 1e-9 and "a" not in rank_m
+        assert mini_m(st) == "c"
+        pos, glob = mini_m.frecuencias("t", 4)
+        assert pos[1][0] == 1.0 and glob[ord("c") - 97] == 0.75
+        assert ModeloFrecuencias({"t": ["xyz"]}).ranking(create_game_state("abcd", categoria="t")) == []
+
+    # 33) estadísticas: escrituras en lote (WAL), agregados y persistencia al reabrir
+    with tempfile.TemporaryDirectory() as tmp_s:
+        ruta_s = os.path.join(tmp_s, "stats.db")
+        st_s = EstadisticasSQLite(ruta_s, lote=8, intervalo=0.05)
+        for i in range(20):
+            st_s.registrar({"fecha": 0.0, "jugador": "ana" if i % 2 else "luis", "categoria": "T",
+                            "dificultad": "media", "palabra": "casa" if i < 15 else "kiwi",
+                            "gano": int(i < 15), "intentos": 6 if i >= 15 else 1, "max_intentos": 6,
+                            "letras_bad": "" if i < 15 else "xyzqwj", "jugadas": 5, "segundos": 2.0})
+        st_s.vaciar()
+        res_s = st_s.resumen("ana")
+        assert (res_s["partidas"], res_s["ganadas"]) == (20, 15) and st_s.escritas == 20
+        assert res_s["categorias"] == [("T", "media", 20, 15)]
+        assert res_s["dificiles"][0][:3] == ("T", "kiwi", 5) and res_s["dificiles"][0][4] == 6.0
+        assert res_s["jugador"] == (10, 7, 20.0)
+        assert st_s._lectura.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        st_s.registrar({**dict.fromkeys(_COLUMNAS_PARTIDA, 0), "jugador": "ana", "categoria": "T",
+                        "dificultad": "media", "palabra": "casa", "letras_bad": "", "gano": 1})
+        st_s.cerrar()  # cerrar escribe lo pendiente
+        st_s = EstadisticasSQLite(ruta_s)
+        assert st_s.resumen()["partidas"] == 21
+        assert any("kiwi" in ln for ln in lineas_estadisticas(st_s.resumen("ana")))
+        st_s.cerrar()
+
+    # 34) grabación y reproducción: la semilla repite la palabra y las entradas el resultado
+    assert elegir_palabra("Ciencia", random.Random(7)) == elegir_palabra("Ciencia", random.Random(7))
+    regs = list(generar_grabaciones(60, seed=3))
+    regs.append(registro_partida(1, "T", "media", "casa", ["?", "c", "casa"],
+                                 create_game_state("casa", categoria="T")))
+    regs[-1].update(resultado="gano", intentos=0)  # "?" se ignora y la palabra completa gana
+    with tempfile.TemporaryDirectory() as tmp_r:
+        ruta_r = os.path.join(tmp_r, "partidas.jsonl")
+        assert grabar_partidas(regs, ruta_r) == 61
+        res_r = comparar_grabaciones(leer_grabaciones(ruta_r))
+        assert (res_r["partidas"], res_r["iguales"], res_r["palabra_distinta"]) == (61, 61, 1)
+        regs[0]["intentos"] += 1
+        res_r = comparar_grabaciones(iter(regs[:1]))
+        assert res_r["distintas"] == 1 and len(res_r["diferencias"]) == 1
+        assert comparar_grabaciones(leer_grabaciones(ruta_r), estrategia_informacion)["partidas"] == 61
+
+    # 35) el núcleo de reglas se importa sin módulos pesados ni de consola
+    import subprocess
+    cargados = subprocess.run(
+        [sys.executable, "-c", "import sys, ahorcado_core; print(' '.join(sys.modules))"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True,
+    ).stdout.split()
+    assert "ahorcado_core" in cargados
+    assert not {"typing", "re", "random", "string", "argparse"} & set(cargados), cargados
+    # el lanzador da el mismo módulo del juego, y al importarlo no se crean cachés ni se busca NumPy
+    import Autonomo2ProgramaElAhorcado
+    assert Autonomo2ProgramaElAhorcado is sys.modules["ahorcado_consola"]
+    importado = subprocess.run(
+        [sys.executable, "-c", "import sys, Autonomo2ProgramaElAhorcado as m; "
+         "print(m.estrategia_informacion._cache_listo, m.hay_numpy.cache_info().currsize, 'threading' in sys.modules)"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True,
+    ).stdout.split()
+    assert importado == ["False", "0", "False"], importado
+
+    # 36) validación de palabras: índice hash sobre el mmap y rechazo sin gastar intento
+    with tempfile.TemporaryDirectory() as tmp_v:
+        ruta_v = os.path.join(tmp_v, "voc.txt")
+        with open(ruta_v, "w", encoding="utf-8") as fh:
+            fh.write("animales\tGato\nanimales\tperro\nfrutas\tpera\nfrutas\tmango\n" +
+                     "".join(f"x\t{a}{b}{c_}\n" for a in "abc" for b in "abc" for c_ in "abc"))
+        dic_v = DiccionarioMmap(ruta_v, usar_cache=False)
+        voc = IndiceVocabulario(dic_v)
+        assert "gato" in voc and "pera" in voc and "cab" in voc and "mango" in voc
+        assert "gata" not in voc and "perr" not in voc and "ñu" not in voc and "zzz" not in voc
+        assert voc.memoria() > 0
+        dic_v.cerrar()
+    st_v = create_game_state("python")
+    try:
+        jugada(st_v, "pyxhon", palabra_conocida)
+        assert False, "palabra desconocida aceptada"
+    except ValueError:
+        pass
+    st_v, ok_v = jugada(st_v, "python", palabra_conocida)
+    assert ok_v and gano(st_v)
+    assert intentos_usados(jugada(create_game_state("tenis"), "atomo", palabra_conocida)[0]) == 1
+    # Solo con el banco no se valida (salvo VALIDAR_PALABRAS=1): no se delatan las respuestas
+    validar_previo = VALIDAR_PALABRAS
+    try:
+        VALIDAR_PALABRAS = None
+        assert diccionario() is not None or validador_palabras() is None
+        VALIDAR_PALABRAS = True
+        assert validador_palabras() is palabra_conocida
+    finally:
+        VALIDAR_PALABRAS = validar_previo
+
+    # 37) pool de palabras: sin repetir por vuelta ni en el borde, reconstruible y seguro entre hilos
+    from concurrent.futures import ThreadPoolExecutor
+    banco_p = {"A": tuple(f"w{i}" for i in range(50)), "B": ("uno", "dos")}
+    pool_p = PoolPalabras(banco_p, semilla=11)
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        sacadas = list(ex.map(lambda _: pool_p.sacar("A"), range(150)))
+    por_pos = {pos: w for _, w, pos in sacadas}
+    assert sorted(por_pos) == list(range(150))
+    for v in range(3):
+        assert len({por_pos[i] for i in range(50 * v, 50 * v + 50)}) == 50
+    seq_p = [por_pos[i] for i in range(150)]
+    assert all(a != b for a, b in zip(seq_p, seq_p[1:]))
+    otro_p = PoolPalabras(banco_p, semilla=11)
+    assert otro_p.palabra_en("A", 149) == por_pos[149] and otro_p.palabra_en("A", 3) == por_pos[3]
+    seq_b = [pool_p.sacar("B")[1] for _ in range(6)]
+    assert all(a != b for a, b in zip(seq_b, seq_b[1:]))
+    pool_p.reiniciar()
+    assert pool_p.sacar("A") == ("A", por_pos[0], 0)
+    # Ponderado por largo: las largas tienden a salir primero en cada vuelta
+    banco_w = {"C": tuple("x" * k for k in range(1, 41))}
+    primeras = [PoolPalabras(banco_w, semilla=s_, pesos=len).sacar("C")[1]
+                for s_ in range(200)]
+    assert sum(len(w) for w in primeras) / 200 > 25
+
+    # 38) dureza: puntajes del solver, bandas ordenadas, archivo con firma y sorteo por banda
+    punt_d = puntuar_palabras(WORD_BANK, "frecuencia", jobs=1)
+    assert {cat: set(ps) for cat, ps in punt_d.items()} == {cat: set(ps) for cat, ps in WORD_BANK.items()}
+    assert punt_d["Ciencia"]["atomo"] == puntaje_dureza("atomo", "Ciencia")
+    bandas_d = bandas_por_dureza(punt_d)
+    for cat, por_banda in bandas_d.items():
+        assert set(sum(por_banda.values(), ())) == set(WORD_BANK[cat])
+        assert all(len(ps) >= _MIN_BANDA for ps in por_banda.values())
+        f_, m_, d_ = ([punt_d[cat][w] for w in por_banda[b]] for b in ("facil", "media", "dificil"))
+        assert min(f_) <= min(m_) <= min(d_) and max(f_) <= max(m_) <= max(d_)
+    assert bandas_d["Deportes"]["facil"][0] == "tenis" and "basquet" in bandas_d["Deportes"]["dificil"]
+    assert bandas_por_dureza({"x": {"ab": 1, "cd": 0}})["x"]["dificil"] == ("cd", "ab")
+    # Sin variación no hay bandas; un empate en el borde entra entero en la banda
+    assert bandas_por_dureza({"x": dict.fromkeys("abcdef", 0)})["x"]["facil"] == tuple("abcdef")
+    empates_d = {"a": 0, "b": 1, "c": 1, "d": 1, "e": 2, "f": 3}
+    assert bandas_por_dureza({"x": empates_d}, minimo=1)["x"]["facil"] == ("a", "b", "c", "d")
+    with tempfile.TemporaryDirectory() as tmp_d:
+        ruta_d = os.path.join(tmp_d, "dureza.json")
+        guardar_dureza(punt_d, ruta_d, firma_banco(WORD_BANK), "frecuencia")
+        datos_d = cargar_dureza(ruta_d)
+        assert datos_d["puntajes"] == punt_d and datos_d["firma"] == firma_banco(WORD_BANK)
+    assert firma_banco({"A": ("uno",)}) != firma_banco({"A": ("una",)})
+    pool_d = PoolPalabras(WORD_BANK, semilla=5, bandas=bandas_d)
+    dificiles_d = [pool_d.sacar("Tecnologia", "dificil") for _ in range(len(bandas_d["Tecnologia"]["dificil"]))]
+    assert sorted(w for _, w, _ in dificiles_d) == sorted(bandas_d["Tecnologia"]["dificil"])
+    assert pool_d.banda("Tecnologia", "dificil") == "dificil" and pool_d.banda("Tecnologia", None) is None
+    assert PoolPalabras(WORD_BANK, semilla=5, bandas=bandas_d).palabra_en(
+        "Tecnologia", 1, "dificil") == dificiles_d[1][1]
+    faciles_d = {elegir_palabra("Deportes", dificultad="facil")[1] for _ in range(6)}
+    assert faciles_d <= set(bandas_dureza()["Deportes"]["facil"]) and len(faciles_d) > 1
+
+    # 39) progreso incremental: el buffer revelado coincide con recorrer la palabra
+    larga = "programacion" * 30
+    for compacto_r in (False, True):
+        st_r = create_game_state(larga, max_intentos=26, compacto=compacto_r)
+        assert progreso(st_r) == " ".join("_" * len(larga))
+        for letra in "oaxrgpmcinz":
+            st_r, _ = intento_letra(st_r, letra)
+            esperado = " ".join(ch if ch in st_r["letras_ok"] else "_" for ch in larga)
+            assert progreso(st_r) == esperado, (compacto_r, letra)
+        assert gano(st_r) and "_" not in progreso(st_r)
+        st_p, _ = intento_palabra(create_game_state("python", compacto=compacto_r), "python")
+        assert progreso(st_p) == "p y t h o n"
+    previo_r = create_game_state("casa")
+    intento_letra(previo_r, "a")
+    assert progreso(previo_r) == "_ _ _ _"  # el buffer no se comparte entre estados
+    a_mano = {"palabra": "sol", "max_intentos": 6, "letras_ok": {"o"}, "letras_bad": set(), "palabras_bad": set()}
+    assert progreso(a_mano) == "_ o _" and progreso(intento_letra(a_mano, "s")[0]) == "s o _"
+
+    # 40) frases y tildes: plegado al crear, ñ como letra, signos visibles y anchos de columna
+    for compacto_f in (False, True):
+        st_f = create_game_state("año nuevo, vida nueva", max_intentos=27, compacto=compacto_f)
+        assert progreso(st_f) == "_ _ _   _ _ _ _ _ ,   _ _ _ _   _ _ _ _ _"
+        st_f, ok_f = intento_letra(st_f, "Ñ")
+        assert ok_f and progreso(st_f).startswith("_ ñ _")
+        for letra in "avo":
+            st_f, _ = intento_letra(st_f, letra)
+        try:
+            jugada(st_f, "ano nuevo vida 1ueva")
+            assert False, "frase con dígitos aceptada"
+        except ValueError:
+            pass
+        st_f, ok_f = jugada(st_f, "Año nuevo vida nueva", palabra_conocida)
+        assert ok_f and gano(st_f) and progreso(st_f) == " ".join("año nuevo, vida nueva")
+        st_t = create_game_state("canción", compacto=compacto_f)
+        for letra in "cÁnIo":
+            st_t, _ = intento_letra(st_t, letra)
+        assert gano(st_t) and progreso(st_t) == "c a n c i ó n"
+    assert intento_palabra(create_game_state("pingüino"), "PINGUINO")[1]
+    assert vlen("canción") == 7 and vlen("漢字") == 4 and vlen("e\u0301") == 1
+    assert len({vlen(ln) for ln in make_box(["漢字", c("canción", BOLD), "abc"]).split("\n")}) == 1
+    # El render diferencial cuenta columnas como vlen: el cambio tras "漢字" y "é" cae en su columna
+    assert len(_celdas("漢字e\u0301x")) == vlen("漢字e\u0301x") == 6
+    rd_u = RenderDiferencial(io.StringIO())
+    rd_u.componer(["漢字e\u0301x"])
+    assert rd_u.componer(["漢字e\u0301y"]).startswith(f"{CSI}1;6Hy")
+    assert rd_u.componer(["漢子e\u0301y"]).startswith(f"{CSI}1;3H子")
+    modo_previo, MODO_FRASES = MODO_FRASES, True
+    try:
+        assert "Refranes" in categorias() and elegir_palabra("Con tilde")[0] == "Con tilde"
+        assert palabra_conocida("murcielago")
+        try:
+            jugada(create_game_state("pingüino"), "pinguina", palabra_conocida)
+            assert False, "palabra desconocida aceptada"
+        except ValueError:
+            pass
+        assert gano(jugar_partida_auto("más vale tarde que nunca", len(LETRAS), estrategia_informacion))
+    finally:
+        MODO_FRASES = modo_previo
+
+    # 41) torneo: misma secuencia para todas, tabla ordenada, CSV y presupuesto por decisión
+    import io
+    sec_t = secuencia_torneo(4, seed=3, banco=WORD_BANK)
+    assert sec_t == secuencia_torneo(4, seed=3, banco=WORD_BANK) and len(sec_t) == 4
+
+    def lenta(state: GameState) -> str:
+        time.sleep(0.05)
+        return next_auto_letter(state)
+
+    t0_t = time.perf_counter()
+    marc_t = torneo({"frecuencia": "frecuencia", "directa": next_auto_letter, "tabla": "tabla",
+                     "lenta": lenta}, sec_t, jobs=1, presupuesto=0.005, tam_lote=2)
+    assert time.perf_counter() - t0_t < 5
+    sin_tiempo = [{k: v for k, v in marc_t[n].items() if k != "segundos"} for n in ("frecuencia", "directa")]
+    assert sin_tiempo[0] == sin_tiempo[1] and marc_t["frecuencia"]["partidas"] == 4 * len(DIFFICULTY)
+    assert marc_t["lenta"]["excedidos"] == marc_t["lenta"]["partidas"] and marc_t["lenta"]["ganadas"] == 0
+    filas_t = tabla_torneo(marc_t)
+    assert filas_t[0]["estrategia"] == "tabla" and filas_t[-1]["estrategia"] == "lenta"
+    assert [f_["puesto"] for f_ in filas_t] == [1, 2, 3, 4]
+    csv_t = io.StringIO()
+    exportar_torneo_csv(filas_t, csv_t)
+    assert csv_t.getvalue().splitlines()[0].startswith("puesto,estrategia,") and len(csv_t.getvalue().splitlines()) == 5
+    assert resolver_estrategia("frecuencia") is next_auto_letter
+    # fuera del hilo principal no hay alarma: se penaliza después, con el mismo resultado
+    import threading
+
+    def jugar_torneo_t() -> Dict[str, Dict[str, Any]]:
+        marc = torneo({"frecuencia": "frecuencia", "lenta": lenta}, sec_t[:2], jobs=1, presupuesto=0.005)
+        return {n: {k: v for k, v in m.items() if k != "segundos"} for n, m in marc.items()}
+
+    marc_hilo_t: List[Dict[str, Dict[str, Any]]] = []
+    hilo_t = threading.Thread(target=lambda: marc_hilo_t.append(jugar_torneo_t()))
+    hilo_t.start()
+    hilo_t.join()
+    assert marc_hilo_t == [jugar_torneo_t()]
+    assert marc_hilo_t[0]["lenta"]["excedidos"] == marc_hilo_t[0]["lenta"]["partidas"] == 2 * len(DIFFICULTY)
+
+    # 42) terminal: capacidades detectadas una vez; sin TTY, registro plano sin secuencias
+    import contextlib
+
+    class _FalsaTTY(io.StringIO):
+        encoding = "utf-8"
+
+        def isatty(self) -> bool:
+            return True
+
+    tty_k = Terminal(_FalsaTTY(), {"TERM": "xterm-256color"})
+    assert tty_k.tty and tty_k.colores == 256 and tty_k.unicode and tty_k.tamano() == (0, 0)
+    assert tty_k.vt == (os.name != "nt")
+    assert Terminal(_FalsaTTY(), {"TERM": "xterm", "COLORTERM": "truecolor"}).colores == 2 ** 24
+    assert not Terminal(_FalsaTTY(), {"TERM": "dumb"}).vt
+    log_k = Terminal(io.StringIO(), {"TERM": "xterm-256color"})
+    assert not log_k.tty and not log_k.vt and log_k.colores == 0 and not log_k.unicode
+    assert Terminal(io.StringIO(), {"FORCE_COLOR": "1"}).colores == 16
+    terminal_previo, color_previo_k = _TERMINAL, USE_COLOR
+    sistema_previo = os.system
+    try:
+        _TERMINAL, USE_COLOR = log_k, None
+        os.system = lambda *_: (_ for _ in ()).throw(AssertionError("no debe lanzar procesos"))
+        assert c("x", BOLD) == "x" and caja() is BOX_ASC
+        salida_k = io.StringIO()
+        with contextlib.redirect_stdout(salida_k):
+            limpiar_consola()
+            pantalla_juego("Ciencia", "media", create_game_state("atomo"))
+            pantalla_juego("Ciencia", "media", intento_letra(create_game_state("atomo"), "a")[0])
+        texto_k = salida_k.getvalue()
+        assert "\x1b" not in texto_k and texto_k.count("Ahorcado") >= 2 and texto_k.startswith("\n")
+    finally:
+        _TERMINAL, USE_COLOR = terminal_previo, color_previo_k
+        os.system = sistema_previo
+
+    # 43) caché de candidatos: LRU acotado, compartido entre hilos, persistente por firma
+    lru_q = CacheCandidatos(capacidad=2)
+    lru_q.guardar("a", (1, []))
+    lru_q.guardar("b", (2, []))
+    assert lru_q.obtener("a") == (1, [])
+    lru_q.guardar("c", (3, []))
+    assert lru_q.obtener("b") is None and lru_q.obtener("c") == (3, []) and len(lru_q) == 2
+    met_q = lru_q.metricas()
+    assert (met_q["aciertos"], met_q["fallos"], met_q["desalojos"]) == (2, 1, 1)
+    chico_q = CacheCandidatos(max_bytes=150)
+    chico_q.guardar("x", (1, [("a", 1.0, 0.5)]))
+    chico_q.guardar("y", (1, [("b", 1.0, 0.5)]))
+    assert len(chico_q) == 1 and chico_q.obtener("y") is not None
+
+    st_q = intento_letra(intento_letra(create_game_state("python", categoria="Tecnologia"), "z")[0], "o")[0]
+    stc_q = intento_letra(intento_letra(create_game_state("python", compacto=True, categoria="Tecnologia"), "z")[0], "o")[0]
+    assert clave_estado(st_q) == clave_estado(stc_q) != clave_estado(create_game_state("python", categoria="Tecnologia"))
+    sin_q = EstrategiaInformacion()
+    sin_q.cache = None
+    con_q = EstrategiaInformacion(cache=CacheCandidatos(4096))  # cabe todo el banco: sin desalojos
+    assert con_q.ranking(st_q) == sin_q.ranking(st_q) and con_q.candidatos(stc_q) == sin_q.candidatos(st_q)
+    sec_q = secuencia_torneo(60, seed=5, banco=WORD_BANK)
+    esperado_q = [progreso(jugar_partida_auto(p, 6, sin_q, categoria=cat)) for cat, p in sec_q]
+    obtenido_q: Dict[int, str] = {}
+
+    def jugar_hilo(i: int) -> None:
+        for j in range(i, len(sec_q), 4):
+            obtenido_q[j] = progreso(jugar_partida_auto(sec_q[j][1], 6, con_q, categoria=sec_q[j][0]))
+
+    hilos_q = [threading.Thread(target=jugar_hilo, args=(i,)) for i in range(4)]
+    for h in hilos_q:
+        h.start()
+    for h in hilos_q:
+        h.join()
+    assert [obtenido_q[j] for j in range(len(sec_q))] == esperado_q
+    aciertos_q = con_q.cache.aciertos
+    con_q.ranking(st_q)
+    con_q.ranking(st_q)
+    assert con_q.cache.aciertos == aciertos_q + 2 and con_q.cache.desalojos == 0
+    with tempfile.TemporaryDirectory() as tmp_q:
+        ruta_q = os.path.join(tmp_q, "candidatos.json")
+        assert con_q.cache.guardar_en(ruta_q, con_q.firma()) == len(con_q.cache)
+        nuevo_q = CacheCandidatos(4096)
+        assert nuevo_q.cargar_de(ruta_q, con_q.firma()) == len(con_q.cache)
+        assert nuevo_q.obtener(clave_estado(st_q)) == con_q.cache.obtener(clave_estado(st_q))
+        assert CacheCandidatos().cargar_de(ruta_q, EstrategiaInformacion(limite_exacto=8).firma()) == 0
+        assert CacheCandidatos().cargar_de(os.path.join(tmp_q, "no-existe.json"), con_q.firma()) == 0
+        # el menú y el servidor también cargan el archivo y registran el guardado al salir
+        for arranque_q in ("import io; sys.stdin = io.StringIO('5\\n'); m.main()",
+                           "import asyncio; asyncio.run(m.iniciar_servidor(port=0)).close()"):
+            registrado_q = subprocess.run(
+                [sys.executable, "-c", f"import sys, ahorcado_consola as m; {arranque_q}; "
+                 "print(m._CACHE_PERSISTIDO, file=sys.stderr)"],
+                cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True,
+                env={**os.environ, "CANDIDATES_FILE": ruta_q, "NO_SLEEP": "1"},
+            ).stderr.strip()
+            assert registrado_q == repr([ruta_q]), registrado_q
+
+    # 44) fin de la entrada: main() termina (también a mitad de partida) en vez de girar
+    stdin_previo, auto_previo = sys.stdin, AUTO_MODE
+    try:
+        AUTO_MODE = False
+        for guion in ("5\n", "x\n", "1\n1\n", "1\n1\na\n"):
+            sys.stdin, salida_e = io.StringIO(guion), io.StringIO()
+            with contextlib.redirect_stdout(salida_e):
+                main()
+            assert "Hasta pronto." in salida_e.getvalue() and len(salida_e.getvalue()) < 50_000
+        sys.stdin = io.StringIO("")
+        try:
+            safe_input("")
+            assert False, "EOF no informado"
+        except EOFError:
+            pass
+    finally:
+        sys.stdin, AUTO_MODE = stdin_previo, auto_previo
+
+    # 45) frases y tildes en los solvers: juegan sobre el patrón plegado, sin caer a la frecuencia
+    banco_z = {**WORD_BANK, **PHRASE_BANK}
+    info_z = EstrategiaInformacion(banco_z, cache=CacheCandidatos(1024))
+    tablas_z = construir_tablas(PHRASE_BANK)
+    solvers_z: Dict[str, Tuple[Estrategia, Callable[[GameState], bool]]] = {
+        "informacion": (info_z, lambda st: bool(info_z.ranking(st)) and st["palabra"] in info_z.candidatos(st)),
+        "tabla": (EstrategiaTabla(tablas_z),
+                  lambda st: _clave_tabla(patron(st), st["letras_bad"]) in tablas_z[st["categoria"]][0]),
+    }
+    if hay_numpy():
+        modelo_z = ModeloFrecuencias(banco_z)
+        solvers_z["modelo"] = (modelo_z, lambda st: bool(modelo_z.ranking(st)))
+    for cat, frases in PHRASE_BANK.items():
+        for frase in frases:
+            for nombre, (estrategia_z, propia_z) in solvers_z.items():
+                st_z = create_game_state(frase, len(LETRAS), categoria=cat)
+                while not (gano(st_z) or perdio(st_z)):
+                    assert propia_z(st_z), (nombre, frase, progreso(st_z))
+                    st_z, _ = intento_letra(st_z, estrategia_z(st_z))
+                assert gano(st_z), (nombre, frase)
+                if nombre == "tabla":
+                    assert intentos_usados(st_z) == tablas_z[cat][1][frase]
+    assert patron(intento_letra(create_game_state("canción"), "o")[0]) == "_____o_"
+
+
+    print("Todas las pruebas pasaron")
+
+
+def ejecutar(argv: List[str]) -> int:
+    """Pruebas (RUN_TESTS=1), una herramienta (`<comando> ...`) o el menú del juego."""
+    if os.environ.get("RUN_TESTS") == "1":
+        _run_tests()
+    elif argv:
+        return _cli(argv)
+    else:
+        main()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(ejecutar(sys.argv[1:]))
+
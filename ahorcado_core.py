@@ -0,0 +1,330 @@
+"""
+Ahorcado – núcleo de estado y reglas
+
+Funciones puras del juego (estado, intentos, victoria/derrota) y el estado compacto
+con máscaras de bits. No depende de la consola ni de módulos pesados: lo importan
+la interfaz y las herramientas, y también sirve solo para corridas sin interfaz.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable, Iterable, Mapping
+from functools import lru_cache
+
+# Anotaciones con genéricos de builtins y collections.abc: `typing` no se importa al arrancar
+GameState = Mapping[str, object]
+
+LETRAS = "abcdefghijklmnopqrstuvwxyzñ"
+
+# Plegado de acentos (la ñ es una letra aparte): una sola pasada de `str.translate`
+_PLEGAR = str.maketrans("áàâäãéèêëíìîïóòôöõúùûüç", "aaaaaeeeeiiiiooooouuuuc")
+
+
+def plegar(texto: str) -> str:
+    """Minúsculas y sin acentos (`"Canción"` -> `"cancion"`); conserva espacios y signos."""
+    return texto.lower().translate(_PLEGAR)
+
+
+def clave_palabra(palabra: str) -> str:
+    """Palabra plegada con el mismo largo que la original, una posición por carácter.
+
+    Es lo que comparan los solvers: `"Canción"` -> `"cancion"`. Las letras cuya minúscula
+    ocupa más de un carácter (p. ej. "İ") quedan como "?" (se muestran como un signo).
+    """
+    clave = plegar(palabra)
+    if len(clave) != len(palabra):
+        clave = "".join([p if len(p) == 1 else "?" for p in map(plegar, palabra)])
+    return clave
+
+
+def normalizar(texto: str) -> str:
+    """Entrada del jugador lista para comparar: plegada y con los espacios colapsados."""
+    return " ".join(plegar(texto or "").split())
+
+
+def _solo_letras(texto: str) -> str:
+    return "".join([ch for ch in texto if ch in BIT_LETRA])
+
+
+
+# Estado y reglas del juego (Programación Funcional)
+
+
+def create_game_state(palabra: str, max_intentos: int = 6, compacto: bool = False,
+                      categoria: str | None = None) -> GameState:
+    """Crea el estado inicial del juego (`compacto=True` usa máscaras de bits)."""
+    if compacto:
+        return EstadoCompacto.crear(palabra, max_intentos, categoria)
+    return {
+        "palabra": palabra,
+        "categoria": categoria,
+        "max_intentos": max_intentos,
+        "letras_ok": set(),
+        "letras_bad": set(),
+        "palabras_bad": set(),
+        "revelado": _info_palabra(palabra, categoria).oculto
+    }
+
+
+def intento_letra(game_state: GameState, letra: str) -> tuple[GameState, bool]:
+    """Intenta una letra y devuelve el nuevo estado y si fue acierto (`"Á"` cuenta como `"a"`)."""
+    letra = plegar((letra or "").strip())
+    if not (len(letra) == 1 and letra in BIT_LETRA):
+        raise ValueError("Ingresa una sola letra de la a a la z (o ñ)")
+    if isinstance(game_state, EstadoCompacto):
+        return game_state.con_letra(letra)
+    if letra in game_state["letras_ok"] or letra in game_state["letras_bad"]:
+        raise ValueError("Letra repetida")
+    
+    info = _info_palabra(game_state["palabra"], game_state.get("categoria"))
+    if letra in info.posiciones:
+        new_state = game_state.copy()
+        new_state["letras_ok"] = game_state["letras_ok"] | {letra}
+        if "revelado" in game_state:
+            new_state["revelado"] = _revelar(game_state["revelado"], info.posiciones[letra], info.palabra)
+        return new_state, True
+    else:
+        new_state = game_state.copy()
+        new_state["letras_bad"] = game_state["letras_bad"] | {letra}
+        return new_state, False
+
+
+def intento_palabra(game_state: GameState, candidata: str) -> tuple[GameState, bool]:
+    """Permite adivinar la palabra (o frase) completa; se comparan solo las letras, sin acentos."""
+    candidata = normalizar(candidata)
+    if not _es_candidata(candidata):
+        raise ValueError("La palabra debe contener solo letras")
+    if isinstance(game_state, EstadoCompacto):
+        return game_state.con_palabra(candidata)
+    if candidata in game_state["palabras_bad"]:
+        raise ValueError("Ya probaste esa palabra")
+    
+    info = _info_palabra(game_state["palabra"], game_state.get("categoria"))
+    if _solo_letras(candidata) == info.solo:
+        new_state = game_state.copy()
+        new_state["letras_ok"] = set(info.posiciones)
+        if "revelado" in game_state:
+            new_state["revelado"] = info.completo
+        return new_state, True
+    else:
+        new_state = game_state.copy()
+        new_state["palabras_bad"] = game_state["palabras_bad"] | {candidata}
+        return new_state, False
+
+
+def jugada(game_state: GameState, entrada: str,
+           conocida: Callable[[str], bool] | None = None) -> tuple[GameState, bool]:
+    """Aplica una entrada de jugador: una letra o la palabra completa. Lanza ValueError.
+
+    Con `conocida`, una palabra que no está en el vocabulario se rechaza sin gastar intento
+    (las frases no se validan). En una frase, espacios y signos de la entrada no cuentan.
+    """
+    texto = normalizar(entrada)
+    if len(texto) == 1:
+        return intento_letra(game_state, texto)
+    info = _info_palabra(game_state["palabra"], game_state.get("categoria"))
+    letras = _solo_letras(texto)
+    if _es_candidata(texto) and len(letras) == len(info.solo):
+        if conocida is not None and not info.frase and letras != info.solo and not conocida(letras):
+            raise ValueError("Esa palabra no esta en el diccionario")
+        return intento_palabra(game_state, texto)
+    raise ValueError("Escribe una sola letra o la palabra completa (solo letras)")
+
+
+def progreso(game_state: GameState) -> str:
+    """Devuelve el progreso actual de la palabra.
+
+    Es el buffer `revelado` del estado (cada acierto solo reescribe las posiciones de su
+    letra); los estados armados a mano sin buffer se recorren letra por letra.
+    """
+    if isinstance(game_state, EstadoCompacto):
+        return game_state.revelado
+    revelado = game_state.get("revelado")
+    if revelado is not None:
+        return revelado
+    return " ".join([ch if ch in game_state["letras_ok"] else "_" for ch in game_state["palabra"]])
+
+
+def patron(game_state: GameState) -> str:
+    """Progreso en letras plegadas, una por posición: "_" en las ocultas y espacios o signos
+    tal cual (`"canción"` con c y o -> `"c__c_o_"`). Es el patrón que usan los solvers."""
+    clave = _info_palabra(game_state["palabra"], game_state.get("categoria")).clave
+    revelado = progreso(game_state)
+    return "".join([ch if revelado[2 * i] != "_" else "_" for i, ch in enumerate(clave)])
+
+
+def intentos_usados(game_state: GameState) -> int:
+    """Calcula los intentos usados."""
+    if isinstance(game_state, EstadoCompacto):
+        return game_state.usados
+    return len(game_state["letras_bad"]) + len(game_state["palabras_bad"])
+
+
+def intentos_restantes(game_state: GameState) -> int:
+    """Calcula los intentos restantes."""
+    return game_state["max_intentos"] - intentos_usados(game_state)
+
+
+def gano(game_state: GameState) -> bool:
+    """Verifica si el jugador ganó."""
+    if isinstance(game_state, EstadoCompacto):
+        return game_state.mask_ok == game_state.info.mask
+    letras_ok = game_state["letras_ok"]
+    return all(ch in letras_ok for ch in _info_palabra(game_state["palabra"], game_state.get("categoria")).posiciones)
+
+
+def perdio(game_state: GameState) -> bool:
+    """Verifica si el jugador perdió."""
+    if isinstance(game_state, EstadoCompacto):
+        return game_state.usados >= game_state.max_intentos
+    return intentos_usados(game_state) >= game_state["max_intentos"]
+
+
+
+# Estado compacto (máscaras de bits de las 27 letras de LETRAS, con ñ; inmutable)
+
+# Bit de cada letra en las máscaras (público: la interfaz arma sus claves de estado con él)
+BIT_LETRA: dict[str, int] = {ch: 1 << i for i, ch in enumerate(LETRAS)}
+
+
+def _mascara(letras: Iterable[str]) -> int:
+    """Máscara de bits de un iterable de letras (ignora lo que no esté en LETRAS: a-z y ñ)."""
+    m = 0
+    for ch in letras:
+        m |= BIT_LETRA.get(ch, 0)
+    return m
+
+
+@lru_cache(maxsize=4096)
+def _letras_de_mascara(mask: int) -> frozenset[str]:
+    return frozenset(ch for ch, bit in BIT_LETRA.items() if mask & bit)
+
+
+def _es_candidata(texto: str) -> bool:
+    """Letras (a-z, ñ) y, en frases, espacios o signos: nada de dígitos ni otras letras."""
+    return any(ch in BIT_LETRA for ch in texto) and all(ch in BIT_LETRA or not ch.isalnum() for ch in texto)
+
+
+def _revelar(revelado: str, posiciones: tuple[int, ...], palabra: str) -> str:
+    """Copia de `revelado` con las letras de `palabra` en `posiciones` (la celda i es el carácter 2*i)."""
+    celdas = list(revelado)
+    for i in posiciones:
+        celdas[2 * i] = palabra[i]
+    return "".join(celdas)
+
+
+class _InfoPalabra:
+    """Datos de la palabra que no cambian durante la partida (compartidos entre estados).
+
+    La normalización se hace una vez aquí: `clave` es la palabra plegada (minúsculas, sin
+    acentos), `posiciones` el índice letra plegada -> posiciones, `solo` sus letras sin
+    espacios ni signos y `oculto` el progreso inicial (los espacios y signos ya se ven).
+    """
+    __slots__ = ("palabra", "categoria", "clave", "mask", "posiciones", "solo", "frase", "oculto", "_completo")
+
+    def __init__(self, palabra: str, categoria: str | None = None) -> None:
+        self.palabra = palabra
+        self.categoria = categoria
+        self.clave = clave = clave_palabra(palabra)
+        posiciones: dict[str, list[int]] = {}
+        for i, ch in enumerate(clave):
+            if ch in BIT_LETRA:
+                posiciones.setdefault(ch, []).append(i)
+        self.posiciones: dict[str, tuple[int, ...]] = {ch: tuple(ps) for ch, ps in posiciones.items()}
+        self.mask = _mascara(posiciones)
+        self.solo = _solo_letras(clave)
+        self.frase = len(self.solo) != len(clave)
+        self.oculto = " ".join([ch if p not in BIT_LETRA else "_" for ch, p in zip(palabra, clave)])
+        self._completo: str | None = None
+
+    @property
+    def completo(self) -> str:
+        """Progreso con todo revelado (se arma solo si alguien adivina la palabra entera)."""
+        if self._completo is None:
+            self._completo = " ".join(self.palabra)
+        return self._completo
+
+
+@lru_cache(maxsize=4096)
+def _info_palabra(palabra: str, categoria: str | None = None) -> _InfoPalabra:
+    return _InfoPalabra(palabra, categoria)
+
+
+class EstadoCompacto(Mapping):
+    """Estado inmutable del juego: letras como máscaras de bits e intentos precalculados.
+
+    Se puede leer como el dict de `create_game_state` (`estado["letras_ok"]`, ...),
+    así que toda la API funcional (`intento_letra`, `gano`, `progreso`, ...) lo acepta.
+    """
+    __slots__ = ("info", "max_intentos", "mask_ok", "mask_bad", "palabras_bad", "usados", "revelado")
+    _CLAVES = ("palabra", "categoria", "max_intentos", "letras_ok", "letras_bad", "palabras_bad", "revelado")
+
+    @classmethod
+    def crear(cls, palabra: str, max_intentos: int = 6, categoria: str | None = None) -> "EstadoCompacto":
+        info = _info_palabra(palabra, categoria)
+        return cls._nuevo(info, max_intentos, 0, 0, frozenset(), 0, info.oculto)
+
+    @classmethod
+    def _nuevo(cls, info: _InfoPalabra, max_intentos: int, mask_ok: int, mask_bad: int,
+               palabras_bad: frozenset[str], usados: int, revelado: str) -> "EstadoCompacto":
+        obj = object.__new__(cls)
+        setattr_ = object.__setattr__
+        setattr_(obj, "info", info)
+        setattr_(obj, "max_intentos", max_intentos)
+        setattr_(obj, "mask_ok", mask_ok)
+        setattr_(obj, "mask_bad", mask_bad)
+        setattr_(obj, "palabras_bad", palabras_bad)
+        setattr_(obj, "usados", usados)
+        setattr_(obj, "revelado", revelado)
+        return obj
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("EstadoCompacto es inmutable")
+
+    def con_letra(self, letra: str) -> tuple["EstadoCompacto", bool]:
+        """Transición por letra (ya validada y plegada: a-z o ñ). Lanza ValueError si es repetida."""
+        bit = BIT_LETRA[letra]
+        if (self.mask_ok | self.mask_bad) & bit:
+            raise ValueError("Letra repetida")
+        if self.info.mask & bit:
+            revelado = _revelar(self.revelado, self.info.posiciones[letra], self.info.palabra)
+            return self._nuevo(self.info, self.max_intentos, self.mask_ok | bit, self.mask_bad,
+                               self.palabras_bad, self.usados, revelado), True
+        return self._nuevo(self.info, self.max_intentos, self.mask_ok, self.mask_bad | bit,
+                           self.palabras_bad, self.usados + 1, self.revelado), False
+
+    def con_palabra(self, candidata: str) -> tuple["EstadoCompacto", bool]:
+        """Transición por palabra completa (ya normalizada). Lanza ValueError si es repetida."""
+        if candidata in self.palabras_bad:
+            raise ValueError("Ya probaste esa palabra")
+        if _solo_letras(candidata) == self.info.solo:
+            return self._nuevo(self.info, self.max_intentos, self.info.mask, self.mask_bad,
+                               self.palabras_bad, self.usados, self.info.completo), True
+        return self._nuevo(self.info, self.max_intentos, self.mask_ok, self.mask_bad,
+                           self.palabras_bad | {candidata}, self.usados + 1, self.revelado), False
+
+    # Interfaz de solo lectura compatible con el dict de create_game_state
+    def __getitem__(self, clave: str) -> object:
+        if clave == "palabra":
+            return self.info.palabra
+        if clave == "categoria":
+            return self.info.categoria
+        if clave == "max_intentos":
+            return self.max_intentos
+        if clave == "letras_ok":
+            return _letras_de_mascara(self.mask_ok)
+        if clave == "letras_bad":
+            return _letras_de_mascara(self.mask_bad)
+        if clave == "palabras_bad":
+            return self.palabras_bad
+        if clave == "revelado":
+            return self.revelado
+        raise KeyError(clave)
+
+    def __iter__(self):
+        return iter(self._CLAVES)
+
+    def __len__(self) -> int:
+        return len(self._CLAVES)
+
+    def __repr__(self) -> str:
+        return f"EstadoCompacto({progreso(self)!r}, usados={self.usados}/{self.max_intentos})"